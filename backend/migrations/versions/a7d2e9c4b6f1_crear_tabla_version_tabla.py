@@ -0,0 +1,29 @@
+"""crear tabla VersionTabla (versiones por tabla para ETag / Last-Modified)
+
+Revision ID: a7d2e9c4b6f1
+Revises: f4c2a8e6b1d3
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e9c4b6f1'
+down_revision = 'f4c2a8e6b1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('VersionTabla',
+    sa.Column('tabla', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.Column('actualizado_en', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('tabla')
+    )
+
+
+def downgrade():
+    op.drop_table('VersionTabla')
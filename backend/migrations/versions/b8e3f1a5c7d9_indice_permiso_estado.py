@@ -0,0 +1,29 @@
+"""indice compuesto en Permiso por estado_permiso/permiso_id
+
+Revision ID: b8e3f1a5c7d9
+Revises: a7d2e9c4b6f1
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3f1a5c7d9'
+down_revision = 'a7d2e9c4b6f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_Permiso_estado_permiso_id', 'Permiso',
+                        ['estado_permiso', 'permiso_id'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_Permiso_estado_permiso_id', table_name='Permiso',
+                      postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""crear tabla EjecucionTarea e indice en Pago por estado/fecha_vencimiento
+
+Revision ID: c3d9e5f1a8b2
+Revises: b8e3f1a5c7d9
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9e5f1a8b2'
+down_revision = 'b8e3f1a5c7d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('EjecucionTarea',
+    sa.Column('id_ejecucion', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('tarea', sa.String(length=64), nullable=False),
+    sa.Column('inicio', sa.DateTime(), nullable=False),
+    sa.Column('duracion_ms', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('filas_afectadas', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('exito', sa.Boolean(), nullable=False, server_default=sa.true()),
+    sa.Column('detalle', sa.String(length=1000), nullable=True),
+    sa.PrimaryKeyConstraint('id_ejecucion')
+    )
+    op.create_index('ix_EjecucionTarea_tarea_inicio', 'EjecucionTarea', ['tarea', 'inicio'], unique=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_Pago_estado_fecha_vencimiento', 'Pago',
+                        ['estado', 'fecha_vencimiento'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_Pago_estado_fecha_vencimiento', table_name='Pago',
+                      postgresql_concurrently=True)
+
+    op.drop_index('ix_EjecucionTarea_tarea_inicio', table_name='EjecucionTarea')
+    op.drop_table('EjecucionTarea')
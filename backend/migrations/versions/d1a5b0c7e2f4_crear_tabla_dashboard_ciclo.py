@@ -0,0 +1,36 @@
+"""crear tabla DashboardCiclo (snapshot de KPIs por ciclo)
+
+Revision ID: d1a5b0c7e2f4
+Revises: 126df737d118
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1a5b0c7e2f4'
+down_revision = '126df737d118'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('DashboardCiclo',
+    sa.Column('Ciclo_id_ciclo', sa.Integer(), nullable=False),
+    sa.Column('total_alumnas', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('ocupacion_promedio', sa.Numeric(precision=7, scale=2), nullable=False, server_default='0'),
+    sa.Column('ingresos_mes_actual', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+    sa.Column('mes_ingresos', sa.Integer(), nullable=False),
+    sa.Column('anio_ingresos', sa.Integer(), nullable=False),
+    sa.Column('asistencias_registradas', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.Column('asistencias_presentes', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.Column('fecha_actualizacion', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['Ciclo_id_ciclo'], ['ciclo.id_ciclo'], ),
+    sa.PrimaryKeyConstraint('Ciclo_id_ciclo')
+    )
+
+
+def downgrade():
+    op.drop_table('DashboardCiclo')
@@ -0,0 +1,48 @@
+"""contador total_inscritos en Horario e indice HorarioSesion por horario/estado
+
+Revision ID: d5e1f7a3b9c4
+Revises: c3d9e5f1a8b2
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e1f7a3b9c4'
+down_revision = 'c3d9e5f1a8b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Horario', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_inscritos', sa.Integer(), nullable=False, server_default='0'))
+
+    # Carga inicial: lo mismo que hace `flask reconciliar-inscritos`
+    op.execute('''
+        UPDATE "Horario" SET total_inscritos = (
+            SELECT count(*)
+            FROM "Asistencia"
+            JOIN "HorarioSesion"
+              ON "HorarioSesion".id_horario_sesion = "Asistencia"."Horario_sesion_id_horario_sesion"
+            WHERE "HorarioSesion"."Horario_id_horario" = "Horario".id_horario
+              AND "HorarioSesion".estado = true
+              AND "Asistencia".estado = true
+        )
+    ''')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_HorarioSesion_horario_estado', 'HorarioSesion',
+                        ['Horario_id_horario', 'estado'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_HorarioSesion_horario_estado', table_name='HorarioSesion',
+                      postgresql_concurrently=True)
+
+    with op.batch_alter_table('Horario', schema=None) as batch_op:
+        batch_op.drop_column('total_inscritos')
@@ -0,0 +1,33 @@
+"""crear tabla PronosticoAsistencia
+
+Revision ID: e3b7c1d9f5a2
+Revises: d1a5b0c7e2f4
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b7c1d9f5a2'
+down_revision = 'd1a5b0c7e2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('PronosticoAsistencia',
+    sa.Column('Horario_sesion_id_horario_sesion', sa.BigInteger(), nullable=False),
+    sa.Column('inscritos', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('asistencia_esperada', sa.Numeric(precision=7, scale=2), nullable=False, server_default='0'),
+    sa.Column('modelo', sa.String(length=30), nullable=False),
+    sa.Column('version_modelo', sa.String(length=20), nullable=True),
+    sa.Column('fecha_calculo', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['Horario_sesion_id_horario_sesion'], ['HorarioSesion.id_horario_sesion'], ),
+    sa.PrimaryKeyConstraint('Horario_sesion_id_horario_sesion')
+    )
+
+
+def downgrade():
+    op.drop_table('PronosticoAsistencia')
@@ -0,0 +1,35 @@
+"""indices compuestos en Asistencia por inscripcion/estado y sesion/estado
+
+Revision ID: f4c2a8e6b1d3
+Revises: e3b7c1d9f5a2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c2a8e6b1d3'
+down_revision = 'e3b7c1d9f5a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY (fuera de la transacción) para no bloquear escrituras en la tabla más grande
+    with op.get_context().autocommit_block():
+        op.create_index('ix_Asistencia_inscripcion_estado', 'Asistencia',
+                        ['Inscripcion_id_inscripcion', 'estado'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_Asistencia_horario_sesion_estado', 'Asistencia',
+                        ['Horario_sesion_id_horario_sesion', 'estado'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_Asistencia_horario_sesion_estado', table_name='Asistencia',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_Asistencia_inscripcion_estado', table_name='Asistencia',
+                      postgresql_concurrently=True)
@@ -0,0 +1,109 @@
+"""
+Benchmark de GET /sesiones/agenda
+
+Siembra una semana con N sesiones repartidas en pocas ofertas y compara:
+- carga anterior de paquetes (una consulta por sesión)
+- paquetes por oferta con una consulta IN (caché fría)
+- paquetes desde la caché en memoria (caché caliente)
+
+Falla (exit 1) si la agenda con caché caliente supera el objetivo de latencia.
+
+Uso:
+    python scripts/benchmark_agenda.py [sesiones] [ofertas]
+
+Variables de entorno:
+    AGENDA_OBJETIVO_MS  objetivo de latencia promedio para la agenda completa (default 250)
+"""
+
+import os
+import sys
+from datetime import date, time as dtime, timedelta
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from src.app import db
+from src.models import (Ciclo, Oferta, Paquete, Persona, Profesor, Estilo, Sala, Horario, HorarioSesion)
+from src.repositories.horario_sesion_repository import HorarioSesionRepository
+from src.repositories.paquete_repository import paquetes_por_oferta_cache
+
+OBJETIVO_MS = float(os.getenv('AGENDA_OBJETIVO_MS', '250'))
+DESDE = date(2025, 3, 3)
+HASTA = DESDE + timedelta(days=6)
+
+
+def paquetes_por_sesion_anterior():
+    """
+    Carga previa: la consulta principal y luego los paquetes de la oferta de cada sesión
+    """
+    paquetes_por_oferta_cache.invalidar()
+    filas = HorarioSesionRepository.get_sesiones_agenda(DESDE, HASTA)
+    for fila in filas:
+        Paquete.query.filter_by(Oferta_id_oferta=fila['sesion_data'][2].id_oferta, estado=True).all()
+    return filas
+
+
+def agenda_cache_fria(cliente):
+    paquetes_por_oferta_cache.invalidar()
+    return cliente.get(f'/sesiones/agenda?desde={DESDE}&hasta={HASTA}')
+
+
+def agenda_cache_caliente(cliente):
+    return cliente.get(f'/sesiones/agenda?desde={DESDE}&hasta={HASTA}')
+
+
+def sembrar(total_sesiones, total_ofertas):
+    db.session.add_all([
+        Ciclo(id_ciclo=1, nombre='C1', inicio=date(2025, 1, 1), fin=date(2025, 12, 31)),
+        Persona(id_persona=1, nombre='Profe'),
+        Profesor(id_profesor=1, Persona_id_persona=1, estado=True),
+        Estilo(id_estilo=1, nombre_estilo='Heels'),
+        Sala(id_sala=1, nombre_sala='Sala 1', ubicacion='Centro', departamento='LP')
+    ])
+    for o in range(1, total_ofertas + 1):
+        db.session.add(Oferta(id_oferta=o, ciclo_id_ciclo=1, Subcategoria_id_subcategoria=1,
+                              fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 12, 31),
+                              nombre_oferta=f'Oferta {o}', cantidad_cursos=1, repite_semanalmente=True))
+        db.session.add(Horario(id_horario=o, Oferta_id_oferta=o, Estilo_id_estilo=1, nivel=1,
+                               Profesor_id_profesor=1, Sala_id_sala=1, capacidad=20, dias='1',
+                               hora_inicio=dtime(18, 0), hora_fin=dtime(19, 0)))
+        for p in range(3):
+            db.session.add(Paquete(id_paquete=o * 10 + p, nombre=f'P{o}-{p}', cantidad_clases=4 * (p + 1),
+                                   Oferta_id_oferta=o, precio=100 * (p + 1)))
+    for s in range(1, total_sesiones + 1):
+        db.session.add(HorarioSesion(id_horario_sesion=s, Horario_id_horario=1 + s % total_ofertas,
+                                     dia=1 + s % 7, hora_inicio=dtime(8 + s % 12, 0),
+                                     hora_fin=dtime(9 + s % 12, 0), duracion=1,
+                                     fecha=DESDE + timedelta(days=s % 7), capacidad_maxima=20))
+    db.session.commit()
+
+
+def main():
+    total_sesiones = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    total_ofertas = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    app = crear_app_benchmark()
+    sembrar(total_sesiones, total_ofertas)
+    cliente = app.test_client()
+
+    consultas_antes, ms_antes, _ = medir(paquetes_por_sesion_anterior)
+    consultas_fria, ms_fria, respuesta = medir(agenda_cache_fria, cliente)
+    assert respuesta.status_code == 200 and respuesta.get_json()['total'] == total_sesiones
+    agenda_cache_caliente(cliente)
+    consultas_caliente, ms_caliente, _ = medir(agenda_cache_caliente, cliente)
+
+    imprimir_tabla(
+        f'AGENDA: {total_sesiones} sesiones, {total_ofertas} ofertas',
+        ['variante', 'consultas', 'ms'],
+        [
+            ('paquetes por sesión (solo repositorio)', consultas_antes, f'{ms_antes:.1f}'),
+            ('GET /sesiones/agenda, caché fría', consultas_fria, f'{ms_fria:.1f}'),
+            ('GET /sesiones/agenda, caché caliente', consultas_caliente, f'{ms_caliente:.1f}')
+        ]
+    )
+
+    if ms_caliente > OBJETIVO_MS:
+        print(f'❌ Objetivo de latencia no cumplido: {ms_caliente:.1f} ms > {OBJETIVO_MS:.0f} ms')
+        sys.exit(1)
+    print(f'✅ Objetivo de latencia cumplido: {ms_caliente:.1f} ms <= {OBJETIVO_MS:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark de DashboardRepository.get_alumnos_nuevos_vs_recurrentes
+
+Compara la implementación anterior (una consulta COUNT por alumna) con la
+consulta única basada en EXISTS, mostrando número de consultas y latencia.
+
+Uso:
+    python scripts/benchmark_alumnos_recurrentes.py [alumnas ...]
+"""
+
+import sys
+from datetime import date, time as dtime
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from sqlalchemy import func
+from src.app import db
+from src.models import Ciclo, Oferta, Paquete, Persona, Inscripcion, Estilo, Horario
+from src.repositories.dashboard_repository import DashboardRepository
+
+
+def alumnos_nuevos_vs_recurrentes_n_mas_1(id_ciclo):
+    """
+    Implementación previa (N+1), reproducida solo para comparar
+    """
+    ciclo = db.session.query(Ciclo).filter(Ciclo.id_ciclo == id_ciclo).first()
+    alumnos_ciclo_actual = db.session.query(
+        Inscripcion.Persona_id_persona
+    ).join(
+        Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+    ).join(
+        Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+    ).filter(
+        Oferta.ciclo_id_ciclo == id_ciclo,
+        Inscripcion.estado == 'ACTIVO'
+    ).distinct().all()
+
+    alumnos_recurrentes = 0
+    for alumno in alumnos_ciclo_actual:
+        previas = db.session.query(
+            func.count(Inscripcion.id_inscripcion)
+        ).join(
+            Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+        ).join(
+            Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+        ).filter(
+            Inscripcion.Persona_id_persona == alumno.Persona_id_persona,
+            Oferta.fecha_inicio < ciclo.inicio
+        ).scalar()
+        if previas:
+            alumnos_recurrentes += 1
+
+    return {
+        'total_alumnos': len(alumnos_ciclo_actual),
+        'alumnos_recurrentes': alumnos_recurrentes
+    }
+
+
+def sembrar(total_alumnas, id_base):
+    """
+    Dos ciclos; la mitad de las alumnas del ciclo actual ya estuvo en el anterior
+    """
+    ciclo_anterior = Ciclo(id_ciclo=id_base, nombre=f'C{id_base}', inicio=date(2024, 1, 1), fin=date(2024, 6, 30))
+    ciclo_actual = Ciclo(id_ciclo=id_base + 1, nombre=f'C{id_base + 1}', inicio=date(2024, 7, 1), fin=date(2024, 12, 31))
+    db.session.add_all([ciclo_anterior, ciclo_actual])
+
+    estilos = [Estilo(id_estilo=id_base + i, nombre_estilo=f'Estilo {i}') for i in range(3)]
+    db.session.add_all(estilos)
+
+    ofertas = []
+    for i, (ciclo, inicio) in enumerate([(ciclo_anterior, date(2024, 1, 1)), (ciclo_actual, date(2024, 7, 1)),
+                                         (ciclo_actual, date(2024, 7, 1))]):
+        oferta = Oferta(id_oferta=id_base + i, ciclo_id_ciclo=ciclo.id_ciclo, Subcategoria_id_subcategoria=1,
+                        fecha_inicio=inicio, fecha_fin=ciclo.fin, nombre_oferta=f'Oferta {i}', cantidad_cursos=1)
+        ofertas.append(oferta)
+        for j, estilo in enumerate(estilos):
+            db.session.add(Horario(id_horario=id_base * 10 + i * 3 + j, Oferta_id_oferta=oferta.id_oferta,
+                                   Estilo_id_estilo=estilo.id_estilo, nivel=1, Profesor_id_profesor=1,
+                                   Sala_id_sala=1, capacidad=20, dias='1,3',
+                                   hora_inicio=dtime(18, 0), hora_fin=dtime(19, 0)))
+    db.session.add_all(ofertas)
+
+    paquetes = [Paquete(id_paquete=id_base + i, nombre=f'P{i}', cantidad_clases=8, Oferta_id_oferta=o.id_oferta,
+                        precio=100) for i, o in enumerate(ofertas)]
+    db.session.add_all(paquetes)
+
+    id_inscripcion = id_base * 10
+    for n in range(total_alumnas):
+        persona = Persona(id_persona=id_base * 10 + n, nombre=f'Alumna {n}')
+        db.session.add(persona)
+        destinos = [paquetes[1 + n % 2]]
+        if n % 2 == 0:
+            destinos.append(paquetes[0])
+        for paquete in destinos:
+            id_inscripcion += 1
+            db.session.add(Inscripcion(
+                id_inscripcion=id_inscripcion, Persona_id_persona=persona.id_persona,
+                Paquete_id_paquete=paquete.id_paquete, fecha_inscripcion=date(2024, 7, 1),
+                fecha_inicio=date(2024, 7, 1), fecha_fin=date(2024, 7, 31), precio_original=100,
+                precio_final=100, estado_pago='PAGADO', estado='ACTIVO'
+            ))
+    db.session.commit()
+    return ciclo_actual.id_ciclo
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [100, 500, 2000]
+    crear_app_benchmark()
+    repository = DashboardRepository()
+
+    filas = []
+    for i, total in enumerate(tamanos):
+        id_ciclo = sembrar(total, id_base=(i + 1) * 100000)
+
+        consultas_antes, ms_antes, antes = medir(alumnos_nuevos_vs_recurrentes_n_mas_1, id_ciclo, repeticiones=3)
+        consultas_despues, ms_despues, despues = medir(repository.get_alumnos_nuevos_vs_recurrentes, id_ciclo,
+                                                       repeticiones=3)
+        assert antes['alumnos_recurrentes'] == despues['alumnos_recurrentes']
+
+        filas.append((total, consultas_antes, f'{ms_antes:.1f}', consultas_despues, f'{ms_despues:.1f}'))
+
+    imprimir_tabla(
+        'ALUMNOS NUEVOS VS RECURRENTES: N+1 vs EXISTS',
+        ['alumnas', 'consultas antes', 'ms antes', 'consultas después', 'ms después'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Microbenchmark de generación de cuotas (Pago)
+
+Compara PagoRepository.create en bucle (un INSERT + flush por cuota) con
+PagoRepository.create_bulk (un solo INSERT ... RETURNING) para 1, 3 y 12 cuotas.
+
+Uso:
+    python scripts/benchmark_cuotas.py [cuotas ...]
+"""
+
+import sys
+from datetime import date, timedelta
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from src.app import db
+from src.repositories.pago_repository import PagoRepository
+
+
+def datos_cuotas(numero_cuotas):
+    return [
+        {
+            'Inscripcion_id_inscripcion': 1,
+            'Metodo_pago_id_metodo_pago': 1,
+            'numero_cuota': i,
+            'monto': round(300 / numero_cuotas, 2),
+            'fecha_pago': None,
+            'fecha_vencimiento': date(2025, 1, 1) + timedelta(days=30 * (i - 1)),
+            'fecha_confirmacion_director': None,
+            'confirmado_por': 0,
+            'observaciones': None,
+            'estado': 'PENDIENTE'
+        }
+        for i in range(1, numero_cuotas + 1)
+    ]
+
+
+def crear_uno_a_uno(pagos_data):
+    pagos = [PagoRepository.create(pago_data) for pago_data in pagos_data]
+    db.session.rollback()
+    db.session.expunge_all()
+    return pagos
+
+
+def crear_bulk(pagos_data):
+    pagos = PagoRepository.create_bulk(pagos_data)
+    db.session.rollback()
+    db.session.expunge_all()
+    return pagos
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [1, 3, 12]
+    crear_app_benchmark()
+
+    filas = []
+    for numero_cuotas in tamanos:
+        pagos_data = datos_cuotas(numero_cuotas)
+        consultas_antes, ms_antes, _ = medir(crear_uno_a_uno, pagos_data, repeticiones=20)
+        consultas_despues, ms_despues, pagos = medir(crear_bulk, pagos_data, repeticiones=20)
+        assert len(pagos) == numero_cuotas
+
+        filas.append((numero_cuotas, consultas_antes, f'{ms_antes:.2f}', consultas_despues, f'{ms_despues:.2f}'))
+
+    imprimir_tabla(
+        'CUOTAS: PagoRepository.create vs create_bulk',
+        ['cuotas', 'consultas create', 'ms create', 'consultas bulk', 'ms bulk'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark de memoria de la exportación en streaming (GET /pagos/export)
+
+Para tablas de distinto tamaño compara el pico de memoria (tracemalloc) de armar
+la lista completa con jsonify (GET /pagos) contra consumir la exportación NDJSON y
+CSV en streaming. El pico del streaming debe mantenerse constante.
+
+Uso:
+    python scripts/benchmark_exportacion.py [filas ...]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import date
+from benchmark_utils import crear_app_benchmark, imprimir_tabla
+
+from sqlalchemy import insert, func
+from src.app import db
+from src.models import Pago, Inscripcion, Persona
+
+PERSONAS = 200
+
+
+def completar_datos(total):
+    """
+    Personas e inscripciones fijas; pagos hasta que la tabla tenga `total` filas
+    """
+    if not db.session.query(func.count(Persona.id_persona)).scalar():
+        db.session.execute(insert(Persona), [
+            {'id_persona': i, 'nombre': f'Alumna {i}', 'apellido': 'Benchmark', 'email': f'a{i}@mail.com'}
+            for i in range(1, PERSONAS + 1)
+        ])
+        db.session.execute(insert(Inscripcion), [
+            {'id_inscripcion': i, 'Persona_id_persona': i, 'Paquete_id_paquete': 1,
+             'fecha_inscripcion': date(2025, 1, 1), 'fecha_inicio': date(2025, 1, 1),
+             'fecha_fin': date(2025, 6, 30), 'precio_original': 100, 'precio_final': 100,
+             'estado_pago': 'PENDIENTE', 'estado': 'ACTIVO'}
+            for i in range(1, PERSONAS + 1)
+        ])
+    actuales = db.session.query(func.count(Pago.id_pago)).scalar()
+    filas = [
+        {'id_pago': i, 'Inscripcion_id_inscripcion': i % PERSONAS + 1, 'Metodo_pago_id_metodo_pago': 1,
+         'numero_cuota': 1, 'monto': 100, 'fecha_vencimiento': date(2025, 1, 1),
+         'confirmado_por': 0, 'estado': 'PENDIENTE', 'observaciones': 'x' * 40}
+        for i in range(actuales + 1, total + 1)
+    ]
+    if filas:
+        db.session.execute(insert(Pago), filas)
+    db.session.commit()
+
+
+def medir_memoria(cliente, url, streaming):
+    """
+    (pico_mb, ms, bytes) de una petición; en streaming se consume la respuesta de a bloques
+    """
+    db.session.expunge_all()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    response = cliente.get(url, buffered=not streaming)
+    total_bytes = 0
+    for bloque in response.response:
+        total_bytes += len(bloque)
+    response.close()
+    ms = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / (1024 * 1024), ms, total_bytes
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [5000, 20000, 80000]
+    app = crear_app_benchmark()
+    cliente = app.test_client()
+
+    filas = []
+    for total in tamanos:
+        completar_datos(total)
+        mb_lista, ms_lista, _ = medir_memoria(cliente, '/pagos/', streaming=False)
+        mb_ndjson, ms_ndjson, bytes_ndjson = medir_memoria(cliente, '/pagos/export?formato=ndjson', streaming=True)
+        mb_csv, ms_csv, _ = medir_memoria(cliente, '/pagos/export?formato=csv', streaming=True)
+        assert bytes_ndjson > 0
+
+        filas.append((total, f'{mb_lista:.1f}', f'{ms_lista:.0f}', f'{mb_ndjson:.1f}', f'{ms_ndjson:.0f}',
+                      f'{mb_csv:.1f}', f'{ms_csv:.0f}'))
+
+    imprimir_tabla(
+        'EXPORTACIÓN DE PAGOS: LISTA EN MEMORIA vs STREAMING (pico de memoria)',
+        ['filas', 'MB lista', 'ms lista', 'MB ndjson', 'ms ndjson', 'MB csv', 'ms csv'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
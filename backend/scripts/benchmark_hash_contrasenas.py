@@ -0,0 +1,89 @@
+"""
+Benchmark de la política de hash de contraseñas (PASSWORD_HASH_METHOD)
+
+Para cada método/costo mide el tiempo de generar un hash, el login completo
+(POST /auth/login, un solo worker y un solo hilo) y los logins/seg que eso permite
+por worker. También mide el primer login después de cambiar la política, que además
+re-hashea y guarda la contraseña con el método nuevo.
+
+Uso:
+    python scripts/benchmark_hash_contrasenas.py [metodo ...] [--repeticiones N]
+"""
+
+import sys
+import time
+from datetime import datetime
+from benchmark_utils import crear_app_benchmark, imprimir_tabla
+
+from werkzeug.security import generate_password_hash
+from src.app import db
+from src.models import Persona, Alumno
+from src.auth.contrasenas import normalizar_metodo
+
+METODOS = [
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+    'pbkdf2:sha256:1000000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:100000',
+]
+METODO_ANTERIOR = 'pbkdf2:sha256:1000'
+PASSWORD = 'secreto-de-benchmark'
+
+
+def crear_persona(persona_id, metodo):
+    db.session.add(Persona(id_persona=persona_id, nombre='Benchmark', apellido=metodo,
+                           email=f'p{persona_id}@benchmark.local',
+                           password=generate_password_hash(PASSWORD, method=metodo),
+                           fecha_creacion=datetime(2025, 1, 1)))
+    db.session.add(Alumno(Persona_id_persona=persona_id))
+    db.session.commit()
+
+
+def cronometrar(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def main():
+    argumentos = sys.argv[1:]
+    repeticiones = 10
+    if '--repeticiones' in argumentos:
+        indice = argumentos.index('--repeticiones')
+        repeticiones = int(argumentos[indice + 1])
+        del argumentos[indice:indice + 2]
+    metodos = argumentos or METODOS
+
+    app = crear_app_benchmark()
+    cliente = app.test_client()
+
+    filas = []
+    for persona_id, metodo in enumerate(metodos, start=1):
+        app.config['PASSWORD_HASH_METHOD'] = metodo
+        crear_persona(persona_id, METODO_ANTERIOR)
+        email = f'p{persona_id}@benchmark.local'
+
+        def login():
+            response = cliente.post('/auth/login', json={'email': email, 'password': PASSWORD})
+            assert response.status_code == 200
+
+        # Primer login: verifica con el método anterior y re-hashea con la política vigente
+        ms_rehash = cronometrar(login, 1)
+        guardado = db.session.get(Persona, persona_id).password
+        assert guardado.split('$', 1)[0] == normalizar_metodo(metodo)
+
+        ms_hash = cronometrar(lambda: generate_password_hash(PASSWORD, method=metodo), repeticiones)
+        ms_login = cronometrar(login, repeticiones)
+        filas.append((metodo, f'{ms_hash:.1f}', f'{ms_login:.1f}', f'{1000 / ms_login:.1f}', f'{ms_rehash:.1f}'))
+
+    imprimir_tabla(
+        f'POLÍTICA DE HASH DE CONTRASEÑAS: COSTO vs LOGINS/SEG POR WORKER ({repeticiones} repeticiones)',
+        ['método', 'ms hash', 'ms login', 'logins/seg por worker', f'ms 1er login (re-hash desde {METODO_ANTERIOR})'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark de InscripcionService.create_inscripcion según la cantidad de clases seleccionadas
+
+Compara la carga de sesiones anterior (get_capacidad_info + get_by_id por clase)
+con HorarioSesionRepository.get_info_sesiones (una consulta IN) y muestra las
+consultas totales de una inscripción completa, que no deben crecer con las clases.
+
+Uso:
+    python scripts/benchmark_inscripcion.py [clases ...]
+"""
+
+import sys
+from datetime import date, time as dtime, timedelta
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla, ContadorConsultas
+
+from src.app import db
+from src.models import Ciclo, Oferta, Paquete, Persona, HorarioSesion, Horario, MetodoPago
+from src.repositories.horario_sesion_repository import HorarioSesionRepository
+from src.services.inscripcion_service import InscripcionService
+
+
+def cargar_sesiones_anterior(sesiones_ids):
+    """
+    Carga previa (dos consultas por clase), reproducida solo para comparar
+    """
+    info = {}
+    for sesion_id in sesiones_ids:
+        capacidad = HorarioSesionRepository.get_capacidad_info(sesion_id)
+        sesion = db.session.query(HorarioSesion).filter(HorarioSesion.id_horario_sesion == sesion_id).first()
+        info[sesion_id] = dict(capacidad, fecha=sesion.fecha, hora_inicio=sesion.hora_inicio)
+    return info
+
+
+def sembrar(max_clases):
+    db.session.add_all([
+        Ciclo(id_ciclo=1, nombre='C1', inicio=date(2025, 1, 1), fin=date(2025, 12, 31)),
+        Oferta(id_oferta=1, ciclo_id_ciclo=1, Subcategoria_id_subcategoria=1, fecha_inicio=date(2025, 1, 1),
+               fecha_fin=date(2025, 12, 31), nombre_oferta='Oferta', cantidad_cursos=1),
+        Horario(id_horario=1, Oferta_id_oferta=1, Estilo_id_estilo=1, nivel=1, Profesor_id_profesor=1,
+                Sala_id_sala=1, capacidad=1000, dias='1', hora_inicio=dtime(18, 0), hora_fin=dtime(19, 0)),
+        MetodoPago(id_metodo_pago=2, nombre_metodo='QR', estado=True),
+        Persona(id_persona=1, nombre='Alumna')
+    ])
+    for i in range(max_clases):
+        db.session.add(HorarioSesion(id_horario_sesion=i + 1, Horario_id_horario=1, dia=1,
+                                     hora_inicio=dtime(18, 0), hora_fin=dtime(19, 0), duracion=1,
+                                     fecha=date(2025, 1, 6) + timedelta(days=7 * i), capacidad_maxima=1000,
+                                     cupos_ocupados=0))
+    db.session.commit()
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [1, 8, 24]
+    crear_app_benchmark()
+    sembrar(max(tamanos))
+
+    filas = []
+    id_inscripcion = 0
+    for clases in tamanos:
+        sesiones_ids = list(range(1, clases + 1))
+        db.session.add(Paquete(id_paquete=clases, nombre=f'P{clases}', cantidad_clases=clases,
+                               Oferta_id_oferta=1, precio=10 * clases))
+        db.session.commit()
+
+        consultas_antes, ms_antes, _ = medir(cargar_sesiones_anterior, sesiones_ids)
+        consultas_despues, ms_despues, _ = medir(HorarioSesionRepository.get_info_sesiones, sesiones_ids)
+
+        id_inscripcion += 1
+        db.session.expire_all()
+        with ContadorConsultas() as contador:
+            _, status = InscripcionService.create_inscripcion({
+                'id_inscripcion': id_inscripcion,
+                'Persona_id_persona': 1,
+                'Paquete_id_paquete': clases,
+                'fecha_inscripcion': '2025-01-01',
+                'fecha_inicio': '2025-01-06',
+                'metodo_pago_id': 2,
+                'clases_seleccionadas': sesiones_ids
+            })
+        assert status == 201
+
+        filas.append((clases, consultas_antes, f'{ms_antes:.2f}', consultas_despues, f'{ms_despues:.2f}',
+                      contador.consultas, f'{contador.milisegundos:.1f}'))
+
+    imprimir_tabla(
+        'CREATE_INSCRIPCION: CARGA DE SESIONES Y CONSULTAS TOTALES',
+        ['clases', 'consultas antes', 'ms antes', 'consultas IN', 'ms IN', 'consultas inscripción', 'ms inscripción'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
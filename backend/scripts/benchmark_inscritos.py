@@ -0,0 +1,135 @@
+"""
+Benchmark del listado de horarios de un profesor (GET /horarios/profesor/<id>)
+
+Para distintas cantidades de asistencias compara el listado anterior (subconsulta
+que agrega COUNT(Asistencia) por horario en cada petición) contra leer el contador
+Horario.total_inscritos, y mide la reconciliación completa del contador.
+
+Uso:
+    python scripts/benchmark_inscritos.py [asistencias_por_sesion ...]
+"""
+
+import sys
+from datetime import date, time, timedelta
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from sqlalchemy import insert, delete, update, func
+from src.app import db
+from src.models import (Programa, Categoria, Subcategoria, Ciclo, Oferta, Sala, Estilo, Horario,
+                        HorarioSesion, Asistencia)
+from src.repositories.horario_repository import HorarioRepository
+
+HORARIOS = 20
+SESIONES_POR_HORARIO = 40
+
+
+def listado_anterior(profesor_id):
+    """
+    Listado anterior (agrega Asistencia en cada petición), reproducido solo para comparar
+    """
+    subquery_inscritos = db.session.query(
+        HorarioSesion.Horario_id_horario,
+        func.count(Asistencia.id_asistencia).label('total_inscritos')
+    ).join(
+        Asistencia, HorarioSesion.id_horario_sesion == Asistencia.Horario_sesion_id_horario_sesion
+    ).filter(
+        HorarioSesion.estado == True,
+        Asistencia.estado == True
+    ).group_by(HorarioSesion.Horario_id_horario).subquery()
+
+    return db.session.query(
+        Horario, Oferta, Ciclo, Sala, Estilo, Subcategoria, Categoria, Programa,
+        func.coalesce(subquery_inscritos.c.total_inscritos, 0).label('total_inscritos')
+    ).join(
+        Oferta, Horario.Oferta_id_oferta == Oferta.id_oferta
+    ).join(
+        Ciclo, Oferta.ciclo_id_ciclo == Ciclo.id_ciclo
+    ).join(
+        Sala, Horario.Sala_id_sala == Sala.id_sala
+    ).join(
+        Estilo, Horario.Estilo_id_estilo == Estilo.id_estilo
+    ).join(
+        Subcategoria, Oferta.Subcategoria_id_subcategoria == Subcategoria.id_subcategoria
+    ).join(
+        Categoria, Subcategoria.Categoria_id_categoria == Categoria.id_categoria
+    ).join(
+        Programa, Categoria.Programa_id_programa == Programa.id_programa
+    ).outerjoin(
+        subquery_inscritos, Horario.id_horario == subquery_inscritos.c.Horario_id_horario
+    ).filter(
+        Horario.Profesor_id_profesor == profesor_id,
+        Horario.estado == True
+    ).all()
+
+
+def sembrar_catalogo():
+    db.session.add_all([
+        Programa(id_programa=1, nombre_programa='Programa', descricpcion_programa='-'),
+        Categoria(id_categoria=1, nombre_categoria='Categoria', Programa_id_programa=1),
+        Subcategoria(id_subcategoria=1, nombre_subcategoria='Regular', descripcion_subcategoria='-',
+                     Categoria_id_categoria=1),
+        Ciclo(id_ciclo=1, nombre='2025-1', inicio=date(2025, 1, 1), fin=date(2025, 6, 30)),
+        Oferta(id_oferta=1, ciclo_id_ciclo=1, Subcategoria_id_subcategoria=1, fecha_inicio=date(2025, 1, 1),
+               fecha_fin=date(2025, 12, 31), nombre_oferta='Oferta', cantidad_cursos=1, repite_semanalmente=True),
+        Sala(id_sala=1, nombre_sala='Sala', ubicacion='-', departamento='LP'),
+        Estilo(id_estilo=1, nombre_estilo='Salsa'),
+    ])
+    db.session.execute(insert(Horario), [
+        {'id_horario': h, 'Oferta_id_oferta': 1, 'Estilo_id_estilo': 1, 'nivel': 1, 'Profesor_id_profesor': 1,
+         'Sala_id_sala': 1, 'capacidad': 50, 'dias': '1', 'hora_inicio': time(18), 'hora_fin': time(19)}
+        for h in range(1, HORARIOS + 1)
+    ])
+    db.session.execute(insert(HorarioSesion), [
+        {'id_horario_sesion': (h - 1) * SESIONES_POR_HORARIO + s, 'Horario_id_horario': h, 'dia': 1,
+         'duracion': 1, 'capacidad_maxima': 50, 'fecha': date(2025, 1, 6) + timedelta(weeks=s - 1),
+         'hora_inicio': time(18), 'hora_fin': time(19)}
+        for h in range(1, HORARIOS + 1) for s in range(1, SESIONES_POR_HORARIO + 1)
+    ])
+    db.session.commit()
+
+
+def sembrar_asistencias(por_sesion):
+    db.session.execute(delete(Asistencia))
+    sesiones = HORARIOS * SESIONES_POR_HORARIO
+    db.session.execute(insert(Asistencia), [
+        {'Inscripcion_id_inscripcion': alumno, 'Horario_sesion_id_horario_sesion': sesion, 'estado': True}
+        for sesion in range(1, sesiones + 1) for alumno in range(1, por_sesion + 1)
+    ])
+    db.session.execute(update(Horario).values(total_inscritos=0))
+    db.session.commit()
+
+
+def reconciliar():
+    corregidos = HorarioRepository.recalcular_inscritos()
+    db.session.commit()
+    return corregidos
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [5, 20, 50]
+    crear_app_benchmark()
+    sembrar_catalogo()
+
+    filas = []
+    for por_sesion in tamanos:
+        sembrar_asistencias(por_sesion)
+        consultas_rec, ms_rec, corregidos = medir(reconciliar, repeticiones=1)
+        assert corregidos == HORARIOS
+
+        consultas_ant, ms_ant, anteriores = medir(listado_anterior, 1)
+        consultas_nuevo, ms_nuevo, nuevos = medir(HorarioRepository.get_horarios_completos_by_profesor, 1)
+        assert sorted((f[0].id_horario, f[-1]) for f in anteriores) == sorted((f[0].id_horario, f[-1]) for f in nuevos)
+
+        filas.append((HORARIOS * SESIONES_POR_HORARIO * por_sesion, consultas_ant, f'{ms_ant:.2f}',
+                      consultas_nuevo, f'{ms_nuevo:.2f}', consultas_rec, f'{ms_rec:.1f}'))
+
+    imprimir_tabla(
+        f'LISTADO DE HORARIOS DE UN PROFESOR ({HORARIOS} horarios): COUNT POR PETICIÓN vs CONTADOR',
+        ['asistencias', 'consultas antes', 'ms antes', 'consultas ahora', 'ms ahora',
+         'consultas reconciliar', 'ms reconciliar'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
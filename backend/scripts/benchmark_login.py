@@ -0,0 +1,105 @@
+"""
+Benchmark de la resolución de rol en el login (POST /auth/login)
+
+Para cada rol compara la resolución anterior (una consulta por tabla de rol, en el
+orden Alumno, AlumnoFemme, Profesor, Director, Elenco) contra la consulta única con
+LEFT JOIN, con la caché por persona fría y caliente, y mide el login completo.
+
+Las contraseñas se guardan con pbkdf2 de 1 iteración para que el tiempo del login
+refleje las consultas y no el hash.
+
+Uso:
+    python scripts/benchmark_login.py [repeticiones]
+"""
+
+import os
+import sys
+from datetime import date, datetime
+
+# Misma política que el hash sembrado: sin esto el primer login re-hashea a scrypt y el
+# "ms login" pasa a medir check_password_hash en lugar de la resolución del rol
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1'
+
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from werkzeug.security import generate_password_hash
+from src.app import db
+from src.models import Persona, Alumno, AlumnoFemme, Profesor, Director, Elenco
+from src.repositories.rol_repository import roles_por_persona_cache
+from src.services.auth_service import AuthService
+
+ROLES = [
+    ('alumno', Alumno),
+    ('alumno_femme', AlumnoFemme),
+    ('profesor', Profesor),
+    ('director', Director),
+    ('elenco', Elenco),
+]
+
+# Columnas obligatorias de cada tabla de rol
+DATOS_ROL = {
+    'alumno_femme': {'cumpleanos': date(2000, 1, 1), 'signo': 'Aries', 'departamento': 'LP'},
+    'elenco': {'signo': 'Aries'},
+}
+
+
+def rol_anterior(persona_id):
+    """
+    Resolución anterior (una consulta por tabla hasta encontrar el rol), reproducida solo para comparar
+    """
+    for nombre, modelo in ROLES:
+        registro = modelo.query.filter_by(Persona_id_persona=persona_id).first()
+        if registro:
+            return nombre
+    return None
+
+
+def rol_sin_cache(persona_id):
+    roles_por_persona_cache.invalidar(persona_id)
+    return AuthService._get_user_role(persona_id)
+
+
+def sembrar():
+    password = generate_password_hash('secreto', method='pbkdf2:sha256:1')
+    for persona_id, (nombre, modelo) in enumerate(ROLES, start=1):
+        db.session.add(Persona(id_persona=persona_id, nombre=nombre, apellido='Benchmark',
+                               email=f'{nombre}@benchmark.local', password=password,
+                               fecha_creacion=datetime(2025, 1, 1)))
+        db.session.add(modelo(Persona_id_persona=persona_id, **DATOS_ROL.get(nombre, {})))
+    db.session.commit()
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = crear_app_benchmark()
+    cliente = app.test_client()
+    sembrar()
+
+    filas = []
+    for persona_id, (nombre, _) in enumerate(ROLES, start=1):
+        consultas_ant, ms_ant, anterior = medir(rol_anterior, persona_id, repeticiones=repeticiones)
+        consultas_frio, ms_frio, frio = medir(rol_sin_cache, persona_id, repeticiones=repeticiones)
+        consultas_cal, ms_cal, caliente = medir(AuthService._get_user_role, persona_id,
+                                                repeticiones=repeticiones)
+        assert anterior == frio['role'] == caliente['role'] == nombre
+
+        def login():
+            response = cliente.post('/auth/login', json={'email': f'{nombre}@benchmark.local',
+                                                         'password': 'secreto'})
+            assert response.status_code == 200
+            return response
+
+        consultas_login, ms_login, _ = medir(login, repeticiones=repeticiones)
+        filas.append((nombre, consultas_ant, f'{ms_ant:.3f}', consultas_frio, f'{ms_frio:.3f}',
+                      consultas_cal, f'{ms_cal:.4f}', consultas_login, f'{ms_login:.3f}'))
+
+    imprimir_tabla(
+        f'RESOLUCIÓN DE ROL EN LOGIN: CONSULTA POR TABLA vs LEFT JOIN ÚNICO (+ caché), {repeticiones} repeticiones',
+        ['rol', 'consultas antes', 'ms antes', 'consultas ahora', 'ms ahora',
+         'consultas caché', 'ms caché', 'consultas login', 'ms login'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark del marcado de asistencia de una sesión completa
+
+Para clases de distinto tamaño compara marcar alumno por alumno
+(PUT /asistencias/<id>/marcar, una petición y una transacción por alumno) contra
+el marcado masivo (PUT /asistencias/sesion/<id>/marcar, una sola petición y
+transacción que también ajusta clases_usadas/clases_restantes).
+
+Uso:
+    python scripts/benchmark_marcado_asistencias.py [alumnos ...]
+"""
+
+import sys
+from datetime import date, time
+from benchmark_utils import crear_app_benchmark, ContadorConsultas, imprimir_tabla
+
+from sqlalchemy import insert, func
+from src.app import db
+from src.models import Asistencia, HorarioSesion, Inscripcion
+
+
+def crear_sesion(sesion_id, alumnos):
+    """
+    Una sesión con `alumnos` inscripciones y asistencias sin marcar; devuelve los ids de asistencia
+    """
+    base = db.session.query(func.coalesce(func.max(Inscripcion.id_inscripcion), 0)).scalar()
+    db.session.add(HorarioSesion(id_horario_sesion=sesion_id, Horario_id_horario=1, dia=1, duracion=1,
+                                 capacidad_maxima=alumnos, fecha=date(2025, 1, 6), hora_inicio=time(18),
+                                 hora_fin=time(19)))
+    db.session.execute(insert(Inscripcion), [
+        {'id_inscripcion': base + i, 'Persona_id_persona': i, 'Paquete_id_paquete': 1,
+         'fecha_inscripcion': date(2025, 1, 1), 'fecha_inicio': date(2025, 1, 1), 'fecha_fin': date(2025, 6, 30),
+         'precio_original': 100, 'precio_final': 100, 'estado_pago': 'PAGADO', 'estado': 'ACTIVO',
+         'clases_usadas': 0, 'clases_restantes': 8}
+        for i in range(1, alumnos + 1)
+    ])
+    db.session.execute(insert(Asistencia), [
+        {'id_asistencia': base + i, 'Inscripcion_id_inscripcion': base + i,
+         'Horario_sesion_id_horario_sesion': sesion_id, 'estado': True}
+        for i in range(1, alumnos + 1)
+    ])
+    db.session.commit()
+    return list(range(base + 1, base + alumnos + 1))
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [10, 30, 100]
+    app = crear_app_benchmark()
+    cliente = app.test_client()
+
+    filas = []
+    for indice, alumnos in enumerate(tamanos, start=1):
+        ids_individual = crear_sesion(indice * 2 - 1, alumnos)
+        ids_masivo = crear_sesion(indice * 2, alumnos)
+
+        with ContadorConsultas() as individual:
+            for asistencia_id in ids_individual:
+                response = cliente.put(f'/asistencias/{asistencia_id}/marcar', json={'asistio': True})
+                assert response.status_code == 200
+
+        with ContadorConsultas() as masivo:
+            response = cliente.put(f'/asistencias/sesion/{indice * 2}/marcar',
+                                   json={'asistencias': {str(i): True for i in ids_masivo}})
+        assert response.status_code == 200 and response.get_json()['marcadas'] == alumnos
+        assert db.session.query(func.sum(Inscripcion.clases_usadas)).filter(
+            Inscripcion.id_inscripcion.in_(ids_masivo)
+        ).scalar() == alumnos
+
+        filas.append((alumnos, alumnos, individual.consultas, f'{individual.milisegundos:.1f}',
+                      1, masivo.consultas, f'{masivo.milisegundos:.1f}'))
+
+    imprimir_tabla(
+        'MARCADO DE ASISTENCIA DE UNA SESIÓN: ALUMNO POR ALUMNO vs MASIVO',
+        ['alumnos', 'peticiones antes', 'consultas antes', 'ms antes',
+         'peticiones ahora', 'consultas ahora', 'ms ahora'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
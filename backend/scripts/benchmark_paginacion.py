@@ -0,0 +1,88 @@
+"""
+Benchmark de paginación por keyset en los listados (GET /pagos como ejemplo)
+
+Para tablas de distinto tamaño compara el listado completo (PagoService.get_all_pagos
+sin parámetros), una página profunda con OFFSET y las páginas por keyset (primera y
+última) con limite=50. La latencia del keyset debe mantenerse plana al crecer la tabla.
+
+Uso:
+    python scripts/benchmark_paginacion.py [filas ...]
+"""
+
+import sys
+from datetime import date
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from sqlalchemy import insert, func
+from src.app import db
+from src.models import Pago
+from src.repositories.paginacion import codificar_cursor
+from src.services.pago_service import PagoService
+
+LIMITE = 50
+
+
+def completar_pagos(total):
+    """
+    Inserta pagos hasta que la tabla tenga `total` filas
+    """
+    actuales = db.session.query(func.count(Pago.id_pago)).scalar()
+    filas = [
+        {
+            'id_pago': i,
+            'Inscripcion_id_inscripcion': i // 4 + 1,
+            'Metodo_pago_id_metodo_pago': 1,
+            'numero_cuota': i % 4 + 1,
+            'monto': 100,
+            'fecha_vencimiento': date(2025, 1, 1),
+            'confirmado_por': 0,
+            'estado': 'PENDIENTE'
+        }
+        for i in range(actuales + 1, total + 1)
+    ]
+    if filas:
+        db.session.execute(insert(Pago), filas)
+        db.session.commit()
+
+
+def pagina_offset(offset):
+    """
+    Paginación con OFFSET, reproducida solo para comparar
+    """
+    return Pago.query.order_by(Pago.id_pago).offset(offset).limit(LIMITE).all()
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+    crear_app_benchmark()
+
+    filas = []
+    for total in tamanos:
+        completar_pagos(total)
+        cursor_final = codificar_cursor(total - LIMITE)
+
+        consultas_todo, ms_todo, todo = medir(PagoService.get_all_pagos, repeticiones=3)
+        _, ms_offset, pagina_vieja = medir(pagina_offset, total - LIMITE, repeticiones=10)
+        consultas_primera, ms_primera, (primera, _) = medir(PagoService.get_all_pagos, limite=LIMITE,
+                                                            repeticiones=10)
+        consultas_ultima, ms_ultima, (ultima, _) = medir(PagoService.get_all_pagos, limite=LIMITE,
+                                                         cursor=cursor_final, repeticiones=10)
+
+        assert len(todo[0]) == total
+        assert [p['id_pago'] for p in primera['items']] == list(range(1, LIMITE + 1))
+        assert [p['id_pago'] for p in ultima['items']] == [p.id_pago for p in pagina_vieja]
+        assert ultima['siguiente_cursor'] is None
+
+        filas.append((total, consultas_todo, f'{ms_todo:.1f}', f'{ms_offset:.2f}',
+                      consultas_primera, f'{ms_primera:.2f}', consultas_ultima, f'{ms_ultima:.2f}'))
+
+    imprimir_tabla(
+        f'LISTADO DE PAGOS: COMPLETO vs OFFSET vs KEYSET (limite={LIMITE})',
+        ['filas', 'consultas completo', 'ms completo', 'ms OFFSET última',
+         'consultas keyset', 'ms keyset primera', 'consultas keyset última', 'ms keyset última'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark de la generación de sesiones al crear un horario (POST /horarios)
+
+Para ofertas de distinta duración (días Lunes, Miércoles y Viernes) compara el
+generador anterior (recorrido día por día + un objeto ORM por sesión) contra el
+actual (aritmética de fechas + un único INSERT multi-fila), además del borrado
+lógico de las sesiones y de la previsualización, que no toca la base de datos.
+
+También compara, al agregar un día al horario, regenerar todas las sesiones
+(comportamiento anterior de update_horario) contra aplicar solo la diferencia.
+
+Uso:
+    python scripts/benchmark_sesiones.py [dias_de_oferta ...]
+"""
+
+import sys
+from datetime import date, time, timedelta
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from src.app import db
+from src.models import Oferta, Horario, HorarioSesion
+from src.services.horario_service import HorarioService
+
+DIAS = '1,3,5'
+
+
+def generar_sesiones_anterior(horario, fecha_inicio, fecha_fin):
+    """
+    Generador anterior (día por día, un HorarioSesion por coincidencia), reproducido solo para comparar
+    """
+    dias_seleccionados = [int(d) for d in horario.dias.split(',')]
+    sesiones = []
+    fecha_actual = fecha_inicio
+    while fecha_actual <= fecha_fin:
+        dia_semana = fecha_actual.weekday() + 1
+        if dia_semana in dias_seleccionados:
+            sesion = HorarioSesion(Horario_id_horario=horario.id_horario, dia=dia_semana, hora_inicio=time(18),
+                                   hora_fin=time(19, 30), duracion=1.5, fecha=fecha_actual, cancelado=False,
+                                   motivo=None, estado=True, capacidad_maxima=horario.capacidad, cupos_ocupados=0)
+            db.session.add(sesion)
+            sesiones.append(sesion)
+        fecha_actual += timedelta(days=1)
+    db.session.flush()
+    return sesiones
+
+
+def eliminar_sesiones_anterior(horario_id):
+    """
+    Borrado lógico anterior (carga cada sesión y la modifica), reproducido solo para comparar
+    """
+    for sesion in HorarioSesion.query.filter_by(Horario_id_horario=horario_id).all():
+        sesion.estado = False
+    db.session.flush()
+
+
+def regenerar_anterior(horario, fecha_inicio, fecha_fin):
+    """
+    update_horario anterior: desactiva todas las sesiones y vuelve a generarlas
+    """
+    eliminar_sesiones_anterior(horario.id_horario)
+    return generar_sesiones_anterior(horario, fecha_inicio, fecha_fin)
+
+
+def main():
+    duraciones = [int(a) for a in sys.argv[1:]] or [90, 365, 365 * 3]
+    crear_app_benchmark()
+
+    filas = []
+    filas_update = []
+    for indice, duracion in enumerate(duraciones, start=1):
+        fecha_inicio = date(2025, 1, 1)
+        fecha_fin = fecha_inicio + timedelta(days=duracion - 1)
+        db.session.add(Oferta(id_oferta=indice, ciclo_id_ciclo=1, Subcategoria_id_subcategoria=1,
+                              fecha_inicio=fecha_inicio, fecha_fin=fecha_fin, nombre_oferta=f'Oferta {indice}',
+                              cantidad_cursos=1, repite_semanalmente=True))
+        horario_anterior = Horario(Oferta_id_oferta=indice, Estilo_id_estilo=1, nivel=1, Profesor_id_profesor=1,
+                                   Sala_id_sala=1, capacidad=20, dias=DIAS, hora_inicio=time(18),
+                                   hora_fin=time(19, 30))
+        horario_nuevo = Horario(Oferta_id_oferta=indice, Estilo_id_estilo=1, nivel=1, Profesor_id_profesor=1,
+                                Sala_id_sala=1, capacidad=20, dias=DIAS, hora_inicio=time(18), hora_fin=time(19, 30))
+        db.session.add_all([horario_anterior, horario_nuevo])
+        db.session.commit()
+
+        consultas_ant, ms_ant, anteriores = medir(generar_sesiones_anterior, horario_anterior, fecha_inicio,
+                                                  fecha_fin, repeticiones=1)
+        consultas_nuevo, ms_nuevo, nuevas = medir(HorarioService._generar_sesiones, horario_nuevo, fecha_inicio,
+                                                  fecha_fin, '18:00', '19:30', repeticiones=1)
+        db.session.commit()
+        assert [s.fecha for s in anteriores] == [s['fecha'] for s in nuevas]
+
+        consultas_del_ant, ms_del_ant, _ = medir(eliminar_sesiones_anterior, horario_anterior.id_horario,
+                                                 repeticiones=1)
+        consultas_del, ms_del, desactivadas = medir(HorarioService._eliminar_sesiones_horario,
+                                                    horario_nuevo.id_horario, repeticiones=1)
+        db.session.commit()
+        assert desactivadas == len(nuevas)
+
+        consultas_prev, ms_prev, (prev, _) = medir(HorarioService.previsualizar_sesiones, {
+            'oferta_id': indice, 'dias': [1, 3, 5], 'hora_inicio': '18:00', 'hora_fin': '19:30'
+        }, repeticiones=5)
+        assert prev['total_sesiones'] == len(nuevas)
+
+        # Agregar el Domingo: regenerar todo vs aplicar solo la diferencia
+        horario_nuevo.dias = DIAS + ',7'
+        db.session.commit()
+        consultas_regen, ms_regen, regeneradas = medir(regenerar_anterior, horario_nuevo, fecha_inicio, fecha_fin,
+                                                       repeticiones=1)
+        db.session.rollback()
+        consultas_diff, ms_diff, cambios = medir(HorarioService._sincronizar_sesiones, horario_nuevo,
+                                                 db.session.get(Oferta, indice), {1, 3, 5},
+                                                 (time(18), time(19, 30)), repeticiones=1)
+        db.session.commit()
+        assert len(cambios['agregadas']) + len(cambios['reactivadas']) == len(regeneradas) - len(nuevas)
+        filas_update.append((duracion, len(regeneradas), consultas_regen, f'{ms_regen:.1f}',
+                             len(cambios['agregadas']), consultas_diff, f'{ms_diff:.1f}'))
+
+        filas.append((duracion, len(nuevas), consultas_ant, f'{ms_ant:.1f}', consultas_nuevo, f'{ms_nuevo:.1f}',
+                      consultas_del_ant, f'{ms_del_ant:.1f}', consultas_del, f'{ms_del:.1f}',
+                      consultas_prev, f'{ms_prev:.2f}'))
+
+    imprimir_tabla(
+        f'GENERACIÓN DE SESIONES: DÍA POR DÍA + ORM vs FECHAS + INSERT MULTI-FILA (días {DIAS})',
+        ['días oferta', 'sesiones', 'consultas antes', 'ms antes', 'consultas ahora', 'ms ahora',
+         'consultas borrar antes', 'ms borrar antes', 'consultas borrar ahora', 'ms borrar ahora',
+         'consultas preview', 'ms preview'],
+        filas
+    )
+    imprimir_tabla(
+        'ACTUALIZAR HORARIO (+ Domingo): REGENERAR TODO vs SOLO LA DIFERENCIA',
+        ['días oferta', 'sesiones', 'consultas regenerar', 'ms regenerar', 'sesiones agregadas',
+         'consultas diferencia', 'ms diferencia'],
+        filas_update
+    )
+
+
+if __name__ == '__main__':
+    main()
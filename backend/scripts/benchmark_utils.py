@@ -0,0 +1,97 @@
+"""
+Utilidades compartidas por los scripts benchmark_*.py
+
+Levantan la app contra una base SQLite en memoria (o DATABASE_URL si se define
+BENCHMARK_DATABASE_URL), cuentan las consultas SQL ejecutadas y miden latencia.
+"""
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Debe fijarse antes de importar la app: Config lee DATABASE_URL al importarse
+os.environ['DATABASE_URL'] = os.getenv('BENCHMARK_DATABASE_URL', 'sqlite://')
+# Los benchmarks miden el camino completo: sin caché de respuestas salvo que se pida
+os.environ.setdefault('RESPONSE_CACHE_ENABLED', 'false')
+# Clave descartable para que /auth/login emita y firme tokens como en producción
+os.environ.setdefault('SECRET_KEY', 'benchmark-' + os.urandom(16).hex())
+
+from sqlalchemy import event, BigInteger
+from sqlalchemy.ext.compiler import compiles
+from src.app import create_app, db
+
+
+@compiles(BigInteger, 'sqlite')
+def _bigint_sqlite(type_, compiler, **kw):
+    # En SQLite solo INTEGER PRIMARY KEY es autoincremental; los modelos usan BigInteger
+    return 'INTEGER'
+
+
+def crear_app_benchmark():
+    """
+    Crea la app, deja un app_context activo y crea todas las tablas
+    """
+    app = create_app()
+    app.app_context().push()
+    db.create_all()
+    return app
+
+
+class ContadorConsultas:
+    """
+    Context manager que cuenta las sentencias SQL y el tiempo transcurrido
+
+        with ContadorConsultas() as c:
+            ...
+        print(c.consultas, c.milisegundos)
+    """
+
+    def __init__(self):
+        self.consultas = 0
+        self.milisegundos = 0.0
+        self._inicio = None
+
+    def _contar(self, conn, cursor, statement, parameters, context, executemany):
+        self.consultas += 1
+
+    def __enter__(self):
+        event.listen(db.engine, 'before_cursor_execute', self._contar)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.milisegundos = (time.perf_counter() - self._inicio) * 1000
+        event.remove(db.engine, 'before_cursor_execute', self._contar)
+        return False
+
+
+def medir(funcion, *args, repeticiones=5, **kwargs):
+    """
+    Ejecuta la función varias veces y devuelve (consultas, ms_promedio, resultado)
+    """
+    resultado = None
+    consultas = 0
+    total_ms = 0.0
+    for _ in range(repeticiones):
+        db.session.expire_all()
+        with ContadorConsultas() as contador:
+            resultado = funcion(*args, **kwargs)
+        consultas = contador.consultas
+        total_ms += contador.milisegundos
+    return consultas, total_ms / repeticiones, resultado
+
+
+def imprimir_tabla(titulo, columnas, filas):
+    """
+    Imprime una tabla simple de resultados
+    """
+    print("=" * 70)
+    print(titulo)
+    print("=" * 70)
+    anchos = [max([len(str(c))] + [len(str(f[i])) for f in filas]) for i, c in enumerate(columnas)]
+    print("  ".join(str(c).ljust(anchos[i]) for i, c in enumerate(columnas)))
+    print("  ".join("-" * a for a in anchos))
+    for fila in filas:
+        print("  ".join(str(v).ljust(anchos[i]) for i, v in enumerate(fila)))
+    print()
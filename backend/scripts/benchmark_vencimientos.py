@@ -0,0 +1,92 @@
+"""
+Benchmark del barrido de vencimientos (POST /inscripciones/verificar-vencimientos
+y `flask barrer-vencimientos`)
+
+Para distintos tamaños de backlog (inscripciones activas con un pago pendiente
+vencido) compara el barrido anterior (cargar cada pago vencido y luego get_by_id +
+update por inscripción) contra el UPDATE ... WHERE id IN (SELECT ...) RETURNING
+actual, y mide una segunda corrida sin vencimientos nuevos.
+
+Uso:
+    python scripts/benchmark_vencimientos.py [inscripciones ...]
+"""
+
+import sys
+from datetime import date
+from benchmark_utils import crear_app_benchmark, medir, imprimir_tabla
+
+from sqlalchemy import insert, update, delete
+from src.app import db
+from src.models import Inscripcion, Pago, EjecucionTarea
+from src.repositories.inscripcion_repository import InscripcionRepository
+from src.repositories.pago_repository import PagoRepository
+from src.services.inscripcion_service import InscripcionService
+
+
+def barrido_anterior():
+    """
+    Barrido anterior (un get_by_id + update por inscripción), reproducido solo para comparar
+    """
+    inscripciones_a_suspender = {pago.Inscripcion_id_inscripcion for pago in PagoRepository.get_pagos_vencidos()}
+    for inscripcion_id in inscripciones_a_suspender:
+        inscripcion = InscripcionRepository.get_by_id(inscripcion_id)
+        if inscripcion and inscripcion.estado == 'ACTIVO':
+            InscripcionRepository.update(inscripcion_id, {'estado': 'SUSPENDIDO', 'estado_pago': 'VENCIDO'})
+    db.session.commit()
+    return len(inscripciones_a_suspender)
+
+
+def sembrar(total):
+    """
+    `total` inscripciones activas, cada una con un pago pendiente vencido y uno al día
+    """
+    db.session.execute(delete(Pago))
+    db.session.execute(delete(Inscripcion))
+    db.session.execute(insert(Inscripcion), [
+        {'id_inscripcion': i, 'Persona_id_persona': i, 'Paquete_id_paquete': 1,
+         'fecha_inscripcion': date(2025, 1, 1), 'fecha_inicio': date(2025, 1, 1), 'fecha_fin': date(2025, 6, 30),
+         'precio_original': 100, 'precio_final': 100, 'estado_pago': 'PENDIENTE', 'estado': 'ACTIVO'}
+        for i in range(1, total + 1)
+    ])
+    db.session.execute(insert(Pago), [
+        {'id_pago': i * 2 + cuota, 'Inscripcion_id_inscripcion': i, 'Metodo_pago_id_metodo_pago': 1,
+         'numero_cuota': cuota + 1, 'monto': 50, 'confirmado_por': 0, 'estado': 'PENDIENTE',
+         'fecha_vencimiento': date(2025, 1, 1) if cuota == 0 else date(2999, 1, 1)}
+        for i in range(1, total + 1) for cuota in (0, 1)
+    ])
+    db.session.commit()
+
+
+def reactivar():
+    db.session.execute(update(Inscripcion).values(estado='ACTIVO', estado_pago='PENDIENTE'))
+    db.session.commit()
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [100, 1000, 10000]
+    crear_app_benchmark()
+
+    filas = []
+    for total in tamanos:
+        sembrar(total)
+        consultas_ant, ms_ant, cantidad_ant = medir(barrido_anterior, repeticiones=1)
+        reactivar()
+        consultas_nuevo, ms_nuevo, (resultado, _) = medir(InscripcionService.barrer_vencimientos, repeticiones=1)
+        consultas_vacio, ms_vacio, (vacio, _) = medir(InscripcionService.barrer_vencimientos, repeticiones=1)
+
+        assert cantidad_ant == resultado['cantidad'] == total
+        assert vacio['cantidad'] == 0
+        filas.append((total, consultas_ant, f'{ms_ant:.1f}', consultas_nuevo, f'{ms_nuevo:.1f}',
+                      consultas_vacio, f'{ms_vacio:.1f}'))
+
+    assert EjecucionTarea.query.count() == 2 * len(tamanos)
+    imprimir_tabla(
+        'BARRIDO DE VENCIMIENTOS: POR INSCRIPCIÓN vs UPDATE ... WHERE id IN (SELECT ...)',
+        ['vencidas', 'consultas antes', 'ms antes', 'consultas ahora', 'ms ahora',
+         'consultas 2da corrida', 'ms 2da corrida'],
+        filas
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Prueba de estrés de reservas de cupo concurrentes en HorarioSesion
+
+Lanza muchas inscripciones en paralelo (hilos, cada uno con su propia sesión de BD)
+sobre las mismas sesiones y verifica que nunca se sobrevenda: cupos_ocupados final
+== inscripciones exitosas <= capacidad_maxima, y una asistencia por cupo reservado.
+
+Compara InscripcionService.create_inscripcion (UPDATE condicional, todo o nada)
+con la reserva anterior (leer, comprobar en Python e incrementar).
+
+Uso:
+    python scripts/stress_reservas_concurrentes.py [hilos] [capacidad]
+
+Por defecto usa un archivo SQLite temporal (las bases en memoria no se comparten
+entre conexiones); con BENCHMARK_DATABASE_URL puede apuntarse a un Postgres local.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as dtime
+
+_archivo_sqlite = os.path.join(tempfile.mkdtemp(), 'stress_reservas.db')
+os.environ.setdefault('BENCHMARK_DATABASE_URL', f'sqlite:///{_archivo_sqlite}')
+
+from benchmark_utils import crear_app_benchmark, imprimir_tabla
+
+from src.app import db
+from src.config import Config
+from src.models import Ciclo, Oferta, Paquete, Persona, HorarioSesion, Horario, MetodoPago, Asistencia
+from src.services.inscripcion_service import InscripcionService
+
+SESIONES = (1, 2, 3)
+
+
+def sembrar(hilos, capacidad):
+    db.session.add_all([
+        Ciclo(id_ciclo=1, nombre='C1', inicio=date(2025, 1, 1), fin=date(2025, 12, 31)),
+        Oferta(id_oferta=1, ciclo_id_ciclo=1, Subcategoria_id_subcategoria=1, fecha_inicio=date(2025, 1, 1),
+               fecha_fin=date(2025, 12, 31), nombre_oferta='Oferta', cantidad_cursos=1),
+        Horario(id_horario=1, Oferta_id_oferta=1, Estilo_id_estilo=1, nivel=1, Profesor_id_profesor=1,
+                Sala_id_sala=1, capacidad=capacidad, dias='1', hora_inicio=dtime(18, 0), hora_fin=dtime(19, 0)),
+        Paquete(id_paquete=1, nombre='P3', cantidad_clases=len(SESIONES), Oferta_id_oferta=1, precio=300),
+        MetodoPago(id_metodo_pago=2, nombre_metodo='QR', estado=True)
+    ])
+    for i, sesion_id in enumerate(SESIONES):
+        db.session.add(HorarioSesion(id_horario_sesion=sesion_id, Horario_id_horario=1, dia=1,
+                                     hora_inicio=dtime(18, 0), hora_fin=dtime(19, 0), duracion=1,
+                                     fecha=date(2025, 3, 3 + 7 * i), capacidad_maxima=capacidad,
+                                     cupos_ocupados=0))
+    db.session.add_all([Persona(id_persona=n + 1, nombre=f'Alumna {n}') for n in range(hilos)])
+    db.session.commit()
+
+
+def reiniciar_cupos():
+    HorarioSesion.query.update({HorarioSesion.cupos_ocupados: 0}, synchronize_session=False)
+    Asistencia.query.delete(synchronize_session=False)
+    db.session.commit()
+
+
+def inscribir(app, n, barrera):
+    with app.app_context():
+        barrera.wait()
+        resultado, status = InscripcionService.create_inscripcion({
+            'id_inscripcion': n + 1,
+            'Persona_id_persona': n + 1,
+            'Paquete_id_paquete': 1,
+            'fecha_inscripcion': '2025-03-01',
+            'fecha_inicio': '2025-03-03',
+            'metodo_pago_id': 2,
+            'clases_seleccionadas': list(SESIONES)
+        })
+        return status
+
+
+def reservar_anterior(app, n, barrera):
+    """
+    Reserva anterior: leer cada sesión, comprobar el cupo en Python e incrementar
+    """
+    with app.app_context():
+        barrera.wait()
+        try:
+            for sesion_id in SESIONES:
+                sesion = HorarioSesion.query.get(sesion_id)
+                if sesion.cupos_ocupados >= sesion.capacidad_maxima:
+                    db.session.rollback()
+                    return 400
+                sesion.cupos_ocupados += 1
+                db.session.flush()
+            db.session.commit()
+            return 201
+        except Exception:
+            db.session.rollback()
+            return 500
+
+
+def ejecutar(app, funcion, hilos):
+    barrera = threading.Barrier(hilos)
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        statuses = list(pool.map(lambda n: funcion(app, n, barrera), range(hilos)))
+
+    db.session.expire_all()
+    cupos = [HorarioSesion.query.get(s).cupos_ocupados for s in SESIONES]
+    return {
+        'exitosas': statuses.count(201),
+        'sin_cupo': statuses.count(400),
+        'errores': len(statuses) - statuses.count(201) - statuses.count(400),
+        'cupos': cupos,
+        'asistencias': Asistencia.query.count()
+    }
+
+
+def main():
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    capacidad = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    # Una conexión por hilo (más la del hilo principal): si el pool se agota los hilos
+    # fallan por timeout y nunca llegan a competir por el cupo
+    Config.SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': hilos + 1, 'max_overflow': 0, 'pool_timeout': 60}
+    app = crear_app_benchmark()
+    sembrar(hilos, capacidad)
+
+    filas = []
+    resultados = {}
+    for nombre, funcion in [('lectura + incremento', reservar_anterior), ('UPDATE condicional', inscribir)]:
+        reiniciar_cupos()
+        r = resultados[nombre] = ejecutar(app, funcion, hilos)
+        esperado = r['exitosas'] if funcion is reservar_anterior else r['asistencias'] // len(SESIONES)
+        consistente = all(c == r['exitosas'] == esperado and c <= capacidad for c in r['cupos'])
+        filas.append((nombre, hilos, capacidad, r['exitosas'], r['sin_cupo'], r['errores'],
+                      ','.join(map(str, r['cupos'])), 'OK' if consistente else 'INCONSISTENTE'))
+
+    imprimir_tabla(
+        'RESERVA DE CUPOS CONCURRENTE',
+        ['implementación', 'hilos', 'capacidad', 'exitosas', 'sin cupo', 'errores', 'cupos finales', 'resultado'],
+        filas
+    )
+
+    # La reserva actual debe llenar exactamente el cupo y rechazar al resto por falta de
+    # cupo (400), sin errores de conexión ni de base de datos que oculten el control
+    r = resultados['UPDATE condicional']
+    exitosas_esperadas = min(hilos, capacidad)
+    assert r['errores'] == 0, f"{r['errores']} inscripciones fallaron con error (no por falta de cupo)"
+    assert r['exitosas'] == exitosas_esperadas, f"{r['exitosas']} exitosas, se esperaban {exitosas_esperadas}"
+    assert r['sin_cupo'] == hilos - exitosas_esperadas, \
+        f"{r['sin_cupo']} rechazadas sin cupo, se esperaban {hilos - exitosas_esperadas}"
+    assert r['cupos'] == [exitosas_esperadas] * len(SESIONES)
+    assert r['asistencias'] == exitosas_esperadas * len(SESIONES)
+
+
+if __name__ == '__main__':
+    main()
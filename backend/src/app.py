@@ -40,8 +40,38 @@ def create_app():
     # Import models so Flask-Migrate can detect them
     from . import models
     
+    # Paquetes activos por oferta para la agenda (TTL según AGENDA_PAQUETES_CACHE_TTL)
+    from .repositories.paquete_repository import paquetes_por_oferta_cache
+    paquetes_por_oferta_cache.init_app(app)
+    
+    # Rol resuelto por persona para el login (TTL según ROL_PERSONA_CACHE_TTL)
+    from .repositories.rol_repository import roles_por_persona_cache
+    roles_por_persona_cache.init_app(app)
+    
+    # Tokens de sesión: error al arrancar si no hay SECRET_KEY para firmarlos
+    from .auth import init_tokens
+    init_tokens(app)
+    
+    # Conteo de consultas / tiempo SQL por request y detector de N+1 (SQL_INSTRUMENTATION_ENABLED)
+    from .instrumentacion import init_instrumentacion
+    init_instrumentacion(app)
+    
+    # Caché de respuestas (LRU en memoria o Redis según RESPONSE_CACHE_URL)
+    from .cache import response_cache
+    response_cache.init_app(app)
+    
     # Register routes
     from .routes import register_routes
     register_routes(app)
     
+    # Comandos CLI (jobs programados)
+    from .commands import register_commands
+    register_commands(app)
+    
+    # Registro de modelos ML (intervalo de hot reload) y precarga en este worker
+    from .ml.model_registry import model_registry
+    model_registry.init_app(app)
+    if app.config.get('ML_PRELOAD_MODELS'):
+        model_registry.precargar()
+    
     return app
\ No newline at end of file
@@ -0,0 +1,7 @@
+from .tokens import (TokenInvalido, emitir_token, verificar_token, token_para_login,
+                     identidad_actual, requiere_token, init_tokens)
+from .contrasenas import hashear_contrasena, verificar_contrasena, necesita_rehash
+
+__all__ = ['TokenInvalido', 'emitir_token', 'verificar_token', 'token_para_login',
+           'identidad_actual', 'requiere_token', 'init_tokens',
+           'hashear_contrasena', 'verificar_contrasena', 'necesita_rehash']
@@ -0,0 +1,80 @@
+"""
+Política de hash de contraseñas (algoritmo y costo configurables) con re-hash al hacer login
+
+PASSWORD_HASH_METHOD acepta los métodos de werkzeug con su costo explícito:
+
+    scrypt:32768:8:1        (n, r, p; el default de werkzeug)
+    pbkdf2:sha256:600000    (hash, iteraciones)
+
+Cada hash guardado lleva su método como prefijo ("scrypt:32768:8:1$sal$hash"), así que
+al verificar un login correcto se sabe si fue generado con otra política. En ese caso
+(si PASSWORD_REHASH_ON_LOGIN está activo) se devuelve el hash nuevo para guardarlo: subir
+o bajar el costo se aplica gradualmente a medida que los usuarios inician sesión, sin
+migraciones ni resets. scripts/benchmark_hash_contrasenas.py mide logins/seg por worker
+para cada política.
+"""
+
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+METODO_POR_DEFECTO = 'scrypt:32768:8:1'
+
+
+def normalizar_metodo(metodo):
+    """
+    Completa los parámetros omitidos con los defaults de werkzeug para que la comparación
+    con el prefijo de un hash guardado sea exacta ('scrypt' -> 'scrypt:32768:8:1')
+    """
+    nombre, *args = metodo.split(':')
+    if nombre == 'scrypt':
+        if not args:
+            return METODO_POR_DEFECTO
+        if len(args) != 3:
+            raise ValueError("'scrypt' requiere n:r:p")
+        n, r, p = map(int, args)
+        return f'scrypt:{n}:{r}:{p}'
+    if nombre == 'pbkdf2':
+        if len(args) > 2:
+            raise ValueError("'pbkdf2' requiere hash:iteraciones")
+        hash_name = args[0] if args else 'sha256'
+        iteraciones = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iteraciones}'
+    raise ValueError(f"Método de hash no soportado: '{metodo}'")
+
+
+def metodo_actual():
+    """
+    Método de la política vigente (PASSWORD_HASH_METHOD de la app, o el default fuera de contexto)
+    """
+    if has_app_context():
+        return normalizar_metodo(current_app.config.get('PASSWORD_HASH_METHOD', METODO_POR_DEFECTO))
+    return METODO_POR_DEFECTO
+
+
+def hashear_contrasena(password):
+    """
+    Hash de una contraseña con la política vigente
+    """
+    return generate_password_hash(password, method=metodo_actual())
+
+
+def necesita_rehash(password_hash):
+    """
+    True si el hash guardado no fue generado con la política vigente
+    """
+    return password_hash.split('$', 1)[0] != metodo_actual()
+
+
+def verificar_contrasena(password_hash, password):
+    """
+    Verifica la contraseña y, si es correcta pero el hash es de otra política, genera el reemplazo
+
+    Returns:
+        tuple: (es_correcta, nuevo_hash o None)
+    """
+    if not check_password_hash(password_hash, password):
+        return False, None
+    rehash = not has_app_context() or current_app.config.get('PASSWORD_REHASH_ON_LOGIN', True)
+    if rehash and necesita_rehash(password_hash):
+        return True, hashear_contrasena(password)
+    return True, None
@@ -0,0 +1,177 @@
+"""
+Tokens de sesión firmados (sin estado) para no consultar Persona ni las tablas de rol en cada request
+
+/auth/login emite un token con la identidad ya resuelta (id_persona, rol y los ids de
+su tabla de rol) firmado con HMAC-SHA256 usando SECRET_KEY:
+
+    base64url(json {"sub": id_persona, "role": ..., "ids": {...}, "exp": epoch}) . base64url(firma)
+
+Las rutas protegidas con @requiere_token lo verifican en memoria (firma + vencimiento),
+sin tocar la base de datos, y dejan la identidad en flask.g.identidad. Como no hay
+estado en el servidor, un cambio de rol se refleja recién en el próximo login (o al
+vencer el token, AUTH_TOKEN_TTL).
+
+SECRET_KEY debe venir del entorno: si falta (o es un valor de ejemplo) no se emiten
+tokens y las rutas protegidas rechazan cualquier token, porque con una clave conocida
+cualquiera podría firmar uno de director.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from functools import wraps
+
+from flask import current_app, request, g, jsonify
+
+# Claves que no sirven para firmar (valores por defecto que llegaron a estar en el repositorio)
+CLAVES_INVALIDAS = frozenset({'', 'abcd', 'secret', 'changeme', 'dev'})
+
+
+class TokenInvalido(Exception):
+    """
+    Token mal formado, con firma incorrecta o vencido
+    """
+
+
+def _b64(datos):
+    return base64.urlsafe_b64encode(datos).rstrip(b'=').decode('ascii')
+
+
+def _desde_b64(texto):
+    return base64.urlsafe_b64decode(texto + '=' * (-len(texto) % 4))
+
+
+def _firmar(contenido, secreto):
+    return hmac.new(secreto.encode('utf-8'), contenido.encode('ascii'), hashlib.sha256).digest()
+
+
+def emitir_token(persona_id, user_role, secreto, ttl):
+    """
+    Args:
+        persona_id: id de la persona autenticada
+        user_role: {"role": ..., "data": {...}} tal como lo devuelve AuthService._get_user_role
+        secreto: clave HMAC (Config.SECRET_KEY)
+        ttl: segundos de validez
+
+    Returns:
+        tuple: (token, expira_en como epoch en segundos)
+    """
+    expira_en = int(time.time()) + int(ttl)
+    carga = {
+        "sub": persona_id,
+        "role": user_role["role"],
+        # Solo los ids de la tabla de rol (id_alumno, id_profesor, ...)
+        "ids": {clave: valor for clave, valor in user_role["data"].items() if clave.startswith('id_')},
+        "exp": expira_en
+    }
+    contenido = _b64(json.dumps(carga, separators=(',', ':')).encode('utf-8'))
+    return f'{contenido}.{_b64(_firmar(contenido, secreto))}', expira_en
+
+
+def verificar_token(token, secreto):
+    """
+    Devuelve la identidad del token ({"id_persona", "role", "ids", "exp"}) o lanza TokenInvalido
+    """
+    try:
+        contenido, firma = token.split('.')
+        firma_valida = hmac.compare_digest(_desde_b64(firma), _firmar(contenido, secreto))
+    except (ValueError, UnicodeEncodeError):
+        raise TokenInvalido("Token mal formado")
+    if not firma_valida:
+        raise TokenInvalido("Firma de token inválida")
+
+    carga = json.loads(_desde_b64(contenido))
+    if carga.get("exp", 0) <= time.time():
+        raise TokenInvalido("Token vencido")
+    return {"id_persona": carga["sub"], "role": carga["role"], "ids": carga.get("ids", {}), "exp": carga["exp"]}
+
+
+def clave_firma(app=None):
+    """
+    SECRET_KEY de la app si sirve para firmar tokens; None si falta o es un valor de ejemplo
+    """
+    clave = (app or current_app).config.get('SECRET_KEY')
+    if not clave or clave in CLAVES_INVALIDAS:
+        return None
+    return clave
+
+
+def init_tokens(app):
+    """
+    Avisa al arrancar si los tokens están activos pero no hay una SECRET_KEY utilizable
+    """
+    if app.config.get('AUTH_TOKEN_ENABLED', True) and clave_firma(app) is None:
+        app.logger.error(
+            'SECRET_KEY no configurada (o con un valor de ejemplo): /auth/login no emitirá tokens y '
+            'las rutas con @requiere_token rechazarán todo token. Definir SECRET_KEY en el entorno.'
+        )
+
+
+def token_para_login(persona_id, user_role):
+    """
+    Emite el token del login según la configuración de la app; None si AUTH_TOKEN_ENABLED es
+    false o si no hay una SECRET_KEY utilizable
+    """
+    if not current_app.config.get('AUTH_TOKEN_ENABLED', True):
+        return None
+    clave = clave_firma()
+    if clave is None:
+        current_app.logger.error('Token no emitido: SECRET_KEY no configurada')
+        return None
+    return emitir_token(persona_id, user_role, clave, current_app.config.get('AUTH_TOKEN_TTL', 8 * 3600))
+
+
+def _token_de_request():
+    encabezado = request.headers.get('Authorization', '')
+    tipo, _, token = encabezado.partition(' ')
+    if tipo.lower() != 'bearer' or not token:
+        return None
+    return token.strip()
+
+
+def identidad_actual():
+    """
+    Identidad verificada del request actual (o None si la ruta se llamó sin token)
+    """
+    return g.get('identidad')
+
+
+def requiere_token(*roles):
+    """
+    Decorador para rutas: verifica el token Bearer (sin consultas a la base de datos),
+    deja la identidad en flask.g.identidad y, si se indican `roles`, exige uno de ellos.
+
+        @asistencia_bp.route('/sesion/<int:horario_sesion_id>/marcar', methods=['PUT'])
+        @requiere_token('profesor', 'director')
+        def marcar_asistencias_sesion(horario_sesion_id): ...
+
+    Con AUTH_TOKEN_REQUIRED en false (transición) un request sin Authorization pasa sin
+    identidad; si trae token, igual se valida.
+    """
+    roles = frozenset(roles)
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            token = _token_de_request()
+            if token is None:
+                if current_app.config.get('AUTH_TOKEN_REQUIRED', False):
+                    return jsonify({"error": "Token de autenticación requerido"}), 401
+                return vista(*args, **kwargs)
+
+            clave = clave_firma()
+            if clave is None:
+                return jsonify({"error": "Autenticación por token no disponible: SECRET_KEY no configurada"}), 503
+            try:
+                identidad = verificar_token(token, clave)
+            except TokenInvalido as e:
+                return jsonify({"error": str(e)}), 401
+            if roles and identidad["role"] not in roles:
+                return jsonify({"error": "No autorizado para este rol"}), 403
+
+            g.identidad = identidad
+            return vista(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,4 @@
+from .response_cache import response_cache, cache_respuesta, marcar_cambios, tags_de_tablas
+from .condicional import respuesta_condicional
+
+__all__ = ['response_cache', 'cache_respuesta', 'marcar_cambios', 'tags_de_tablas', 'respuesta_condicional']
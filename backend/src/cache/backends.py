@@ -0,0 +1,93 @@
+"""
+Backends de almacenamiento para la caché de respuestas
+
+Todos exponen la misma interfaz mínima (compatible con un subconjunto de Redis):
+    get(key) -> bytes | None
+    set(key, value, ttl)
+    incr(key) -> int
+    get_many(keys) -> [bytes | None, ...]
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUBackend:
+    """
+    Almacén en memoria del proceso, con TTL por entrada y desalojo LRU al llegar a max_entries
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entradas = OrderedDict()  # key -> (expira_en, valor)
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entrada = self._entradas.get(key)
+            if entrada is None:
+                return None
+            if entrada[0] <= time.monotonic():
+                del self._entradas[key]
+                return None
+            self._entradas.move_to_end(key)
+            return entrada[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entradas[key] = (time.monotonic() + ttl, value)
+            self._entradas.move_to_end(key)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+
+    def incr(self, key):
+        # Los contadores (versiones de tags) no expiran ni se desalojan
+        with self._lock:
+            self._contadores[key] = self._contadores.get(key, 0) + 1
+            return self._contadores[key]
+
+    def get_many(self, keys):
+        with self._lock:
+            return [self._contadores.get(key) for key in keys]
+
+
+class RedisBackend:
+    """
+    Adaptador sobre un cliente compatible con Redis (redis-py, fakeredis, ...)
+    compartido por todos los workers
+    """
+
+    def __init__(self, client, prefijo='escuela:cache:'):
+        self.client = client
+        self.prefijo = prefijo
+
+    def get(self, key):
+        return self.client.get(self.prefijo + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefijo + key, value, ex=max(1, int(ttl)))
+
+    def incr(self, key):
+        return self.client.incr(self.prefijo + key)
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        return self.client.mget([self.prefijo + key for key in keys])
+
+
+def crear_backend(url=None, max_entries=512):
+    """
+    LRU en memoria si no hay URL; Redis si la URL es redis:// o rediss:// (requiere el paquete redis)
+    """
+    if not url:
+        return LRUBackend(max_entries=max_entries)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_URL apunta a Redis pero el paquete 'redis' no está instalado")
+        return RedisBackend(redis.Redis.from_url(url))
+    raise ValueError(f"RESPONSE_CACHE_URL no soportada: {url}")
@@ -0,0 +1,88 @@
+"""
+GET condicional (ETag / Last-Modified) para endpoints de lectura pesados
+
+El ETag se calcula antes de ejecutar la vista, a partir de la ruta, los query args,
+la fecha del día (hay respuestas que dependen de "hoy": vigentes, mes actual, ...) y
+las versiones de las tablas de las que depende la respuesta (src/cache/versiones.py).
+Si el cliente envía If-None-Match / If-Modified-Since y nada cambió se responde
+304 con una sola consulta a VersionTabla, sin llegar al servicio.
+"""
+
+import hashlib
+from datetime import date
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request, make_response
+
+from src.app import db
+from src.cache.versiones import obtener_versiones, versiones_confiables
+
+
+def calcular_etag(versiones):
+    args = urlencode(sorted(request.args.items(multi=True)))
+    base = '|'.join(
+        [request.path, args, date.today().isoformat()]
+        + [f'{tabla}={versiones[tabla]}' for tabla in sorted(versiones)]
+    )
+    return hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+
+def _no_modificado(etag, ultima_modificacion):
+    # If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and ultima_modificacion is not None:
+        return ultima_modificacion.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _aplicar_validadores(response, etag, ultima_modificacion):
+    response.set_etag(etag, weak=True)
+    if ultima_modificacion is not None:
+        response.last_modified = ultima_modificacion
+    # El navegador puede guardar la respuesta pero debe revalidarla en cada uso
+    response.headers['Cache-Control'] = 'no-cache'
+
+
+def respuesta_condicional(*tablas):
+    """
+    Decorador para vistas GET: agrega ETag y Last-Modified según las versiones de
+    `tablas` y responde 304 Not Modified sin ejecutar la vista si el cliente ya
+    tiene la versión actual.
+
+        @inscripcion_bp.route('/completas', methods=['GET'])
+        @respuesta_condicional('Inscripcion', 'Persona', 'Paquete', 'Oferta', 'Promocion')
+        def get_inscripciones_completas(): ...
+    """
+    tablas = tuple(sorted(set(tablas)))
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            if not current_app.config.get('CONDITIONAL_GET_ENABLED', True) or request.method != 'GET':
+                return vista(*args, **kwargs)
+
+            # Un incremento de versión fallido: el ETag no reflejaría el último cambio
+            if not versiones_confiables(tablas):
+                return vista(*args, **kwargs)
+
+            try:
+                versiones, ultima_modificacion = obtener_versiones(tablas)
+            except Exception:
+                # Sin VersionTabla (p. ej. migración pendiente) se responde sin validadores
+                db.session.rollback()
+                return vista(*args, **kwargs)
+
+            etag = calcular_etag(versiones)
+            if _no_modificado(etag, ultima_modificacion):
+                response = current_app.response_class(status=304)
+                _aplicar_validadores(response, etag, ultima_modificacion)
+                return response
+
+            response = make_response(vista(*args, **kwargs))
+            if response.status_code == 200:
+                _aplicar_validadores(response, etag, ultima_modificacion)
+            return response
+        return envoltura
+    return decorador
@@ -0,0 +1,155 @@
+"""
+Caché de respuestas HTTP para endpoints de lectura del catálogo
+
+Cada respuesta se guarda con la clave (ruta + query args) y las versiones actuales de
+sus tags (oferta, horario, paquete, ...). Al confirmarse una transacción se incrementa
+la versión de los tags que modificó, con lo que todas las entradas que dependían de
+ellos dejan de encontrarse (y expiran solas por TTL). Los tags modificados son:
+
+- 'tabla:<Tabla>' por cada tabla escrita por la sesión ('tabla:ciclo', 'tabla:Persona',
+  ...), detectada automáticamente igual que en src/cache/versiones.py: una vista que
+  declara las tablas que lee con tags_de_tablas() se invalida con cualquier escritura
+  ORM, la haga o no un repositorio;
+- los que los repositorios marcan explícitamente con marcar_cambios() ('oferta', 'sesion', ...).
+
+Las versiones de los tags viven en el backend: con el LRU en memoria (por defecto) cada
+worker tiene las suyas y una escritura solo invalida la caché del worker que la hizo;
+los demás sirven la respuesta anterior hasta que vence RESPONSE_CACHE_TTL. Con varios
+workers debe configurarse RESPONSE_CACHE_URL (Redis compartido) para que la
+invalidación llegue a todos.
+"""
+
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request, make_response
+from sqlalchemy import event
+
+from src.app import db
+from src.cache.backends import crear_backend
+from src.cache.versiones import TABLAS_PENDIENTES
+
+TAGS_PENDIENTES = 'cache_tags_pendientes'
+
+
+class ResponseCache:
+    def __init__(self):
+        self.backend = None
+        self.ttl = 60
+        self.habilitado = False
+
+    def init_app(self, app):
+        self.habilitado = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        self.backend = crear_backend(
+            app.config.get('RESPONSE_CACHE_URL'),
+            max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 512)
+        )
+
+    def invalidar(self, *tags):
+        """
+        Invalida inmediatamente todas las respuestas asociadas a los tags
+        """
+        if self.backend is None:
+            return
+        for tag in set(tags):
+            self.backend.incr(f'tag:{tag}')
+
+    def clave(self, tags):
+        versiones = self.backend.get_many([f'tag:{tag}' for tag in tags])
+        args = urlencode(sorted(request.args.items(multi=True)))
+        base = '|'.join([request.path, args] + [f'{tag}={version or 0}' for tag, version in zip(tags, versiones)])
+        return 'resp:' + hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def serializar(response):
+        return f'{response.status_code}\n'.encode('utf-8') + response.get_data()
+
+    @staticmethod
+    def deserializar(valor):
+        status, _, body = valor.partition(b'\n')
+        response = current_app.response_class(body, status=int(status), mimetype='application/json')
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+
+response_cache = ResponseCache()
+
+
+def cache_respuesta(*tags, ttl=None):
+    """
+    Decorador para vistas GET que devuelven JSON: sirve la respuesta desde la caché
+    mientras no cambie ninguna entidad de `tags` ni venza el TTL. Solo se cachean respuestas 200.
+
+        @horario_bp.route('/cursos-regulares/vigente', methods=['GET'])
+        @cache_respuesta(*tags_de_tablas('Horario', 'Oferta', 'ciclo', ...))
+        def get_horarios_cursos_regulares_vigentes(): ...
+    """
+    tags = tuple(sorted(tags))
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            if not response_cache.habilitado or request.method != 'GET':
+                return vista(*args, **kwargs)
+
+            try:
+                clave = response_cache.clave(tags)
+                valor = response_cache.backend.get(clave)
+            except Exception:
+                # Si el backend no responde se sirve sin caché
+                return vista(*args, **kwargs)
+            if valor is not None:
+                return response_cache.deserializar(valor)
+
+            response = make_response(vista(*args, **kwargs))
+            if response.status_code == 200 and response.mimetype == 'application/json':
+                try:
+                    response_cache.backend.set(clave, response_cache.serializar(response),
+                                               ttl if ttl is not None else response_cache.ttl)
+                except Exception:
+                    pass
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return envoltura
+    return decorador
+
+
+def marcar_cambios(*tags):
+    """
+    Registra que la transacción actual modifica entidades de `tags`, además de las
+    tablas que se detectan solas. Las respuestas cacheadas se invalidan cuando la
+    transacción se confirma.
+    """
+    db.session.info.setdefault(TAGS_PENDIENTES, set()).update(tags)
+
+
+def tags_de_tablas(*tablas):
+    """
+    Tags que se invalidan solos cuando se confirma una escritura en alguna de `tablas`
+    (nombres de tabla, como en VersionTabla)
+    """
+    return tuple(f'tabla:{tabla}' for tabla in tablas)
+
+
+# insert=True: debe leer las tablas modificadas antes de que versiones.py las retire de la sesión
+@event.listens_for(db.session, 'after_commit', insert=True)
+def _invalidar_al_confirmar(session):
+    # También se dispara al liberar un savepoint: solo cuenta el commit de la transacción principal
+    if session.in_nested_transaction():
+        return
+    tags = session.info.pop(TAGS_PENDIENTES, None) or set()
+    tags.update(tags_de_tablas(*session.info.get(TABLAS_PENDIENTES, ())))
+    if tags:
+        try:
+            response_cache.invalidar(*tags)
+        except Exception:
+            pass
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _descartar_al_revertir(session, previous_transaction):
+    # Solo al revertir la transacción principal: un savepoint revertido no anula lo anterior
+    if previous_transaction.parent is None:
+        session.info.pop(TAGS_PENDIENTES, None)
@@ -0,0 +1,151 @@
+"""
+Versiones por tabla para respuestas condicionales (ETag / Last-Modified)
+
+Cada vez que se confirma una transacción que insertó, modificó o eliminó filas de una
+tabla se incrementa su contador en VersionTabla. Las tablas modificadas se detectan
+automáticamente desde la sesión (flush de objetos ORM y sentencias insert/update/delete
+ejecutadas con db.session.execute), así que los repositorios no tienen que marcar nada.
+
+El contador vive en la base de datos, no en memoria: todos los workers ven la misma
+versión y un ETag emitido por uno es válido en los demás.
+
+Si el incremento falla después de confirmar, las tablas quedan marcadas en este proceso
+y respuesta_condicional no emite validadores para ellas (ni responde 304) hasta que un
+reintento del incremento salga bien.
+"""
+
+import threading
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.exc import IntegrityError
+
+from src.app import db
+from src.models.version_tabla import VersionTabla
+
+TABLAS_PENDIENTES = 'version_tablas_pendientes'
+
+# Tablas modificadas cuya versión no se pudo incrementar (su ETag actual ya no es confiable)
+_tablas_sin_version = set()
+_lock_sin_version = threading.Lock()
+
+
+def _tablas_pendientes(session):
+    return session.info.setdefault(TABLAS_PENDIENTES, set())
+
+
+def obtener_versiones(tablas):
+    """
+    Devuelve ({tabla: version}, última modificación en UTC o None) con una sola consulta.
+    Las tablas que nunca se modificaron tienen versión 0.
+    """
+    filas = db.session.execute(
+        select(VersionTabla.tabla, VersionTabla.version, VersionTabla.actualizado_en)
+        .where(VersionTabla.tabla.in_(tablas))
+    ).all()
+    versiones = {tabla: 0 for tabla in tablas}
+    ultima_modificacion = None
+    for tabla, version, actualizado_en in filas:
+        versiones[tabla] = version
+        if ultima_modificacion is None or actualizado_en > ultima_modificacion:
+            ultima_modificacion = actualizado_en
+    if ultima_modificacion is not None:
+        ultima_modificacion = ultima_modificacion.replace(tzinfo=timezone.utc)
+    return versiones, ultima_modificacion
+
+
+def incrementar_versiones(tablas, reintentar=True):
+    """
+    Incrementa la versión de cada tabla en una transacción propia y corta
+    (fuera de la transacción de negocio, para no serializar a los escritores
+    de una misma tabla sobre la fila de VersionTabla)
+    """
+    ahora = datetime.now(timezone.utc).replace(tzinfo=None)
+    tabla_versiones = VersionTabla.__table__
+    try:
+        with db.engine.begin() as conn:
+            # Un solo UPDATE para todas las tablas; solo las que aún no tienen fila se insertan
+            actualizadas = set(conn.execute(
+                update(tabla_versiones)
+                .where(tabla_versiones.c.tabla.in_(sorted(tablas)))
+                .values(version=tabla_versiones.c.version + 1, actualizado_en=ahora)
+                .returning(tabla_versiones.c.tabla)
+            ).scalars())
+            nuevas = sorted(set(tablas) - actualizadas)
+            if nuevas:
+                conn.execute(insert(tabla_versiones),
+                             [{'tabla': tabla, 'version': 1, 'actualizado_en': ahora} for tabla in nuevas])
+    except IntegrityError:
+        # Otro worker creó la fila de la tabla al mismo tiempo: ahora el UPDATE sí la encuentra
+        if reintentar:
+            incrementar_versiones(tablas, reintentar=False)
+        else:
+            raise
+
+
+def actualizar_versiones(tablas):
+    """
+    Incrementa la versión de `tablas` sin propagar errores. Si falla, las tablas quedan
+    sin validadores en este proceso hasta un incremento exitoso.
+
+    Returns:
+        bool: True si el incremento se confirmó
+    """
+    try:
+        incrementar_versiones(tablas)
+    except Exception:
+        current_app.logger.exception('No se pudo incrementar la versión de %s', ', '.join(sorted(tablas)))
+        with _lock_sin_version:
+            _tablas_sin_version.update(tablas)
+        return False
+    with _lock_sin_version:
+        _tablas_sin_version.difference_update(tablas)
+    return True
+
+
+def versiones_confiables(tablas):
+    """
+    False si alguna de `tablas` tiene un incremento fallido pendiente y el reintento
+    tampoco sale bien (la respuesta debe ir sin ETag ni Last-Modified)
+    """
+    pendientes = _tablas_sin_version.intersection(tablas)
+    return not pendientes or actualizar_versiones(pendientes)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _registrar_flush(session, flush_context):
+    tablas = _tablas_pendientes(session)
+    for obj in session.new:
+        tablas.add(obj.__table__.name)
+    for obj in session.deleted:
+        tablas.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tablas.add(obj.__table__.name)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _registrar_sentencia(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        tabla = getattr(orm_execute_state.statement, 'table', None)
+        if tabla is not None and getattr(tabla, 'name', None):
+            _tablas_pendientes(orm_execute_state.session).add(tabla.name)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _incrementar_al_confirmar(session):
+    # También se dispara al liberar un savepoint: solo cuenta el commit de la transacción principal
+    if session.in_nested_transaction():
+        return
+    tablas = session.info.pop(TABLAS_PENDIENTES, None)
+    if tablas:
+        # Un fallo aquí no debe afectar a la transacción ya confirmada
+        actualizar_versiones(tablas)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _descartar_al_revertir(session, previous_transaction):
+    # Solo al revertir la transacción principal: un savepoint revertido no anula lo anterior
+    if previous_transaction.parent is None:
+        session.info.pop(TABLAS_PENDIENTES, None)
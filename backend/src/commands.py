@@ -0,0 +1,67 @@
+"""
+Comandos CLI de la aplicación (flask <comando>), pensados para ejecutarse desde cron
+
+    flask --app run pronosticar-asistencias --dias 7 --modelo random_forest
+    flask --app run barrer-vencimientos                  # una corrida (cron)
+    flask --app run barrer-vencimientos --intervalo 300  # proceso que corre cada 5 minutos
+    flask --app run reconciliar-inscritos [--horario 12]
+"""
+
+import json
+import time
+import click
+
+
+def register_commands(app):
+    @app.cli.command('pronosticar-asistencias')
+    @click.option('--dias', default=7, show_default=True, help='Días hacia adelante a pronosticar')
+    @click.option('--modelo', default='random_forest', show_default=True,
+                  type=click.Choice(['random_forest', 'logistic_regression']))
+    @click.option('--chunk', default=1000, show_default=True, help='Registros por llamada al modelo')
+    def pronosticar_asistencias(dias, modelo, chunk):
+        """Calcula la asistencia esperada de las próximas sesiones"""
+        from .services.pronostico_asistencia_service import PronosticoAsistenciaService
+
+        resultado, status = PronosticoAsistenciaService.generar_pronosticos(
+            dias=dias, model_type=modelo, chunk=chunk)
+        click.echo(json.dumps(resultado, ensure_ascii=False, indent=2))
+        if status != 200:
+            raise SystemExit(1)
+
+    @app.cli.command('barrer-vencimientos')
+    @click.option('--intervalo', default=0, show_default=True,
+                  help='Segundos entre corridas; 0 ejecuta una sola vez')
+    @click.option('--historial', default=0, show_default=True,
+                  help='Muestra las últimas N corridas registradas y termina')
+    def barrer_vencimientos(intervalo, historial):
+        """Suspende las inscripciones con pagos vencidos y registra cantidad y duración"""
+        from .app import db
+        from .services.inscripcion_service import InscripcionService, TAREA_VENCIMIENTOS
+        from .repositories.ejecucion_tarea_repository import EjecucionTareaRepository
+
+        if historial:
+            ejecuciones = EjecucionTareaRepository.get_ultimas(TAREA_VENCIMIENTOS, historial)
+            click.echo(json.dumps([e.to_dict() for e in ejecuciones], ensure_ascii=False, indent=2))
+            return
+
+        while True:
+            resultado, status = InscripcionService.barrer_vencimientos()
+            click.echo(json.dumps(resultado, ensure_ascii=False))
+            # Libera la conexión entre corridas para no retener una transacción abierta
+            db.session.remove()
+            if intervalo <= 0:
+                if status != 200:
+                    raise SystemExit(1)
+                return
+            time.sleep(intervalo)
+
+    @app.cli.command('reconciliar-inscritos')
+    @click.option('--horario', type=int, default=None, help='Solo este horario (por defecto todos)')
+    def reconciliar_inscritos(horario):
+        """Reconstruye desde Asistencia el contador total_inscritos de los horarios"""
+        from .services.horario_service import HorarioService
+
+        resultado, status = HorarioService.reconciliar_inscritos(horario)
+        click.echo(json.dumps(resultado, ensure_ascii=False))
+        if status != 200:
+            raise SystemExit(1)
@@ -0,0 +1,105 @@
+"""
+Instrumentación SQL por request y detector de N+1
+
+Con SQL_INSTRUMENTATION_ENABLED se escuchan before/after_cursor_execute del engine y,
+para cada request, se acumulan la cantidad de sentencias y el tiempo en la base de
+datos. La respuesta lleva:
+
+    X-Query-Count: 12
+    Server-Timing: db;dur=8.41;desc="SQL (12)", app;dur=20.07
+
+Si una misma forma de sentencia (el SQL con parámetros, con las listas IN colapsadas)
+se ejecuta más de SQL_N1_UMBRAL veces en un request se registra un warning con la ruta
+y la sentencia: es la firma de un bucle que consulta por elemento.
+
+Desactivada no se registra ningún listener ni hook, así que no tiene costo.
+"""
+
+import re
+import time
+from collections import Counter
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+from src.app import db
+
+# "(?, ?, ?)" / "(%(p_1)s, %(p_2)s)" / "(__[POSTCOMPILE_ids])" -> "(?)"
+_LISTA_PARAMETROS = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))*\s*\)')
+_ESPACIOS = re.compile(r'\s+')
+
+
+def forma_sentencia(statement):
+    """
+    Normaliza una sentencia para agrupar las que solo difieren en el largo de sus listas IN
+    """
+    return _ESPACIOS.sub(' ', _LISTA_PARAMETROS.sub('(?)', statement)).strip()
+
+
+def _medicion_actual():
+    return g.get('sql_medicion') if has_request_context() else None
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if _medicion_actual() is not None:
+        conn.info.setdefault('sql_inicios', []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    medicion = _medicion_actual()
+    inicios = conn.info.get('sql_inicios')
+    if medicion is None or not inicios:
+        return
+    medicion['ms'] += (time.perf_counter() - inicios.pop()) * 1000
+    medicion['consultas'] += 1
+    medicion['formas'][forma_sentencia(statement)] += 1
+
+
+def _error_al_ejecutar(contexto):
+    # Una sentencia que falla no llega a after_cursor_execute: se descarta su inicio
+    inicios = contexto.connection.info.get('sql_inicios') if contexto.connection is not None else None
+    if inicios:
+        inicios.pop()
+
+
+def init_instrumentacion(app):
+    """
+    Registra los listeners y hooks si SQL_INSTRUMENTATION_ENABLED está activo
+    """
+    if not app.config.get('SQL_INSTRUMENTATION_ENABLED', False):
+        return
+
+    umbral = app.config.get('SQL_N1_UMBRAL', 10)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _antes_de_ejecutar)
+    event.listen(engine, 'after_cursor_execute', _despues_de_ejecutar)
+    event.listen(engine, 'handle_error', _error_al_ejecutar)
+
+    @app.before_request
+    def iniciar_medicion():
+        g.sql_medicion = {'inicio': time.perf_counter(), 'consultas': 0, 'ms': 0.0, 'formas': Counter()}
+
+    @app.after_request
+    def reportar_medicion(response):
+        # Se retira de g para que nada fuera de este request se siga sumando
+        medicion = g.pop('sql_medicion', None)
+        if medicion is None:
+            return response
+        app_ms = (time.perf_counter() - medicion['inicio']) * 1000
+        response.headers['X-Query-Count'] = str(medicion['consultas'])
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={medicion["ms"]:.2f};desc="SQL ({medicion["consultas"]})", app;dur={app_ms:.2f}'
+        )
+
+        ruta = request.url_rule.rule if request.url_rule is not None else request.path
+        for forma, repeticiones in medicion['formas'].most_common():
+            if repeticiones <= umbral:
+                break
+            app.logger.warning(
+                'Posible N+1 en %s %s: %d ejecuciones de la misma sentencia: %s',
+                request.method, ruta, repeticiones, forma[:500]
+            )
+        return response
@@ -0,0 +1,129 @@
+"""
+Registro de modelos ML compartido por todo el proceso (un registro por worker)
+
+Cada variante (predictor + model_type) se carga una sola vez y se reutiliza entre
+requests. Antes de devolverla se comprueba, como máximo cada `check_interval`
+segundos, si cambiaron los .pkl en disco (mtime + tamaño); si cambiaron se
+vuelve a cargar (hot reload) sin reiniciar el servidor.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+from src.ml.predictors.asistencia_predictor import AsistenciaPredictor
+from src.ml.predictors.inscripcion_predictor import InscripcionPredictor
+
+PREDICTORES = {
+    'paquete': InscripcionPredictor,
+    'asistencia': AsistenciaPredictor
+}
+
+MODEL_TYPES = ('random_forest', 'logistic_regression')
+
+
+class _EntradaModelo:
+    """Predictor cargado junto con la huella de los archivos de los que salió"""
+
+    def __init__(self, predictor, huella, segundos_carga):
+        self.predictor = predictor
+        self.huella = huella
+        self.version = hashlib.sha1(repr(huella).encode('utf-8')).hexdigest()[:12]
+        self.cargado_en = datetime.now()
+        self.segundos_carga = segundos_carga
+        self.ultima_verificacion = time.monotonic()
+
+
+class ModelRegistry:
+    def __init__(self, check_interval=5.0):
+        """
+        Args:
+            check_interval: segundos mínimos entre verificaciones de cambios en disco
+        """
+        self.check_interval = check_interval
+        self._entradas = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.check_interval = app.config.get('ML_MODEL_RELOAD_CHECK_SECONDS', self.check_interval)
+
+    def get(self, nombre, model_type='random_forest'):
+        """
+        Devuelve el predictor `nombre` ('paquete' | 'asistencia') para `model_type`,
+        cargándolo en el primer uso o si sus archivos cambiaron en disco
+        """
+        if nombre not in PREDICTORES:
+            raise ValueError(f"Predictor desconocido: {nombre}")
+        # Igual que los predictores: cualquier tipo distinto de random_forest usa regresión logística
+        if model_type not in MODEL_TYPES:
+            model_type = 'logistic_regression'
+
+        clave = (nombre, model_type)
+        entrada = self._entradas.get(clave)
+        if entrada is not None and not self._debe_verificar(entrada):
+            return entrada.predictor
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            huella = self._huella(nombre, model_type)
+            if entrada is None or entrada.huella != huella:
+                entrada = self._cargar(nombre, model_type, huella)
+                self._entradas[clave] = entrada
+            else:
+                entrada.ultima_verificacion = time.monotonic()
+            return entrada.predictor
+
+    def precargar(self):
+        """
+        Carga todas las variantes conocidas (usado al arrancar el worker)
+        """
+        for nombre in PREDICTORES:
+            for model_type in MODEL_TYPES:
+                self.get(nombre, model_type)
+
+    def estado(self):
+        """
+        Información de las variantes cargadas para /ml/health
+        """
+        estado = {}
+        for (nombre, model_type), entrada in sorted(self._entradas.items()):
+            estado[f'{nombre}/{model_type}'] = {
+                'cargado': entrada.predictor.model is not None,
+                'version': entrada.version,
+                'cargado_en': entrada.cargado_en.isoformat(),
+                'tiempo_carga_ms': round(entrada.segundos_carga * 1000, 2),
+                'archivos': {
+                    os.path.basename(path): datetime.fromtimestamp(mtime / 1e9).isoformat() if mtime else None
+                    for path, mtime, _ in entrada.huella
+                }
+            }
+        return estado
+
+    def _debe_verificar(self, entrada):
+        return time.monotonic() - entrada.ultima_verificacion >= self.check_interval
+
+    @staticmethod
+    def _huella(nombre, model_type):
+        """
+        (ruta, mtime_ns, tamaño) de cada archivo del modelo; None si el archivo no existe
+        """
+        huella = []
+        for path in sorted(PREDICTORES[nombre].model_files(model_type).values()):
+            try:
+                stat = os.stat(path)
+                huella.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                huella.append((path, None, None))
+        return tuple(huella)
+
+    @staticmethod
+    def _cargar(nombre, model_type, huella):
+        inicio = time.perf_counter()
+        predictor = PREDICTORES[nombre](model_type=model_type)
+        return _EntradaModelo(predictor, huella, time.perf_counter() - inicio)
+
+
+# (ML_MODEL_RELOAD_CHECK_SECONDS se aplica en create_app)
+model_registry = ModelRegistry()
@@ -5,6 +5,9 @@ Predictor de asistencias usando modelos entrenados
 import joblib
 import numpy as np
 import os
+from src.ml.predictors.encoders import build_encoder_maps
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
 
 class AsistenciaPredictor:
     def __init__(self, model_type='random_forest'):
@@ -19,27 +22,39 @@ class AsistenciaPredictor:
         self.scaler = None
         self.label_encoders = None
         self.feature_names = None
+        self.encoder_maps = {}
         
         self._load_models()
     
+    @staticmethod
+    def model_files(model_type='random_forest'):
+        """Rutas de los archivos .pkl que usa cada variante del modelo"""
+        paths = {}
+        if model_type == 'random_forest':
+            paths['model'] = os.path.join(MODELS_DIR, 'random_forest_asistencias.pkl')
+        else:
+            paths['model'] = os.path.join(MODELS_DIR, 'logistic_regression_asistencias.pkl')
+            # Regresión logística necesita scaler
+            paths['scaler'] = os.path.join(MODELS_DIR, 'scaler_asistencias.pkl')
+        
+        paths['label_encoders'] = os.path.join(MODELS_DIR, 'label_encoders_asistencias.pkl')
+        paths['feature_names'] = os.path.join(MODELS_DIR, 'feature_names_asistencias.pkl')
+        return paths
+    
     def _load_models(self):
         """Carga los modelos y componentes guardados"""
-        base_path = 'src/ml/models'
+        paths = self.model_files(self.model_type)
         
         try:
             # Cargar modelo según tipo
-            if self.model_type == 'random_forest':
-                model_path = f'{base_path}/random_forest_asistencias.pkl'
-                self.model = joblib.load(model_path)
-            else:
-                model_path = f'{base_path}/logistic_regression_asistencias.pkl'
-                self.model = joblib.load(model_path)
-                # Regresión logística necesita scaler
-                self.scaler = joblib.load(f'{base_path}/scaler_asistencias.pkl')
+            self.model = joblib.load(paths['model'])
+            if 'scaler' in paths:
+                self.scaler = joblib.load(paths['scaler'])
             
             # Cargar componentes comunes
-            self.label_encoders = joblib.load(f'{base_path}/label_encoders_asistencias.pkl')
-            self.feature_names = joblib.load(f'{base_path}/feature_names_asistencias.pkl')
+            self.label_encoders = joblib.load(paths['label_encoders'])
+            self.feature_names = joblib.load(paths['feature_names'])
+            self.encoder_maps = build_encoder_maps(self.label_encoders)
             
             print(f"✅ Modelo {self.model_type} cargado correctamente")
             
@@ -73,90 +88,114 @@ class AsistenciaPredictor:
         Returns:
             dict: {'asistira': bool, 'probabilidad': float}
         """
-        if self.model is None:
-            return {'error': 'Modelo no cargado'}
+        return self.predict_batch([features_dict])[0]
+    
+    def _feature_column(self, feature_name, features_list):
+        """
+        Construye una columna de la matriz de features para todos los registros.
+        Devuelve (valores, errores) donde errores es {indice_fila: mensaje}.
+        """
+        errores = {}
         
-        try:
-            # Construir vector de features
-            features = self._build_feature_vector(features_dict)
-            
-            # Predecir
-            if self.model_type == 'logistic_regression':
-                features = self.scaler.transform([features])
-                prediction = self.model.predict(features)[0]
-                probability = self.model.predict_proba(features)[0][1]
-            else:
-                prediction = self.model.predict([features])[0]
-                probability = self.model.predict_proba([features])[0][1]
-            
-            return {
-                'asistira': bool(prediction),
-                'probabilidad': round(float(probability * 100), 2),
-                'confianza': 'Alta' if probability > 0.7 or probability < 0.3 else 'Media'
-            }
-            
-        except Exception as e:
-            return {'error': f'Error en predicción: {str(e)}'}
+        if feature_name.endswith('_encoded'):
+            # Variable categórica codificada: lookup en el mapa precalculado (desconocido -> 0)
+            original_col = feature_name.replace('_encoded', '')
+            mapa = self.encoder_maps.get(original_col, {})
+            return [mapa.get(str(f.get(original_col, '')), 0) for f in features_list], errores
+        
+        valores = []
+        for i, features_dict in enumerate(features_list):
+            try:
+                valores.append(float(self._feature_value(feature_name, features_dict)))
+            except Exception as e:
+                errores[i] = f"{feature_name}: {str(e)}"
+                valores.append(0)
+        return valores, errores
     
-    def _build_feature_vector(self, features_dict):
-        """Construye el vector de features desde el diccionario"""
-        feature_vector = []
+    @staticmethod
+    def _feature_value(feature_name, features_dict):
+        """Valor de una feature numérica para un registro"""
+        if feature_name == 'Ciclo':
+            return features_dict.get('Ciclo', 0)
         
-        for feature_name in self.feature_names:
-            if feature_name == 'Ciclo':
-                feature_vector.append(features_dict.get('Ciclo', 0))
-            
-            elif feature_name == 'hora_inicio_minutos':
-                hora = features_dict.get('Hora Inicio', '00:00')
-                h, m = map(int, hora.split(':'))
-                feature_vector.append(h * 60 + m)
-            
-            elif feature_name == 'Hora_Sesion':
-                feature_vector.append(features_dict.get('Hora_Sesion', 1.5))
-            
-            elif feature_name == 'tiene_paquete':
-                feature_vector.append(1 if features_dict.get('Paquete') == 'Si' else 0)
-            
-            elif feature_name == 'cantidad_clases_num':
-                feature_vector.append(features_dict.get('Cantidad clases', 0))
-            
-            elif feature_name == 'descuento_porcentaje':
-                desc = features_dict.get('Descuento', '0%')
-                feature_vector.append(float(desc.replace('%', '')))
-            
-            elif feature_name.endswith('_encoded'):
-                # Es una variable categórica codificada
-                original_col = feature_name.replace('_encoded', '')
-                value = features_dict.get(original_col, '')
-                
-                if original_col in self.label_encoders:
-                    encoder = self.label_encoders[original_col]
-                    try:
-                        encoded_value = encoder.transform([str(value)])[0]
-                    except:
-                        # Si el valor no existe, usar el más común (0)
-                        encoded_value = 0
-                    feature_vector.append(encoded_value)
-                else:
-                    feature_vector.append(0)
-        
-        return feature_vector
+        elif feature_name == 'hora_inicio_minutos':
+            hora = features_dict.get('Hora Inicio', '00:00')
+            h, m = map(int, hora.split(':'))
+            return h * 60 + m
+        
+        elif feature_name == 'Hora_Sesion':
+            return features_dict.get('Hora_Sesion', 1.5)
+        
+        elif feature_name == 'tiene_paquete':
+            return 1 if features_dict.get('Paquete') == 'Si' else 0
+        
+        elif feature_name == 'cantidad_clases_num':
+            return features_dict.get('Cantidad clases', 0)
+        
+        elif feature_name == 'descuento_porcentaje':
+            desc = features_dict.get('Descuento', '0%')
+            return float(desc.replace('%', ''))
+        
+        return 0
+    
+    def _build_feature_matrix(self, features_list):
+        """
+        Construye la matriz (n_registros x n_features) columna por columna.
+        Devuelve (matriz, errores) donde errores es {indice_fila: mensaje}.
+        """
+        matriz = np.empty((len(features_list), len(self.feature_names)), dtype=float)
+        errores = {}
+        
+        for j, feature_name in enumerate(self.feature_names):
+            valores, errores_columna = self._feature_column(feature_name, features_list)
+            matriz[:, j] = valores
+            for i, mensaje in errores_columna.items():
+                errores.setdefault(i, mensaje)
+        
+        return matriz, errores
     
     def predict_batch(self, features_list):
         """
-        Predice para múltiples registros
+        Predice para múltiples registros con una sola llamada a predict_proba
         
         Args:
             features_list: Lista de diccionarios con features
         
         Returns:
-            list: Lista de predicciones
+            list: Lista de predicciones (mismo orden que la entrada)
         """
-        results = []
-        for features in features_list:
-            result = self.predict(features)
-            results.append(result)
-        return results
+        if self.model is None:
+            return [{'error': 'Modelo no cargado'} for _ in features_list]
+        
+        if not features_list:
+            return []
+        
+        try:
+            matriz, errores = self._build_feature_matrix(features_list)
+            validos = [i for i in range(len(features_list)) if i not in errores]
+            
+            results = [{'error': f'Error en predicción: {errores[i]}'} if i in errores else None
+                       for i in range(len(features_list))]
+            if not validos:
+                return results
+            
+            matriz = matriz[validos] if errores else matriz
+            if self.model_type == 'logistic_regression':
+                matriz = self.scaler.transform(matriz)
+            
+            probabilidades = self.model.predict_proba(matriz)
+            predicciones = self.model.classes_[np.argmax(probabilidades, axis=1)]
+            
+            for i, prediction, probability in zip(validos, predicciones, probabilidades[:, 1]):
+                results[i] = {
+                    'asistira': bool(prediction),
+                    'probabilidad': round(float(probability * 100), 2),
+                    'confianza': 'Alta' if probability > 0.7 or probability < 0.3 else 'Media'
+                }
+            return results
+            
+        except Exception as e:
+            return [{'error': f'Error en predicción: {str(e)}'} for _ in features_list]
 
 
 # Ejemplo de uso
@@ -0,0 +1,14 @@
+"""
+Utilidades de codificación compartidas por los predictores
+"""
+
+
+def build_encoder_maps(label_encoders):
+    """
+    Precalcula {columna: {valor: código}} a partir de los LabelEncoder entrenados,
+    para codificar lotes sin llamar a encoder.transform por cada valor
+    """
+    return {
+        col: {str(clase): codigo for codigo, clase in enumerate(encoder.classes_)}
+        for col, encoder in (label_encoders or {}).items()
+    }
@@ -5,8 +5,20 @@ Predictor de inscripciones usando modelos entrenados
 import joblib
 import numpy as np
 import os
+from src.ml.predictors.encoders import build_encoder_maps
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
 
 class InscripcionPredictor:
+    # Columnas categóricas (en el orden de entrenamiento) y su valor por defecto
+    CATEGORICAS = ('Departamento', 'Proyecto', 'Genero', 'Metodo de pago')
+    DEFAULTS = {
+        'Departamento': 'LP',
+        'Proyecto': 'Camino Femme',
+        'Genero': 'Femenino',
+        'Metodo de pago': 'QR'
+    }
+    
     def __init__(self, model_type='random_forest'):
         """
         Inicializa el predictor de inscripciones
@@ -18,25 +30,36 @@ class InscripcionPredictor:
         self.model = None
         self.scaler = None
         self.label_encoders = None
+        self.encoder_maps = {}
         
         self._load_models()
     
+    @staticmethod
+    def model_files(model_type='random_forest'):
+        """Rutas de los archivos .pkl que usa cada variante del modelo"""
+        if model_type == 'random_forest':
+            model_path = os.path.join(MODELS_DIR, 'rf_paquete_classifier.pkl')
+        else:
+            model_path = os.path.join(MODELS_DIR, 'lr_paquete_classifier.pkl')
+        
+        return {
+            'model': model_path,
+            'scaler': os.path.join(MODELS_DIR, 'scaler_inscripciones.pkl'),
+            'label_encoders': os.path.join(MODELS_DIR, 'label_encoders_inscripciones.pkl')
+        }
+    
     def _load_models(self):
         """Carga los modelos entrenados"""
-        base_path = 'src/ml/models'
+        paths = self.model_files(self.model_type)
         
         try:
             # Cargar modelo según tipo
-            if self.model_type == 'random_forest':
-                model_path = f'{base_path}/rf_paquete_classifier.pkl'
-                self.model = joblib.load(model_path)
-            else:
-                model_path = f'{base_path}/lr_paquete_classifier.pkl'
-                self.model = joblib.load(model_path)
+            self.model = joblib.load(paths['model'])
             
             # Cargar componentes
-            self.scaler = joblib.load(f'{base_path}/scaler_inscripciones.pkl')
-            self.label_encoders = joblib.load(f'{base_path}/label_encoders_inscripciones.pkl')
+            self.scaler = joblib.load(paths['scaler'])
+            self.label_encoders = joblib.load(paths['label_encoders'])
+            self.encoder_maps = build_encoder_maps(self.label_encoders)
             
             print(f"✅ Modelo {self.model_type} cargado")
             
@@ -61,86 +84,83 @@ class InscripcionPredictor:
         Returns:
             dict: {'comprara_paquete': bool, 'probabilidad': float, 'confianza': str}
         """
+        return self.predict_compra_paquete_batch([alumno_data])[0]
+    
+    def _build_feature_matrix(self, alumnos):
+        """
+        Construye la matriz de features columna por columna:
+        Ciclo, Departamento, Proyecto, Genero, Metodo de pago, Descuento, mes_inscripcion.
+        Devuelve (matriz, errores) donde errores es {indice_fila: mensaje}.
+        """
+        matriz = np.zeros((len(alumnos), 7), dtype=float)
+        errores = {}
+        
+        def columna_numerica(j, obtener):
+            for i, alumno in enumerate(alumnos):
+                try:
+                    matriz[i, j] = float(obtener(alumno))
+                except Exception as e:
+                    errores.setdefault(i, str(e))
+        
+        # Ciclo
+        columna_numerica(0, lambda a: a.get('Ciclo', 1))
+        
+        # Categóricas codificadas (valor desconocido -> 0)
+        for j, col in enumerate(self.CATEGORICAS, start=1):
+            mapa = self.encoder_maps.get(col, {})
+            matriz[:, j] = [mapa.get(str(a.get(col, self.DEFAULTS[col])), 0) for a in alumnos]
+        
+        # Descuento
+        columna_numerica(5, lambda a: a.get('Descuento', '0%').replace('%', ''))
+        
+        # Mes inscripción
+        columna_numerica(6, lambda a: a.get('mes_inscripcion', 1))
+        
+        return matriz, errores
+    
+    def predict_compra_paquete_batch(self, alumnos):
+        """
+        Predice para una lista de alumnos con una sola llamada a predict_proba
+        
+        Args:
+            alumnos: lista de diccionarios con el mismo formato que predict_compra_paquete
+        
+        Returns:
+            list: predicciones en el mismo orden que la entrada
+        """
         if self.model is None:
-            return {'error': 'Modelo no cargado'}
+            return [{'error': 'Modelo no cargado'} for _ in alumnos]
+        
+        if not alumnos:
+            return []
         
         try:
-            # Construir features
-            features = []
+            matriz, errores = self._build_feature_matrix(alumnos)
+            validos = [i for i in range(len(alumnos)) if i not in errores]
             
-            # Ciclo
-            features.append(alumno_data.get('Ciclo', 1))
-            
-            # Departamento (codificado)
-            dept = alumno_data.get('Departamento', 'LP')
-            if 'Departamento' in self.label_encoders:
-                try:
-                    dept_encoded = self.label_encoders['Departamento'].transform([dept])[0]
-                except:
-                    dept_encoded = 0
-            else:
-                dept_encoded = 0
-            features.append(dept_encoded)
-            
-            # Proyecto (codificado)
-            proyecto = alumno_data.get('Proyecto', 'Camino Femme')
-            if 'Proyecto' in self.label_encoders:
-                try:
-                    proyecto_encoded = self.label_encoders['Proyecto'].transform([proyecto])[0]
-                except:
-                    proyecto_encoded = 0
-            else:
-                proyecto_encoded = 0
-            features.append(proyecto_encoded)
-            
-            # Genero (codificado)
-            genero = alumno_data.get('Genero', 'Femenino')
-            if 'Genero' in self.label_encoders:
-                try:
-                    genero_encoded = self.label_encoders['Genero'].transform([genero])[0]
-                except:
-                    genero_encoded = 0
-            else:
-                genero_encoded = 0
-            features.append(genero_encoded)
-            
-            # Metodo de pago (codificado)
-            metodo = alumno_data.get('Metodo de pago', 'QR')
-            if 'Metodo de pago' in self.label_encoders:
-                try:
-                    metodo_encoded = self.label_encoders['Metodo de pago'].transform([metodo])[0]
-                except:
-                    metodo_encoded = 0
-            else:
-                metodo_encoded = 0
-            features.append(metodo_encoded)
-            
-            # Descuento
-            descuento_str = alumno_data.get('Descuento', '0%')
-            descuento = float(descuento_str.replace('%', ''))
-            features.append(descuento)
-            
-            # Mes inscripción
-            features.append(alumno_data.get('mes_inscripcion', 1))
-            
-            # Predecir
-            features_array = np.array([features])
+            results = [{'error': f'Error en predicción: {errores[i]}'} if i in errores else None
+                       for i in range(len(alumnos))]
+            if not validos:
+                return results
             
+            matriz = matriz[validos] if errores else matriz
             if self.model_type == 'logistic_regression':
-                features_array = self.scaler.transform(features_array)
+                matriz = self.scaler.transform(matriz)
             
-            prediction = self.model.predict(features_array)[0]
-            probability = self.model.predict_proba(features_array)[0][1]
+            probabilidades = self.model.predict_proba(matriz)
+            predicciones = self.model.classes_[np.argmax(probabilidades, axis=1)]
             
-            return {
-                'comprara_paquete': bool(prediction),
-                'probabilidad': round(float(probability * 100), 2),
-                'confianza': 'Alta' if probability > 0.7 or probability < 0.3 else 'Media',
-                'recomendacion': self._get_recomendacion(bool(prediction), probability)
-            }
+            for i, prediction, probability in zip(validos, predicciones, probabilidades[:, 1]):
+                results[i] = {
+                    'comprara_paquete': bool(prediction),
+                    'probabilidad': round(float(probability * 100), 2),
+                    'confianza': 'Alta' if probability > 0.7 or probability < 0.3 else 'Media',
+                    'recomendacion': self._get_recomendacion(bool(prediction), probability)
+                }
+            return results
             
         except Exception as e:
-            return {'error': f'Error en predicción: {str(e)}'}
+            return [{'error': f'Error en predicción: {str(e)}'} for _ in alumnos]
     
     def _get_recomendacion(self, comprara, probabilidad):
         """Genera recomendación basada en predicción"""
@@ -24,10 +24,15 @@ from .pago import Pago
 from .notificacion import Notificacion
 from .notificacion_persona import NotificacionPersona
 from .permiso import Permiso
+from .dashboard_ciclo import DashboardCiclo
+from .pronostico_asistencia import PronosticoAsistencia
+from .version_tabla import VersionTabla
+from .ejecucion_tarea import EjecucionTarea
 
 __all__ = [
 	'Categoria', 'Estilo', 'Horario', 'HorarioSesion', 'Oferta', 'Paquete',
 	'Persona', 'Profesor', 'Alumno', 'Director', 'Programa', 'Sala', 'Sesion', 'Subcategoria', 'Ciclo',
 	'Elenco', 'AlumnoFemme'
-		, 'Inscripcion', 'Promocion', 'Asistencia', 'Premio', 'MetodoPago', 'Pago', 'Notificacion', 'NotificacionPersona', 'Permiso'
+		, 'Inscripcion', 'Promocion', 'Asistencia', 'Premio', 'MetodoPago', 'Pago', 'Notificacion', 'NotificacionPersona', 'Permiso',
+	'DashboardCiclo', 'PronosticoAsistencia', 'VersionTabla', 'EjecucionTarea'
 ]
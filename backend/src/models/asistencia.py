@@ -1,9 +1,13 @@
-from sqlalchemy import Column, BigInteger, Boolean, Date, ForeignKey
+from sqlalchemy import Column, BigInteger, Boolean, Date, ForeignKey, Index
 from src.app import db
 
 
 class Asistencia(db.Model):
     __tablename__ = 'Asistencia'
+    __table_args__ = (
+        Index('ix_Asistencia_inscripcion_estado', 'Inscripcion_id_inscripcion', 'estado'),
+        Index('ix_Asistencia_horario_sesion_estado', 'Horario_sesion_id_horario_sesion', 'estado'),
+    )
 
     id_asistencia = Column(BigInteger, primary_key=True)
     # FK to Inscripcion (table `Inscripcion`, pk `id_inscripcion`)
@@ -0,0 +1,42 @@
+from ..app import db
+from sqlalchemy import Column, Integer, BigInteger, Numeric, DateTime, ForeignKey
+
+class DashboardCiclo(db.Model):
+    """
+    Snapshot materializado de los KPIs generales de un ciclo.
+    Se guarda como contadores para poder actualizarlo de forma incremental
+    (la asistencia promedio se deriva de presentes / registros).
+    """
+    __tablename__ = 'DashboardCiclo'
+
+    Ciclo_id_ciclo = Column(Integer, ForeignKey('ciclo.id_ciclo'), primary_key=True)
+
+    total_alumnas = Column(Integer, nullable=False, default=0)
+    ocupacion_promedio = Column(Numeric(7, 2), nullable=False, default=0)
+
+    # Ingresos confirmados del mes (mes_ingresos/anio_ingresos) al que corresponde el snapshot
+    ingresos_mes_actual = Column(Numeric(12, 2), nullable=False, default=0)
+    mes_ingresos = Column(Integer, nullable=False)
+    anio_ingresos = Column(Integer, nullable=False)
+
+    asistencias_registradas = Column(BigInteger, nullable=False, default=0)
+    asistencias_presentes = Column(BigInteger, nullable=False, default=0)
+
+    fecha_actualizacion = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DashboardCiclo ciclo={self.Ciclo_id_ciclo}>"
+
+    def to_dict(self):
+        """
+        Convierte el snapshot al formato de KPIs del dashboard
+        """
+        registradas = self.asistencias_registradas or 0
+        presentes = self.asistencias_presentes or 0
+        asistencia_promedio = (presentes * 100.0 / registradas) if registradas > 0 else 0
+        return {
+            'total_alumnas': int(self.total_alumnas or 0),
+            'ocupacion_promedio': round(float(self.ocupacion_promedio or 0), 2),
+            'ingresos_mes_actual': float(self.ingresos_mes_actual or 0),
+            'asistencia_promedio': round(float(asistencia_promedio), 2)
+        }
@@ -0,0 +1,34 @@
+from ..app import db
+from sqlalchemy import Column, Integer, BigInteger, Numeric, String, Boolean, DateTime, Index
+
+class EjecucionTarea(db.Model):
+    """
+    Registro de cada corrida de un job periódico (p. ej. barrer-vencimientos):
+    cuándo corrió, cuánto tardó y cuántas filas afectó
+    """
+    __tablename__ = 'EjecucionTarea'
+    __table_args__ = (
+        Index('ix_EjecucionTarea_tarea_inicio', 'tarea', 'inicio'),
+    )
+
+    id_ejecucion = Column(BigInteger, primary_key=True, autoincrement=True)
+    tarea = Column(String(64), nullable=False)
+    inicio = Column(DateTime, nullable=False)
+    duracion_ms = Column(Numeric(12, 2), nullable=False)
+    filas_afectadas = Column(Integer, nullable=False, default=0)
+    exito = Column(Boolean, nullable=False, default=True)
+    detalle = Column(String(1000), nullable=True)
+
+    def __repr__(self):
+        return f"<EjecucionTarea {self.tarea} {self.inicio}>"
+
+    def to_dict(self):
+        return {
+            'id_ejecucion': self.id_ejecucion,
+            'tarea': self.tarea,
+            'inicio': self.inicio.isoformat() if self.inicio else None,
+            'duracion_ms': float(self.duracion_ms) if self.duracion_ms is not None else None,
+            'filas_afectadas': self.filas_afectadas,
+            'exito': self.exito,
+            'detalle': self.detalle
+        }
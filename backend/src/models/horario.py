@@ -15,6 +15,9 @@ class Horario(db.Model):
     dias = Column(String(20), nullable=False) 
     hora_inicio = Column(Time, nullable=False)
     hora_fin = Column(Time, nullable=False) 
+    # Asistencias activas en sesiones activas del horario; lo mantiene HorarioRepository.ajustar_inscritos
+    # y se reconstruye con `flask reconciliar-inscritos`
+    total_inscritos = Column(Integer, nullable=False, default=0, server_default='0')
 
     def __repr__(self):
         return f"<Horario {self.id_horario} oferta={self.Oferta_id_oferta}>"
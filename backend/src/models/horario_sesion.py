@@ -1,8 +1,11 @@
 from ..app import db
-from sqlalchemy import Column, Integer, Time, Boolean, ForeignKey, Numeric, BigInteger, String, Date
+from sqlalchemy import Column, Integer, Time, Boolean, ForeignKey, Numeric, BigInteger, String, Date, Index
 
 class HorarioSesion(db.Model):
     __tablename__ = 'HorarioSesion'
+    __table_args__ = (
+        Index('ix_HorarioSesion_horario_estado', 'Horario_id_horario', 'estado'),
+    )
     id_horario_sesion = Column(BigInteger, primary_key=True, autoincrement=True)
     Horario_id_horario = Column(Integer, ForeignKey('Horario.id_horario'), nullable=False)
     dia = Column(Integer, nullable=False)
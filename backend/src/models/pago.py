@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, BigInteger, Numeric, DateTime, Date, String, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Numeric, DateTime, Date, String, ForeignKey, Index
 from src.app import db
 
 
 class Pago(db.Model):
     __tablename__ = 'Pago'
+    __table_args__ = (
+        # Barrido de vencimientos: pagos PENDIENTE con fecha_vencimiento < hoy
+        Index('ix_Pago_estado_fecha_vencimiento', 'estado', 'fecha_vencimiento'),
+    )
 
     id_pago = Column(Integer, primary_key=True)
     Inscripcion_id_inscripcion = Column(BigInteger, ForeignKey('Inscripcion.id_inscripcion'), nullable=False)
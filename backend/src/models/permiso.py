@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, Text, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, Text, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from src.app import db
@@ -6,6 +6,10 @@ from datetime import datetime
 
 class Permiso(db.Model):
     __tablename__ = 'Permiso'
+    __table_args__ = (
+        # Bandeja del director: permisos por estado, de más nuevo a más antiguo
+        Index('ix_Permiso_estado_permiso_id', 'estado_permiso', 'permiso_id'),
+    )
     
     # Campos de la tabla (nombres en minúsculas como están en la BD)
     permiso_id = Column(BigInteger, primary_key=True, autoincrement=True)
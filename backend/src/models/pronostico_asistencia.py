@@ -0,0 +1,33 @@
+from ..app import db
+from sqlalchemy import Column, Integer, BigInteger, Numeric, String, DateTime, ForeignKey
+
+class PronosticoAsistencia(db.Model):
+    """
+    Asistencia esperada por sesión, calculada en lote por el job pronosticar-asistencias
+    """
+    __tablename__ = 'PronosticoAsistencia'
+
+    Horario_sesion_id_horario_sesion = Column(BigInteger, ForeignKey('HorarioSesion.id_horario_sesion'), primary_key=True)
+
+    inscritos = Column(Integer, nullable=False, default=0)
+    asistencia_esperada = Column(Numeric(7, 2), nullable=False, default=0)
+
+    modelo = Column(String(30), nullable=False)
+    version_modelo = Column(String(20), nullable=True)
+    fecha_calculo = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<PronosticoAsistencia sesion={self.Horario_sesion_id_horario_sesion}>"
+
+    def to_dict(self):
+        inscritos = self.inscritos or 0
+        esperada = float(self.asistencia_esperada or 0)
+        return {
+            'horario_sesion_id': self.Horario_sesion_id_horario_sesion,
+            'inscritos': inscritos,
+            'asistencia_esperada': round(esperada, 2),
+            'porcentaje_esperado': round(esperada * 100.0 / inscritos, 2) if inscritos > 0 else 0,
+            'modelo': self.modelo,
+            'version_modelo': self.version_modelo,
+            'fecha_calculo': self.fecha_calculo.isoformat() if self.fecha_calculo else None
+        }
@@ -0,0 +1,16 @@
+from ..app import db
+from sqlalchemy import Column, String, BigInteger, DateTime
+
+class VersionTabla(db.Model):
+    """
+    Contador de versión por tabla: se incrementa cada vez que se confirma una
+    transacción que modificó la tabla. Lo usan los ETag / Last-Modified de src/cache.
+    """
+    __tablename__ = 'VersionTabla'
+
+    tabla = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    actualizado_en = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<VersionTabla {self.tabla}={self.version}>"
@@ -3,12 +3,16 @@ from src.models.horario_sesion import HorarioSesion
 from src.models.inscripcion import Inscripcion
 from src.models.persona import Persona
 from src.models.horario import Horario
+from src.models.estilo import Estilo
 from src.models.oferta import Oferta
 from src.models.ciclo import Ciclo
 from src.models.subcategoria import Subcategoria
 from src.models.categoria import Categoria
 from src.models.programa import Programa
 from src.app import db
+from sqlalchemy import insert, update, func, BigInteger, Boolean
+from src.repositories.paginacion import paginar
+from src.repositories.valores import tabla_valores
 
 class AsistenciaRepository:
     """
@@ -22,6 +26,13 @@ class AsistenciaRepository:
         """
         return Asistencia.query.all()
 
+    @staticmethod
+    def get_pagina(limite, desde_id=None):
+        """
+        Obtiene una página de asistencias ordenada por id_asistencia (paginación por keyset)
+        """
+        return paginar(Asistencia.query, Asistencia.id_asistencia, limite, desde_id)
+
     @staticmethod
     def get_by_id(asistencia_id):
         """
@@ -37,24 +48,86 @@ class AsistenciaRepository:
         return Asistencia.query.filter_by(estado=True).all()
 
     @staticmethod
-    def get_by_inscripcion(inscripcion_id):
+    def get_by_inscripcion(inscripcion_id, solo_activas=True):
         """
-        Obtiene todas las asistencias de una inscripción
+        Obtiene las asistencias de una inscripción (índice Inscripcion_id_inscripcion, estado)
         """
-        return Asistencia.query.filter_by(
-            Inscripcion_id_inscripcion=inscripcion_id,
-            estado=True
-        ).all()
+        query = Asistencia.query.filter(Asistencia.Inscripcion_id_inscripcion == inscripcion_id)
+        if solo_activas:
+            query = query.filter(Asistencia.estado == True)
+        return query.order_by(Asistencia.id_asistencia).all()
 
     @staticmethod
-    def get_by_horario_sesion(horario_sesion_id):
+    def get_by_horario_sesion(horario_sesion_id, solo_activas=True):
         """
-        Obtiene todas las asistencias de un horario de sesión
+        Obtiene las asistencias de un horario de sesión (índice Horario_sesion_id_horario_sesion, estado)
         """
-        return Asistencia.query.filter_by(
-            Horario_sesion_id_horario_sesion=horario_sesion_id,
-            estado=True
-        ).all()
+        query = Asistencia.query.filter(Asistencia.Horario_sesion_id_horario_sesion == horario_sesion_id)
+        if solo_activas:
+            query = query.filter(Asistencia.estado == True)
+        return query.order_by(Asistencia.id_asistencia).all()
+
+    @staticmethod
+    def existe_para_inscripcion_y_sesion(inscripcion_id, horario_sesion_id):
+        """
+        True si ya hay una asistencia (activa o no) para la inscripción y la sesión
+        """
+        return db.session.query(
+            Asistencia.query.filter(
+                Asistencia.Inscripcion_id_inscripcion == inscripcion_id,
+                Asistencia.Horario_sesion_id_horario_sesion == horario_sesion_id
+            ).exists()
+        ).scalar()
+
+    @staticmethod
+    def get_estadisticas_by_inscripcion(inscripcion_id):
+        """
+        Conteos de las asistencias activas de una inscripción en una sola agregación
+        (COUNT(*) FILTER (WHERE ...)), sin traer las filas
+        """
+        fila = db.session.query(
+            func.count(Asistencia.id_asistencia).label('total'),
+            func.count(Asistencia.id_asistencia).filter(Asistencia.asistio == True).label('asistidas'),
+            func.count(Asistencia.id_asistencia).filter(Asistencia.asistio == False).label('no_asistidas'),
+            func.count(Asistencia.id_asistencia).filter(Asistencia.asistio.is_(None)).label('pendientes')
+        ).filter(
+            Asistencia.Inscripcion_id_inscripcion == inscripcion_id,
+            Asistencia.estado == True
+        ).one()
+        return {
+            'total': fila.total,
+            'asistidas': fila.asistidas,
+            'no_asistidas': fila.no_asistidas,
+            'pendientes': fila.pendientes
+        }
+
+    @staticmethod
+    def iter_para_exportar(ciclo_id=None, chunk=1000):
+        """
+        Asistencias junto con persona, sesión, horario y estilo, ordenadas por
+        id_asistencia y leídas de a `chunk` con yield_per, para exportaciones en streaming
+
+        Returns:
+            iterable de tuplas (asistencia, persona, horario_sesion, horario, estilo)
+        """
+        query = db.session.query(Asistencia, Persona, HorarioSesion, Horario, Estilo).join(
+            Inscripcion, Asistencia.Inscripcion_id_inscripcion == Inscripcion.id_inscripcion
+        ).join(
+            Persona, Inscripcion.Persona_id_persona == Persona.id_persona
+        ).join(
+            HorarioSesion, Asistencia.Horario_sesion_id_horario_sesion == HorarioSesion.id_horario_sesion
+        ).join(
+            Horario, HorarioSesion.Horario_id_horario == Horario.id_horario
+        ).join(
+            Estilo, Horario.Estilo_id_estilo == Estilo.id_estilo
+        )
+        if ciclo_id is not None:
+            query = query.join(
+                Oferta, Horario.Oferta_id_oferta == Oferta.id_oferta
+            ).filter(
+                Oferta.ciclo_id_ciclo == ciclo_id
+            )
+        return query.order_by(Asistencia.id_asistencia).yield_per(chunk)
 
     @staticmethod
     def create(asistencia_data):
@@ -69,16 +142,22 @@ class AsistenciaRepository:
     @staticmethod
     def create_bulk(asistencias_data):
         """
-        Crea múltiples asistencias en una sola operación
+        Crea múltiples asistencias en una sola operación (INSERT ... VALUES (...), (...) RETURNING).
+        Devuelve las asistencias en el mismo orden que `asistencias_data`
         """
-        asistencias = []
-        for data in asistencias_data:
-            asistencia = Asistencia(**data)
-            asistencias.append(asistencia)
-        
-        db.session.add_all(asistencias)
-        db.session.flush()
-        return asistencias
+        if not asistencias_data:
+            return []
+        asistencias = db.session.scalars(
+            insert(Asistencia).returning(Asistencia),
+            asistencias_data
+        ).all()
+        # RETURNING no garantiza el orden (sort_by_parameter_order haría fila por fila en SQLite)
+        posicion = {
+            (datos['Inscripcion_id_inscripcion'], datos['Horario_sesion_id_horario_sesion']): indice
+            for indice, datos in enumerate(asistencias_data)
+        }
+        return sorted(asistencias, key=lambda a: posicion[(a.Inscripcion_id_inscripcion,
+                                                           a.Horario_sesion_id_horario_sesion)])
 
     @staticmethod
     def update(asistencia_id, asistencia_data):
@@ -132,6 +211,52 @@ class AsistenciaRepository:
         
         return None
 
+    @staticmethod
+    def get_para_marcar(horario_sesion_id, asistencias_ids):
+        """
+        Lee y bloquea (SELECT ... FOR UPDATE) las asistencias activas de la sesión
+        indicadas, para calcular la diferencia de presentes sin carreras con otro marcado
+
+        Returns:
+            list: filas (id_asistencia, Inscripcion_id_inscripcion, asistio)
+        """
+        return db.session.query(
+            Asistencia.id_asistencia,
+            Asistencia.Inscripcion_id_inscripcion,
+            Asistencia.asistio
+        ).filter(
+            Asistencia.Horario_sesion_id_horario_sesion == horario_sesion_id,
+            Asistencia.id_asistencia.in_(asistencias_ids),
+            Asistencia.estado.is_(True)
+        ).with_for_update().all()
+
+    @staticmethod
+    def marcar_bulk(marcas, fecha):
+        """
+        Marca presente/ausente muchas asistencias con un único UPDATE ... FROM (VALUES ...)
+
+        Args:
+            marcas: dict {id_asistencia: asistio}
+            fecha: fecha de marcado
+
+        Returns:
+            int: cantidad de asistencias actualizadas
+        """
+        if not marcas:
+            return 0
+        valores = tabla_valores(
+            'marcas',
+            [('id_asistencia', BigInteger), ('asistio', Boolean)],
+            list(marcas.items())
+        )
+        resultado = db.session.execute(
+            update(Asistencia).where(
+                Asistencia.id_asistencia == valores.c.id_asistencia
+            ).values(asistio=valores.c.asistio, fecha=fecha),
+            execution_options={'synchronize_session': False}
+        )
+        return resultado.rowcount
+
     @staticmethod
     def get_personas_inscritas_por_horario_y_fecha(horario_id, fecha):
         """
@@ -28,7 +28,56 @@ class DashboardRepository:
         if not ciclo:
             return None
         
-        # Total de alumnas únicas inscritas en ofertas del ciclo
+        contadores = self.calcular_contadores_ciclo(id_ciclo)
+        registradas = contadores['asistencias_registradas']
+        asistencia_promedio = (contadores['asistencias_presentes'] * 100.0 / registradas) if registradas > 0 else 0
+        
+        return {
+            'ciclo': self.ciclo_to_dict(ciclo),
+            'kpis': {
+                'total_alumnas': int(contadores['total_alumnas']),
+                'ocupacion_promedio': round(float(contadores['ocupacion_promedio']), 2),
+                'ingresos_mes_actual': float(contadores['ingresos_mes_actual']),
+                'asistencia_promedio': round(float(asistencia_promedio), 2)
+            }
+        }
+    
+    @staticmethod
+    def ciclo_to_dict(ciclo):
+        """
+        Formato del ciclo usado en la cabecera de las estadísticas generales
+        """
+        return {
+            'id_ciclo': ciclo.id_ciclo,
+            'nombre_ciclo': ciclo.nombre,
+            'fecha_inicio': ciclo.inicio.isoformat() if ciclo.inicio else None,
+            'fecha_fin': ciclo.fin.isoformat() if ciclo.fin else None
+        }
+    
+    def calcular_contadores_ciclo(self, id_ciclo):
+        """
+        Calcula desde cero los contadores que alimentan los KPIs generales de un ciclo
+        (usado para las estadísticas en vivo y para reconstruir el snapshot DashboardCiclo)
+        """
+        mes_actual = datetime.now().month
+        anio_actual = datetime.now().year
+        
+        asistencias = self.contar_asistencias_ciclo(id_ciclo)
+        
+        return {
+            'total_alumnas': self.contar_alumnas_ciclo(id_ciclo),
+            'ocupacion_promedio': self.calcular_ocupacion_promedio_ciclo(id_ciclo),
+            'ingresos_mes_actual': self.calcular_ingresos_mes_ciclo(id_ciclo, mes_actual, anio_actual),
+            'mes_ingresos': mes_actual,
+            'anio_ingresos': anio_actual,
+            'asistencias_registradas': asistencias['registradas'],
+            'asistencias_presentes': asistencias['presentes']
+        }
+    
+    def contar_alumnas_ciclo(self, id_ciclo):
+        """
+        Total de alumnas únicas inscritas en ofertas del ciclo
+        """
         total_alumnas = db.session.query(
             func.count(func.distinct(Inscripcion.Persona_id_persona))
         ).join(
@@ -40,7 +89,12 @@ class DashboardRepository:
             Inscripcion.estado == 'ACTIVO'
         ).scalar() or 0
         
-        # Ocupación promedio de horarios del ciclo
+        return int(total_alumnas)
+    
+    def calcular_ocupacion_promedio_ciclo(self, id_ciclo):
+        """
+        Ocupación promedio de horarios del ciclo
+        """
         ocupacion_promedio = db.session.query(
             func.avg(
                 case(
@@ -59,11 +113,13 @@ class DashboardRepository:
             HorarioSesion.cancelado == False
         ).scalar() or 0
         
-        # Ingresos del mes actual (inscripciones del ciclo en el mes actual)
-        mes_actual = datetime.now().month
-        anio_actual = datetime.now().year
-        
-        ingresos_mes_actual = db.session.query(
+        return float(ocupacion_promedio)
+    
+    def calcular_ingresos_mes_ciclo(self, id_ciclo, mes, anio):
+        """
+        Ingresos confirmados del ciclo en un mes dado
+        """
+        ingresos_mes = db.session.query(
             func.coalesce(func.sum(Pago.monto), 0)
         ).join(
             Inscripcion, Pago.Inscripcion_id_inscripcion == Inscripcion.id_inscripcion
@@ -73,19 +129,25 @@ class DashboardRepository:
             Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
         ).filter(
             Oferta.ciclo_id_ciclo == id_ciclo,
-            extract('month', Pago.fecha_pago) == mes_actual,
-            extract('year', Pago.fecha_pago) == anio_actual,
+            extract('month', Pago.fecha_pago) == mes,
+            extract('year', Pago.fecha_pago) == anio,
             Pago.estado == 'CONFIRMADO'
         ).scalar() or 0
         
-        # Asistencia promedio del ciclo
-        asistencia_promedio = db.session.query(
-            func.avg(
+        return float(ingresos_mes)
+    
+    def contar_asistencias_ciclo(self, id_ciclo):
+        """
+        Registros de asistencia activos del ciclo y cuántos de ellos son presentes
+        """
+        resultado = db.session.query(
+            func.count(Asistencia.id_asistencia).label('registradas'),
+            func.coalesce(func.sum(
                 case(
-                    (Asistencia.asistio == True, 100.0),
+                    (Asistencia.asistio == True, 1),
                     else_=0
                 )
-            )
+            ), 0).label('presentes')
         ).join(
             HorarioSesion, Asistencia.Horario_sesion_id_horario_sesion == HorarioSesion.id_horario_sesion
         ).join(
@@ -95,21 +157,11 @@ class DashboardRepository:
         ).filter(
             Oferta.ciclo_id_ciclo == id_ciclo,
             Asistencia.estado == True
-        ).scalar() or 0
+        ).one()
         
         return {
-            'ciclo': {
-                'id_ciclo': ciclo.id_ciclo,
-                'nombre_ciclo': ciclo.nombre,
-                'fecha_inicio': ciclo.inicio.isoformat() if ciclo.inicio else None,
-                'fecha_fin': ciclo.fin.isoformat() if ciclo.fin else None
-            },
-            'kpis': {
-                'total_alumnas': int(total_alumnas),
-                'ocupacion_promedio': round(float(ocupacion_promedio), 2),
-                'ingresos_mes_actual': float(ingresos_mes_actual),
-                'asistencia_promedio': round(float(asistencia_promedio), 2)
-            }
+            'registradas': int(resultado.registradas or 0),
+            'presentes': int(resultado.presentes or 0)
         }
     
     def get_alumnas_por_estilo(self, id_ciclo):
@@ -443,52 +495,102 @@ class DashboardRepository:
     
     def get_alumnos_nuevos_vs_recurrentes(self, id_ciclo):
         """
-        Comparación de alumnos nuevos vs recurrentes
+        Comparación de alumnos nuevos vs recurrentes, total y desglosada por oferta y por estilo.
+        
+        Una alumna es recurrente si tiene alguna inscripción en una oferta que empezó antes
+        del inicio del ciclo. Se clasifica a todas las alumnas en una sola consulta con un
+        EXISTS correlacionado (semi-join) en vez de una consulta por alumna.
         """
         # Obtener fecha de inicio del ciclo
         ciclo = db.session.query(Ciclo).filter(Ciclo.id_ciclo == id_ciclo).first()
         if not ciclo:
             return None
         
-        # Obtener todos los alumnos inscritos en este ciclo
-        alumnos_ciclo_actual = db.session.query(
-            Inscripcion.Persona_id_persona
+        # Semi-join: ¿la persona tiene inscripciones en ofertas anteriores al ciclo?
+        InscripcionPrevia = aliased(Inscripcion)
+        PaquetePrevio = aliased(Paquete)
+        OfertaPrevia = aliased(Oferta)
+        tiene_inscripcion_previa = db.session.query(InscripcionPrevia.id_inscripcion).join(
+            PaquetePrevio, InscripcionPrevia.Paquete_id_paquete == PaquetePrevio.id_paquete
+        ).join(
+            OfertaPrevia, PaquetePrevio.Oferta_id_oferta == OfertaPrevia.id_oferta
+        ).filter(
+            InscripcionPrevia.Persona_id_persona == Inscripcion.Persona_id_persona,
+            OfertaPrevia.fecha_inicio < ciclo.inicio
+        ).exists()
+        
+        # Una fila por (alumna, oferta, estilo) del ciclo con su clasificación
+        filas = db.session.query(
+            Inscripcion.Persona_id_persona,
+            Oferta.id_oferta,
+            Oferta.nombre_oferta,
+            Estilo.id_estilo,
+            Estilo.nombre_estilo,
+            tiene_inscripcion_previa.label('es_recurrente')
         ).join(
             Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
         ).join(
             Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+        ).outerjoin(
+            Horario, Horario.Oferta_id_oferta == Oferta.id_oferta
+        ).outerjoin(
+            Estilo, and_(Horario.Estilo_id_estilo == Estilo.id_estilo, Estilo.estado == True)
         ).filter(
             Oferta.ciclo_id_ciclo == id_ciclo,
             Inscripcion.estado == 'ACTIVO'
         ).distinct().all()
         
-        total_alumnos = len(alumnos_ciclo_actual)
-        
-        # Para cada alumno, verificar si tuvo inscripciones previas
-        alumnos_recurrentes = 0
-        for alumno in alumnos_ciclo_actual:
-            # Verificar si tiene inscripciones en ciclos anteriores
-            tiene_inscripcion_previa = db.session.query(
-                func.count(Inscripcion.id_inscripcion)
-            ).join(
-                Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
-            ).join(
-                Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
-            ).filter(
-                Inscripcion.Persona_id_persona == alumno.Persona_id_persona,
-                Oferta.fecha_inicio < ciclo.inicio
-            ).scalar()
+        # Agrupar en memoria: total, por oferta y por estilo (conjuntos de personas)
+        recurrentes = set()
+        alumnos = set()
+        ofertas = {}
+        estilos = {}
+        for fila in filas:
+            alumnos.add(fila.Persona_id_persona)
+            if fila.es_recurrente:
+                recurrentes.add(fila.Persona_id_persona)
+            
+            oferta = ofertas.setdefault(fila.id_oferta, {
+                'id_oferta': fila.id_oferta,
+                'nombre_oferta': fila.nombre_oferta,
+                'alumnos': set()
+            })
+            oferta['alumnos'].add(fila.Persona_id_persona)
             
-            if tiene_inscripcion_previa and tiene_inscripcion_previa > 0:
-                alumnos_recurrentes += 1
+            if fila.id_estilo is not None:
+                estilo = estilos.setdefault(fila.id_estilo, {
+                    'id_estilo': fila.id_estilo,
+                    'nombre_estilo': fila.nombre_estilo,
+                    'alumnos': set()
+                })
+                estilo['alumnos'].add(fila.Persona_id_persona)
         
-        alumnos_nuevos = total_alumnos - alumnos_recurrentes
+        def resumen(personas):
+            total = len(personas)
+            total_recurrentes = len(personas & recurrentes)
+            total_nuevos = total - total_recurrentes
+            return {
+                'total_alumnos': total,
+                'alumnos_nuevos': total_nuevos,
+                'alumnos_recurrentes': total_recurrentes,
+                'porcentaje_nuevos': round((total_nuevos * 100.0 / total), 2) if total > 0 else 0,
+                'porcentaje_recurrentes': round((total_recurrentes * 100.0 / total), 2) if total > 0 else 0
+            }
         
-        return {
-            'ciclo_id': id_ciclo,
-            'total_alumnos': total_alumnos,
-            'alumnos_nuevos': alumnos_nuevos,
-            'alumnos_recurrentes': alumnos_recurrentes,
-            'porcentaje_nuevos': round((alumnos_nuevos * 100.0 / total_alumnos), 2) if total_alumnos > 0 else 0,
-            'porcentaje_recurrentes': round((alumnos_recurrentes * 100.0 / total_alumnos), 2) if total_alumnos > 0 else 0
-        }
+        por_oferta = []
+        for o in ofertas.values():
+            item = {'id_oferta': o['id_oferta'], 'nombre_oferta': o['nombre_oferta']}
+            item.update(resumen(o['alumnos']))
+            por_oferta.append(item)
+        
+        por_estilo = []
+        for e in estilos.values():
+            item = {'id_estilo': e['id_estilo'], 'nombre_estilo': e['nombre_estilo']}
+            item.update(resumen(e['alumnos']))
+            por_estilo.append(item)
+        
+        resultado = {'ciclo_id': id_ciclo}
+        resultado.update(resumen(alumnos))
+        resultado['por_oferta'] = sorted(por_oferta, key=lambda o: o['total_alumnos'], reverse=True)
+        resultado['por_estilo'] = sorted(por_estilo, key=lambda e: e['total_alumnos'], reverse=True)
+        return resultado
@@ -0,0 +1,118 @@
+from datetime import datetime
+from src.app import db
+from src.models.dashboard_ciclo import DashboardCiclo
+from src.models.inscripcion import Inscripcion
+from src.models.paquete import Paquete
+from src.models.oferta import Oferta
+from src.models.horario import Horario
+from src.models.horario_sesion import HorarioSesion
+from src.repositories.dashboard_repository import DashboardRepository
+
+
+class DashboardSnapshotRepository:
+    """
+    Repositorio del snapshot materializado de KPIs por ciclo (DashboardCiclo)
+    """
+
+    @staticmethod
+    def get_by_ciclo(id_ciclo):
+        """
+        Obtiene el snapshot de un ciclo (None si aún no fue construido)
+        """
+        return DashboardCiclo.query.get(id_ciclo)
+
+    @staticmethod
+    def reconstruir(id_ciclo):
+        """
+        Recalcula todos los contadores del ciclo y guarda el snapshot (insert o update)
+        """
+        contadores = DashboardRepository().calcular_contadores_ciclo(id_ciclo)
+
+        snapshot = DashboardCiclo.query.get(id_ciclo)
+        if not snapshot:
+            snapshot = DashboardCiclo(Ciclo_id_ciclo=id_ciclo)
+            db.session.add(snapshot)
+
+        for key, value in contadores.items():
+            setattr(snapshot, key, value)
+        snapshot.fecha_actualizacion = datetime.now()
+
+        db.session.flush()
+        return snapshot
+
+    @staticmethod
+    def get_ciclo_id_by_inscripcion(inscripcion_id):
+        """
+        Ciclo al que pertenece una inscripción (Inscripcion -> Paquete -> Oferta)
+        """
+        return db.session.query(Oferta.ciclo_id_ciclo).join(
+            Paquete, Paquete.Oferta_id_oferta == Oferta.id_oferta
+        ).join(
+            Inscripcion, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+        ).filter(
+            Inscripcion.id_inscripcion == inscripcion_id
+        ).scalar()
+
+    @staticmethod
+    def get_ciclo_id_by_horario_sesion(horario_sesion_id):
+        """
+        Ciclo al que pertenece una sesión (HorarioSesion -> Horario -> Oferta)
+        """
+        return db.session.query(Oferta.ciclo_id_ciclo).join(
+            Horario, Horario.Oferta_id_oferta == Oferta.id_oferta
+        ).join(
+            HorarioSesion, HorarioSesion.Horario_id_horario == Horario.id_horario
+        ).filter(
+            HorarioSesion.id_horario_sesion == horario_sesion_id
+        ).scalar()
+
+    @staticmethod
+    def incrementar(id_ciclo, deltas):
+        """
+        Aplica incrementos atómicos (col = col + delta) sobre el snapshot de un ciclo.
+        Si el snapshot no existe no hace nada: se construirá completo en la próxima lectura.
+        """
+        valores = {
+            getattr(DashboardCiclo, columna): getattr(DashboardCiclo, columna) + delta
+            for columna, delta in deltas.items() if delta
+        }
+        if not valores:
+            return 0
+
+        valores[DashboardCiclo.fecha_actualizacion] = datetime.now()
+        return DashboardCiclo.query.filter(
+            DashboardCiclo.Ciclo_id_ciclo == id_ciclo
+        ).update(valores, synchronize_session=False)
+
+    @staticmethod
+    def actualizar_ocupacion(id_ciclo):
+        """
+        Recalcula solo la ocupación promedio del ciclo (una agregación acotada al ciclo)
+        """
+        ocupacion = DashboardRepository().calcular_ocupacion_promedio_ciclo(id_ciclo)
+        return DashboardCiclo.query.filter(
+            DashboardCiclo.Ciclo_id_ciclo == id_ciclo
+        ).update({
+            DashboardCiclo.ocupacion_promedio: ocupacion,
+            DashboardCiclo.fecha_actualizacion: datetime.now()
+        }, synchronize_session=False)
+
+    @staticmethod
+    def es_alumna_nueva_en_ciclo(id_ciclo, persona_id, inscripcion_id):
+        """
+        True si la persona no tiene otra inscripción ACTIVA en el ciclo
+        (es decir, la inscripción indicada la suma al total de alumnas)
+        """
+        existe_otra = db.session.query(
+            db.session.query(Inscripcion.id_inscripcion).join(
+                Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+            ).join(
+                Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+            ).filter(
+                Oferta.ciclo_id_ciclo == id_ciclo,
+                Inscripcion.Persona_id_persona == persona_id,
+                Inscripcion.estado == 'ACTIVO',
+                Inscripcion.id_inscripcion != inscripcion_id
+            ).exists()
+        ).scalar()
+        return not existe_otra
@@ -0,0 +1,33 @@
+from src.app import db
+from src.models.ejecucion_tarea import EjecucionTarea
+
+
+class EjecucionTareaRepository:
+    """
+    Repositorio del registro de corridas de jobs periódicos (EjecucionTarea)
+    """
+
+    @staticmethod
+    def registrar(tarea, inicio, duracion_ms, filas_afectadas, exito=True, detalle=None):
+        """
+        Guarda una corrida en su propia transacción, para que quede registrada
+        aunque la transacción del job se haya revertido
+        """
+        with db.engine.begin() as conn:
+            conn.execute(EjecucionTarea.__table__.insert().values(
+                tarea=tarea,
+                inicio=inicio,
+                duracion_ms=round(duracion_ms, 2),
+                filas_afectadas=filas_afectadas,
+                exito=exito,
+                detalle=detalle[:1000] if detalle else None
+            ))
+
+    @staticmethod
+    def get_ultimas(tarea, limite=20):
+        """
+        Últimas corridas de una tarea, de la más reciente a la más antigua
+        """
+        return EjecucionTarea.query.filter_by(tarea=tarea).order_by(
+            EjecucionTarea.inicio.desc()
+        ).limit(limite).all()
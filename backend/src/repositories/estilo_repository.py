@@ -1,5 +1,6 @@
 from src.models import Estilo
 from src.app import db
+from src.cache import marcar_cambios
 
 class EstiloRepository:
     """
@@ -39,6 +40,7 @@ class EstiloRepository:
             estado=estilo_data.get('estado', True)
         )
         db.session.add(nuevo_estilo)
+        marcar_cambios('estilo')
         db.session.commit()
         return nuevo_estilo
 
@@ -53,6 +55,7 @@ class EstiloRepository:
             estilo.descripcion_estilo = estilo_data.get('descripcion_estilo', estilo.descripcion_estilo)
             estilo.beneficios_estilo = estilo_data.get('beneficios_estilo', estilo.beneficios_estilo)
             estilo.estado = estilo_data.get('estado', estilo.estado)
+            marcar_cambios('estilo')
             db.session.commit()
         return estilo
 
@@ -64,6 +67,7 @@ class EstiloRepository:
         estilo = Estilo.query.get(estilo_id)
         if estilo:
             estilo.estado = False
+            marcar_cambios('estilo')
             db.session.commit()
         return estilo
 
@@ -75,6 +79,7 @@ class EstiloRepository:
         estilo = Estilo.query.get(estilo_id)
         if estilo:
             db.session.delete(estilo)
+            marcar_cambios('estilo')
             db.session.commit()
         return estilo
 
@@ -11,7 +11,9 @@ from src.models.asistencia import Asistencia
 from src.models.profesor import Profesor
 from src.models.persona import Persona
 from src.app import db
-from sqlalchemy import func
+from src.cache import marcar_cambios
+from sqlalchemy import func, select, update, BigInteger, Integer
+from src.repositories.valores import tabla_valores
 
 class HorarioRepository:
     """
@@ -64,6 +66,7 @@ class HorarioRepository:
             estado=horario_data.get('estado', True)
         )
         db.session.add(nuevo_horario)
+        marcar_cambios('horario')
         db.session.flush()  # Para obtener el id_horario
         return nuevo_horario
 
@@ -84,6 +87,7 @@ class HorarioRepository:
             horario.hora_inicio = horario_data.get('hora_inicio', horario.hora_inicio)
             horario.hora_fin = horario_data.get('hora_fin', horario.hora_fin)
             horario.estado = horario_data.get('estado', horario.estado)
+            marcar_cambios('horario')
             db.session.commit()
         return horario
 
@@ -95,9 +99,76 @@ class HorarioRepository:
         horario = Horario.query.get(horario_id)
         if horario:
             horario.estado = False
+            marcar_cambios('horario')
             db.session.commit()
         return horario
 
+    @staticmethod
+    def ajustar_inscritos(deltas_por_sesion):
+        """
+        Aplica al contador Horario.total_inscritos los cambios de asistencias activas por
+        sesión con un único UPDATE (las sesiones inactivas no cuentan). No hace commit.
+
+            UPDATE Horario SET total_inscritos = total_inscritos + d.delta
+            FROM (SELECT Horario_id_horario, sum(delta) FROM (VALUES ...) JOIN HorarioSesion
+                  WHERE HorarioSesion.estado GROUP BY Horario_id_horario) d
+            WHERE Horario.id_horario = d.Horario_id_horario
+
+        Args:
+            deltas_por_sesion: dict {id_horario_sesion: delta} (+1 creada, -1 cancelada)
+        """
+        deltas_por_sesion = {sesion_id: delta for sesion_id, delta in deltas_por_sesion.items() if delta}
+        if not deltas_por_sesion:
+            return 0
+        valores = tabla_valores(
+            'deltas',
+            [('id_horario_sesion', BigInteger), ('delta', Integer)],
+            list(deltas_por_sesion.items())
+        )
+        por_horario = select(
+            HorarioSesion.Horario_id_horario,
+            func.sum(valores.c.delta).label('delta')
+        ).join_from(
+            valores, HorarioSesion, HorarioSesion.id_horario_sesion == valores.c.id_horario_sesion
+        ).where(
+            HorarioSesion.estado.is_(True)
+        ).group_by(HorarioSesion.Horario_id_horario).subquery('por_horario')
+        resultado = db.session.execute(
+            update(Horario).where(
+                Horario.id_horario == por_horario.c.Horario_id_horario
+            ).values(total_inscritos=Horario.total_inscritos + por_horario.c.delta),
+            execution_options={'synchronize_session': False}
+        )
+        return resultado.rowcount
+
+    @staticmethod
+    def recalcular_inscritos(horarios_ids=None):
+        """
+        Reconstruye el contador total_inscritos desde Asistencia, solo para los horarios
+        indicados (o todos si es None). Solo escribe los que estaban desfasados.
+        No hace commit.
+
+        Returns:
+            int: cantidad de horarios cuyo contador se corrigió
+        """
+        conteo = select(func.count(Asistencia.id_asistencia)).join(
+            HorarioSesion, HorarioSesion.id_horario_sesion == Asistencia.Horario_sesion_id_horario_sesion
+        ).where(
+            HorarioSesion.Horario_id_horario == Horario.id_horario,
+            HorarioSesion.estado.is_(True),
+            Asistencia.estado.is_(True)
+        ).correlate(Horario).scalar_subquery()
+        sentencia = update(Horario).where(Horario.total_inscritos != conteo)
+        if horarios_ids is not None:
+            if not horarios_ids:
+                return 0
+            sentencia = sentencia.where(Horario.id_horario.in_(list(horarios_ids)))
+        resultado = db.session.execute(
+            sentencia.values(total_inscritos=conteo),
+            execution_options={'synchronize_session': False}
+        )
+        return resultado.rowcount
+
     @staticmethod
     def get_sesiones_by_horario(horario_id):
         """
@@ -109,23 +180,12 @@ class HorarioRepository:
     def get_horarios_completos_by_profesor(profesor_id):
         """
         Obtiene todos los horarios de un profesor con información completa de oferta, ciclo, sala y estilo
-        Incluye el conteo total de inscritos por horario
+        Incluye el total de inscritos por horario (contador Horario.total_inscritos, sin agregar Asistencia)
         """
-        # Subquery para contar inscritos por horario
-        subquery_inscritos = db.session.query(
-            HorarioSesion.Horario_id_horario,
-            func.count(Asistencia.id_asistencia).label('total_inscritos')
-        ).join(
-            Asistencia, HorarioSesion.id_horario_sesion == Asistencia.Horario_sesion_id_horario_sesion
-        ).filter(
-            HorarioSesion.estado == True,
-            Asistencia.estado == True
-        ).group_by(HorarioSesion.Horario_id_horario).subquery()
-        
-        # Query principal con joins y conteo de inscritos
+        # Query principal con joins; el total de inscritos se lee del contador
         return db.session.query(
             Horario, Oferta, Ciclo, Sala, Estilo, Subcategoria, Categoria, Programa,
-            func.coalesce(subquery_inscritos.c.total_inscritos, 0).label('total_inscritos')
+            Horario.total_inscritos
         ).join(
             Oferta, Horario.Oferta_id_oferta == Oferta.id_oferta
         ).join(
@@ -140,8 +200,6 @@ class HorarioRepository:
             Categoria, Subcategoria.Categoria_id_categoria == Categoria.id_categoria
         ).join(
             Programa, Categoria.Programa_id_programa == Programa.id_programa
-        ).outerjoin(
-            subquery_inscritos, Horario.id_horario == subquery_inscritos.c.Horario_id_horario
         ).filter(
             Horario.Profesor_id_profesor == profesor_id,
             Horario.estado == True
@@ -159,17 +217,6 @@ class HorarioRepository:
         - Categoria: nombre
         - Programa: nombre
         """
-        # Subquery para contar inscritos por horario
-        subquery_inscritos = db.session.query(
-            HorarioSesion.Horario_id_horario,
-            func.count(Asistencia.id_asistencia).label('total_inscritos')
-        ).join(
-            Asistencia, HorarioSesion.id_horario_sesion == Asistencia.Horario_sesion_id_horario_sesion
-        ).filter(
-            HorarioSesion.estado == True,
-            Asistencia.estado == True
-        ).group_by(HorarioSesion.Horario_id_horario).subquery()
-
         # Query principal con todos los joins necesarios
         return db.session.query(
             Horario, 
@@ -182,7 +229,7 @@ class HorarioRepository:
             Subcategoria, 
             Categoria, 
             Programa,
-            func.coalesce(subquery_inscritos.c.total_inscritos, 0).label('total_inscritos')
+            Horario.total_inscritos
         ).join(
             Profesor, Horario.Profesor_id_profesor == Profesor.id_profesor
         ).join(
@@ -201,8 +248,6 @@ class HorarioRepository:
             Categoria, Subcategoria.Categoria_id_categoria == Categoria.id_categoria
         ).join(
             Programa, Categoria.Programa_id_programa == Programa.id_programa
-        ).outerjoin(
-            subquery_inscritos, Horario.id_horario == subquery_inscritos.c.Horario_id_horario
         ).filter(
             Horario.estado == True,
             Profesor.estado == True
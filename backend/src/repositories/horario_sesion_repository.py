@@ -1,5 +1,7 @@
 from src.models.horario_sesion import HorarioSesion
 from src.app import db
+from src.cache import marcar_cambios
+from sqlalchemy import insert, update, func
 
 class HorarioSesionRepository:
     """
@@ -42,6 +44,7 @@ class HorarioSesionRepository:
             sesion.cancelado = sesion_data.get('cancelado', sesion.cancelado)
             sesion.motivo = sesion_data.get('motivo', sesion.motivo)
             sesion.estado = sesion_data.get('estado', sesion.estado)
+            marcar_cambios('sesion')
             db.session.commit()
         return sesion
 
@@ -53,9 +56,124 @@ class HorarioSesionRepository:
         sesion = HorarioSesion.query.get(sesion_id)
         if sesion:
             sesion.estado = False
+            marcar_cambios('sesion')
             db.session.commit()
         return sesion
 
+    @staticmethod
+    def create_bulk(filas):
+        """
+        Inserta todas las sesiones con un único INSERT multi-fila (sin construir
+        objetos ORM). No hace commit: se confirma junto con el horario.
+
+        Args:
+            filas: lista de dicts con las columnas de HorarioSesion
+
+        Returns:
+            dict: {fecha: id_horario_sesion} de las sesiones insertadas (un horario
+                  tiene a lo sumo una sesión por fecha). RETURNING no garantiza el
+                  orden de las filas en todos los motores, por eso se devuelve la fecha.
+        """
+        if not filas:
+            return {}
+        ids_por_fecha = dict(db.session.execute(
+            insert(HorarioSesion).returning(HorarioSesion.fecha, HorarioSesion.id_horario_sesion),
+            filas
+        ).tuples().all())
+        marcar_cambios('sesion')
+        return ids_por_fecha
+
+    @staticmethod
+    def desactivar_by_horario(horario_id):
+        """
+        Borrado lógico de todas las sesiones activas de un horario con un único UPDATE.
+        No hace commit: se confirma junto con el cambio del horario.
+
+        Returns:
+            int: cantidad de sesiones desactivadas
+        """
+        resultado = db.session.execute(
+            update(HorarioSesion).where(
+                HorarioSesion.Horario_id_horario == horario_id,
+                HorarioSesion.estado.is_(True)
+            ).values(estado=False),
+            execution_options={'synchronize_session': False}
+        )
+        marcar_cambios('sesion')
+        return resultado.rowcount
+
+    @staticmethod
+    def desactivar_dias(horario_id, dias):
+        """
+        Borrado lógico, con un único UPDATE, de las sesiones activas de un horario que caen
+        en los días de la semana indicados (1=Lunes ... 7=Domingo). No hace commit.
+
+        Returns:
+            list: fechas de las sesiones desactivadas, ordenadas
+        """
+        if not dias:
+            return []
+        fechas = db.session.scalars(
+            update(HorarioSesion).where(
+                HorarioSesion.Horario_id_horario == horario_id,
+                HorarioSesion.estado.is_(True),
+                HorarioSesion.dia.in_(sorted(dias))
+            ).values(estado=False).returning(HorarioSesion.fecha),
+            execution_options={'synchronize_session': False}
+        ).all()
+        marcar_cambios('sesion')
+        return sorted(fechas)
+
+    @staticmethod
+    def reactivar_fechas(horario_id, fechas, hora_inicio, hora_fin, duracion):
+        """
+        Reactiva, con un único UPDATE, la sesión desactivada más reciente de cada fecha
+        indicada (conserva su id y por lo tanto sus asistencias y permisos) con las horas
+        nuevas. No hace commit.
+
+        Returns:
+            list: fechas reactivadas (las que no tenían sesión previa deben insertarse)
+        """
+        if not fechas:
+            return []
+        ultima_por_fecha = db.session.query(
+            func.max(HorarioSesion.id_horario_sesion)
+        ).filter(
+            HorarioSesion.Horario_id_horario == horario_id,
+            HorarioSesion.estado.is_(False),
+            HorarioSesion.fecha.in_(fechas)
+        ).group_by(HorarioSesion.fecha).scalar_subquery()
+        reactivadas = db.session.scalars(
+            update(HorarioSesion).where(
+                HorarioSesion.id_horario_sesion.in_(ultima_por_fecha)
+            ).values(
+                estado=True, hora_inicio=hora_inicio, hora_fin=hora_fin, duracion=duracion
+            ).returning(HorarioSesion.fecha),
+            execution_options={'synchronize_session': False}
+        ).all()
+        if reactivadas:
+            marcar_cambios('sesion')
+        return sorted(reactivadas)
+
+    @staticmethod
+    def actualizar_horas(horario_id, hora_inicio, hora_fin, duracion):
+        """
+        Cambia en el lugar (un único UPDATE) las horas de las sesiones activas de un
+        horario; ids, asistencias y cupos se conservan. No hace commit.
+
+        Returns:
+            int: cantidad de sesiones actualizadas
+        """
+        resultado = db.session.execute(
+            update(HorarioSesion).where(
+                HorarioSesion.Horario_id_horario == horario_id,
+                HorarioSesion.estado.is_(True)
+            ).values(hora_inicio=hora_inicio, hora_fin=hora_fin, duracion=duracion),
+            execution_options={'synchronize_session': False}
+        )
+        marcar_cambios('sesion')
+        return resultado.rowcount
+
     @staticmethod
     def get_sesiones_agenda(fecha_desde, fecha_hasta):
         """
@@ -69,7 +187,6 @@ class HorarioSesionRepository:
         from src.models.persona import Persona
         from src.models.sala import Sala
         from src.models.ciclo import Ciclo
-        from src.models.paquete import Paquete
         
         # Query principal con todas las relaciones
         sesiones_query = db.session.query(
@@ -106,23 +223,19 @@ class HorarioSesionRepository:
             HorarioSesion.hora_inicio
         ).all()
         
-        # Para cada sesión, obtener los paquetes de su oferta
-        result = []
-        for sesion_data in sesiones_query:
-            sesion, horario, oferta, estilo, profesor, persona, sala, ciclo = sesion_data
-            
-            # Obtener paquetes activos de la oferta
-            paquetes = Paquete.query.filter_by(
-                Oferta_id_oferta=oferta.id_oferta,
-                estado=True
-            ).all()
-            
-            result.append({
-                'sesion_data': sesion_data,
-                'paquetes': paquetes
-            })
+        # Paquetes activos de todas las ofertas involucradas (caché + una consulta IN para las faltantes)
+        from src.repositories.paquete_repository import PaqueteRepository
+        paquetes_por_oferta = PaqueteRepository.get_resumen_by_ofertas(
+            {sesion_data[2].id_oferta for sesion_data in sesiones_query}
+        )
         
-        return result
+        return [
+            {
+                'sesion_data': sesion_data,
+                'paquetes': paquetes_por_oferta[sesion_data[2].id_oferta]
+            }
+            for sesion_data in sesiones_query
+        ]
 
     @staticmethod
     def increment_cupos_ocupados(sesion_id):
@@ -134,6 +247,7 @@ class HorarioSesionRepository:
         if sesion:
             if sesion.cupos_ocupados < sesion.capacidad_maxima:
                 sesion.cupos_ocupados += 1
+                marcar_cambios('sesion')
                 db.session.flush()
                 return True
             else:
@@ -150,6 +264,7 @@ class HorarioSesionRepository:
         if sesion:
             if sesion.cupos_ocupados > 0:
                 sesion.cupos_ocupados -= 1
+                marcar_cambios('sesion')
                 db.session.flush()
                 return True
             else:
@@ -171,22 +286,80 @@ class HorarioSesionRepository:
         return None
 
     @staticmethod
-    def bulk_increment_cupos(sesiones_ids):
+    def get_info_sesiones(sesiones_ids):
         """
-        Incrementa cupos ocupados para múltiples sesiones
-        Retorna lista de sesiones que se pudieron actualizar
+        Carga en una sola consulta (IN) la capacidad, fecha y hora de varias sesiones
+
+        Returns:
+            dict: {sesion_id: {'capacidad_maxima', 'cupos_ocupados', 'cupos_disponibles', 'fecha', 'hora_inicio'}}
+                  (las sesiones inexistentes no aparecen)
         """
-        sesiones_actualizadas = []
-        sesiones_sin_cupo = []
-        
-        for sesion_id in sesiones_ids:
-            result = HorarioSesionRepository.increment_cupos_ocupados(sesion_id)
-            if result is True:
-                sesiones_actualizadas.append(sesion_id)
-            elif result is False:
-                sesiones_sin_cupo.append(sesion_id)
-        
+        if not sesiones_ids:
+            return {}
+        filas = db.session.query(
+            HorarioSesion.id_horario_sesion,
+            HorarioSesion.capacidad_maxima,
+            HorarioSesion.cupos_ocupados,
+            HorarioSesion.fecha,
+            HorarioSesion.hora_inicio
+        ).filter(
+            HorarioSesion.id_horario_sesion.in_(set(sesiones_ids))
+        ).all()
+        return {
+            fila.id_horario_sesion: {
+                'capacidad_maxima': fila.capacidad_maxima,
+                'cupos_ocupados': fila.cupos_ocupados,
+                'cupos_disponibles': fila.capacidad_maxima - fila.cupos_ocupados,
+                'fecha': fila.fecha,
+                'hora_inicio': fila.hora_inicio
+            }
+            for fila in filas
+        }
+
+    @staticmethod
+    def reservar_cupos(sesiones_ids):
+        """
+        Reserva un cupo en cada sesión con un único UPDATE condicional (todo o nada):
+
+            UPDATE HorarioSesion SET cupos_ocupados = cupos_ocupados + 1
+            WHERE id_horario_sesion IN (...) AND cupos_ocupados < capacidad_maxima
+            RETURNING id_horario_sesion
+
+        La condición se evalúa en la BD sobre la fila bloqueada por el propio UPDATE,
+        así que dos inscripciones concurrentes no pueden sobrevender el último cupo.
+        Si alguna sesión no pudo reservarse se deshace el UPDATE completo (savepoint).
+
+        Returns:
+            dict: {'reservadas': [...], 'sin_cupo': [...], 'no_encontradas': [...]}
+                  ('reservadas' vacía si la reserva no se aplicó)
+        """
+        ids = list(dict.fromkeys(sesiones_ids))
+        if not ids:
+            return {'reservadas': [], 'sin_cupo': [], 'no_encontradas': []}
+
+        savepoint = db.session.begin_nested()
+        reservadas = set(db.session.execute(
+            update(HorarioSesion).where(
+                HorarioSesion.id_horario_sesion.in_(ids),
+                HorarioSesion.cupos_ocupados < HorarioSesion.capacidad_maxima
+            ).values(
+                cupos_ocupados=HorarioSesion.cupos_ocupados + 1
+            ).returning(HorarioSesion.id_horario_sesion),
+            execution_options={'synchronize_session': False}
+        ).scalars())
+
+        if len(reservadas) == len(ids):
+            savepoint.commit()
+            marcar_cambios('sesion')
+            return {'reservadas': ids, 'sin_cupo': [], 'no_encontradas': []}
+
+        savepoint.rollback()
+        faltantes = [sesion_id for sesion_id in ids if sesion_id not in reservadas]
+        existentes = {fila.id_horario_sesion for fila in db.session.query(HorarioSesion.id_horario_sesion).filter(
+            HorarioSesion.id_horario_sesion.in_(faltantes)
+        )}
         return {
-            'actualizadas': sesiones_actualizadas,
-            'sin_cupo': sesiones_sin_cupo
+            'reservadas': [],
+            'sin_cupo': [sesion_id for sesion_id in faltantes if sesion_id in existentes],
+            'no_encontradas': [sesion_id for sesion_id in faltantes if sesion_id not in existentes]
         }
@@ -7,7 +7,11 @@ from src.models.ciclo import Ciclo
 from src.models.subcategoria import Subcategoria
 from src.models.categoria import Categoria
 from src.models.programa import Programa
+from src.models.pago import Pago
 from src.app import db
+from sqlalchemy import update, case, or_, BigInteger, Integer
+from src.repositories.paginacion import paginar
+from src.repositories.valores import tabla_valores
 
 class InscripcionRepository:
     """
@@ -21,6 +25,13 @@ class InscripcionRepository:
         """
         return Inscripcion.query.all()
 
+    @staticmethod
+    def get_pagina(limite, desde_id=None):
+        """
+        Obtiene una página de inscripciones ordenada por id_inscripcion (paginación por keyset)
+        """
+        return paginar(Inscripcion.query, Inscripcion.id_inscripcion, limite, desde_id)
+
     @staticmethod
     def get_by_id(inscripcion_id):
         """
@@ -82,6 +93,82 @@ class InscripcionRepository:
         db.session.flush()
         return inscripcion
 
+    @staticmethod
+    def ajustar_clases_bulk(deltas):
+        """
+        Suma a clases_usadas (y resta a clases_restantes, que sigue en NULL si el
+        paquete es ilimitado) el delta de cada inscripción con un único
+        UPDATE ... FROM (VALUES ...) ... RETURNING
+
+        Las inscripciones a las que el delta dejaría con clases_restantes negativo no se
+        tocan (se devuelven fuera del resultado). En el mismo UPDATE una inscripción ACTIVO
+        que se queda sin clases pasa a COMPLETADO, y una COMPLETADO que recupera clases
+        (asistencia desmarcada) vuelve a ACTIVO. No hace commit.
+
+        Args:
+            deltas: dict {id_inscripcion: delta} (delta negativo devuelve clases)
+
+        Returns:
+            set: ids de las inscripciones actualizadas
+        """
+        if not deltas:
+            return set()
+        valores = tabla_valores(
+            'deltas',
+            [('id_inscripcion', BigInteger), ('delta', Integer)],
+            list(deltas.items())
+        )
+        restantes_nuevas = Inscripcion.clases_restantes - valores.c.delta
+        resultado = db.session.execute(
+            update(Inscripcion).where(
+                Inscripcion.id_inscripcion == valores.c.id_inscripcion,
+                or_(Inscripcion.clases_restantes.is_(None), restantes_nuevas >= 0)
+            ).values(
+                clases_usadas=Inscripcion.clases_usadas + valores.c.delta,
+                clases_restantes=restantes_nuevas,
+                estado=case(
+                    ((Inscripcion.estado == 'ACTIVO') & (restantes_nuevas <= 0), 'COMPLETADO'),
+                    ((Inscripcion.estado == 'COMPLETADO') & (restantes_nuevas > 0), 'ACTIVO'),
+                    else_=Inscripcion.estado
+                )
+            ).returning(Inscripcion.id_inscripcion),
+            execution_options={'synchronize_session': False}
+        )
+        return set(resultado.scalars().all())
+
+    @staticmethod
+    def suspender_por_pagos_vencidos(hoy):
+        """
+        Suspende con un único UPDATE las inscripciones ACTIVO que tienen algún pago
+        PENDIENTE vencido:
+
+            UPDATE Inscripcion SET estado = 'SUSPENDIDO', estado_pago = 'VENCIDO'
+            WHERE estado = 'ACTIVO' AND id_inscripcion IN (
+                SELECT Inscripcion_id_inscripcion FROM Pago
+                WHERE estado = 'PENDIENTE' AND fecha_vencimiento < :hoy
+            )
+            RETURNING id_inscripcion
+
+        Las ya suspendidas no se vuelven a escribir, así que una corrida sin
+        vencimientos nuevos no modifica filas. No hace commit.
+
+        Returns:
+            list: ids de las inscripciones suspendidas
+        """
+        pagos_vencidos = db.session.query(Pago.Inscripcion_id_inscripcion).filter(
+            Pago.estado == 'PENDIENTE',
+            Pago.fecha_vencimiento < hoy
+        )
+        return db.session.scalars(
+            update(Inscripcion).where(
+                Inscripcion.estado == 'ACTIVO',
+                Inscripcion.id_inscripcion.in_(pagos_vencidos.scalar_subquery())
+            ).values(
+                estado='SUSPENDIDO', estado_pago='VENCIDO'
+            ).returning(Inscripcion.id_inscripcion),
+            execution_options={'synchronize_session': False}
+        ).all()
+
     @staticmethod
     def delete(inscripcion_id):
         """
@@ -128,6 +215,22 @@ class InscripcionRepository:
         - Promocion: nombre, porcentaje_descuento, etc.
         - Oferta: nombre, ciclo, subcategoria, categoria, programa
         """
+        return InscripcionRepository._query_inscripciones_completas().all()
+
+    @staticmethod
+    def iter_inscripciones_completas(ciclo_id=None, chunk=1000):
+        """
+        Mismas filas que get_inscripciones_completas, ordenadas por id_inscripcion y
+        leídas de a `chunk` con yield_per (cursor del lado del servidor en PostgreSQL),
+        para exportaciones que no deben cargar toda la tabla en memoria.
+        """
+        query = InscripcionRepository._query_inscripciones_completas()
+        if ciclo_id is not None:
+            query = query.filter(Oferta.ciclo_id_ciclo == ciclo_id)
+        return query.order_by(Inscripcion.id_inscripcion).yield_per(chunk)
+
+    @staticmethod
+    def _query_inscripciones_completas():
         return db.session.query(
             Inscripcion,
             Persona,
@@ -156,4 +259,55 @@ class InscripcionRepository:
             Programa, Categoria.Programa_id_programa == Programa.id_programa
         ).filter(
             Inscripcion.estado != 'CANCELADO'
-        ).all()
\ No newline at end of file
+        )
+
+    @staticmethod
+    def get_activas_con_detalle():
+        """
+        Inscripciones activas junto con persona, paquete, oferta, ciclo, subcategoría,
+        categoría y programa en una sola consulta con JOINs, ordenadas por id_inscripcion.
+
+        Returns:
+            list: tuplas (inscripcion, persona, paquete, oferta, ciclo, subcategoria, categoria, programa)
+        """
+        return InscripcionRepository._query_activas_con_detalle().order_by(Inscripcion.id_inscripcion).all()
+
+    @staticmethod
+    def get_pagina_activas_con_detalle(limite, desde_id=None):
+        """
+        Una página de get_activas_con_detalle ordenada por id_inscripcion (paginación por keyset)
+        """
+        return paginar(InscripcionRepository._query_activas_con_detalle(), Inscripcion.id_inscripcion,
+                       limite, desde_id)
+
+    @staticmethod
+    def count_activas_con_detalle():
+        """
+        Total de inscripciones que devuelve get_activas_con_detalle sin paginar
+        """
+        return InscripcionRepository._query_activas_con_detalle().with_entities(
+            db.func.count(Inscripcion.id_inscripcion)
+        ).scalar()
+
+    @staticmethod
+    def _query_activas_con_detalle():
+        # Paquete y oferta son obligatorios (INNER JOIN); el resto puede faltar (OUTER JOIN)
+        return db.session.query(
+            Inscripcion, Persona, Paquete, Oferta, Ciclo, Subcategoria, Categoria, Programa
+        ).join(
+            Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+        ).join(
+            Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+        ).outerjoin(
+            Ciclo, Oferta.ciclo_id_ciclo == Ciclo.id_ciclo
+        ).outerjoin(
+            Subcategoria, Oferta.Subcategoria_id_subcategoria == Subcategoria.id_subcategoria
+        ).outerjoin(
+            Categoria, Subcategoria.Categoria_id_categoria == Categoria.id_categoria
+        ).outerjoin(
+            Programa, Categoria.Programa_id_programa == Programa.id_programa
+        ).outerjoin(
+            Persona, Inscripcion.Persona_id_persona == Persona.id_persona
+        ).filter(
+            Inscripcion.estado == 'ACTIVO'
+        )
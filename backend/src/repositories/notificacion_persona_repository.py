@@ -1,6 +1,7 @@
 from src.models import NotificacionPersona
 from src.app import db
 from datetime import datetime
+from src.repositories.paginacion import paginar
 
 class NotificacionPersonaRepository:
     """
@@ -14,6 +15,13 @@ class NotificacionPersonaRepository:
         """
         return NotificacionPersona.query.all()
 
+    @staticmethod
+    def get_pagina(limite, desde_id=None):
+        """
+        Obtiene una página de notificaciones de personas ordenada por id_notificacion_persona (paginación por keyset)
+        """
+        return paginar(NotificacionPersona.query, NotificacionPersona.id_notificacion_persona, limite, desde_id)
+
     @staticmethod
     def get_by_id(notificacion_persona_id):
         """
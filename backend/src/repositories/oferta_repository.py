@@ -8,6 +8,7 @@ from src.models.programa import Programa
 from src.models.sesion import Sesion
 from src.models.inscripcion import Inscripcion
 from src.app import db
+from src.cache import marcar_cambios
 from sqlalchemy.orm import joinedload
 from sqlalchemy import func
 
@@ -63,6 +64,7 @@ class OfertaRepository:
             estado=oferta_data.get('estado', True)
         )
         db.session.add(nueva_oferta)
+        marcar_cambios('oferta')
         db.session.commit()
         return nueva_oferta
 
@@ -84,6 +86,7 @@ class OfertaRepository:
             oferta.whatsapplink = oferta_data.get('whatsapplink', oferta.whatsapplink)
             oferta.repite_semanalmente = oferta_data.get('repite_semanalmente', oferta.repite_semanalmente)
             oferta.estado = oferta_data.get('estado', oferta.estado)
+            marcar_cambios('oferta')
             db.session.commit()
         return oferta
 
@@ -95,6 +98,7 @@ class OfertaRepository:
         oferta = Oferta.query.get(oferta_id)
         if oferta:
             oferta.estado = False
+            marcar_cambios('oferta')
             db.session.commit()
         return oferta
 
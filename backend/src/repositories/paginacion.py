@@ -0,0 +1,109 @@
+"""
+Paginación por keyset (seek) compartida por los repositorios
+
+En lugar de OFFSET, cada página se pide "después del último id visto":
+
+    WHERE id > :ultimo_id ORDER BY id LIMIT :limite + 1
+
+El costo de cualquier página es el mismo (una búsqueda en el índice de la PK) sin
+importar cuántas filas tenga la tabla ni qué tan profunda sea la página. La fila
+extra solo sirve para saber si hay una página siguiente.
+
+Hacia el cliente el cursor es opaco (base64 de {"id": ...}): no debe construirlo
+ni interpretarlo, solo devolver el `siguiente_cursor` de la página anterior.
+"""
+
+import base64
+import binascii
+import json
+
+from flask import current_app, has_app_context
+from sqlalchemy.engine import Row
+
+# Valores si la app no define PAGINACION_LIMITE_POR_DEFECTO / PAGINACION_LIMITE_MAXIMO
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 500
+
+
+class ParametrosPaginacionInvalidos(ValueError):
+    """limite o cursor mal formados (los servicios lo traducen a un 400)"""
+
+
+def codificar_cursor(ultimo_id):
+    contenido = json.dumps({'id': ultimo_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(contenido).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        ultimo_id = json.loads(base64.urlsafe_b64decode(cursor + relleno))['id']
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ParametrosPaginacionInvalidos('cursor inválido')
+    if not isinstance(ultimo_id, int) or isinstance(ultimo_id, bool):
+        raise ParametrosPaginacionInvalidos('cursor inválido')
+    return ultimo_id
+
+
+def _limites():
+    if not has_app_context():
+        return LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+    config = current_app.config
+    return (config.get('PAGINACION_LIMITE_POR_DEFECTO', LIMITE_POR_DEFECTO),
+            config.get('PAGINACION_LIMITE_MAXIMO', LIMITE_MAXIMO))
+
+
+def leer_parametros(limite, cursor):
+    """
+    Valida los parámetros `limite` y `cursor` recibidos en la query. Las rutas pasan
+    `limite` tal como llega (string): un valor no numérico es un 400, no "sin paginar".
+
+    Returns:
+        None si no se pidió paginación (la ruta mantiene la respuesta completa
+        de siempre), o (limite, desde_id) con el límite acotado a PAGINACION_LIMITE_MAXIMO.
+    """
+    if limite is None and not cursor:
+        return None
+    limite_por_defecto, limite_maximo = _limites()
+    if limite is None:
+        limite = limite_por_defecto
+    try:
+        limite = int(limite)
+    except (TypeError, ValueError):
+        raise ParametrosPaginacionInvalidos('limite debe ser un entero')
+    if limite <= 0:
+        raise ParametrosPaginacionInvalidos('limite debe ser mayor a 0')
+    desde_id = decodificar_cursor(cursor) if cursor else None
+    return min(limite, limite_maximo), desde_id
+
+
+def paginar(query, columna_id, limite, desde_id=None, descendente=False):
+    """
+    Aplica el keyset sobre `query` ordenando por `columna_id` (la PK), de menor a
+    mayor o, con `descendente`, de más nuevo a más antiguo. En consultas de varias
+    entidades la dueña de `columna_id` debe ser la primera columna.
+
+    Returns:
+        (filas, siguiente_id): siguiente_id es el id de la última fila devuelta
+        si existe una página siguiente, None si esta es la última.
+    """
+    if desde_id is not None:
+        query = query.filter(columna_id < desde_id if descendente else columna_id > desde_id)
+    orden = columna_id.desc() if descendente else columna_id
+    filas = query.order_by(orden).limit(limite + 1).all()
+    if len(filas) <= limite:
+        return filas, None
+    filas = filas[:limite]
+    ultima = filas[-1][0] if isinstance(filas[-1], Row) else filas[-1]
+    return filas, getattr(ultima, columna_id.key)
+
+
+def respuesta_pagina(items, siguiente_id, limite):
+    """
+    Cuerpo JSON común de las respuestas paginadas
+    """
+    return {
+        'items': items,
+        'limite': limite,
+        'siguiente_cursor': codificar_cursor(siguiente_id) if siguiente_id is not None else None
+    }
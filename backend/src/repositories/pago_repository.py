@@ -1,5 +1,11 @@
 from src.models.pago import Pago
+from src.models.inscripcion import Inscripcion
+from src.models.persona import Persona
+from src.models.paquete import Paquete
+from src.models.oferta import Oferta
 from src.app import db
+from sqlalchemy import insert
+from src.repositories.paginacion import paginar
 
 class PagoRepository:
     """
@@ -13,6 +19,13 @@ class PagoRepository:
         """
         return Pago.query.all()
 
+    @staticmethod
+    def get_pagina(limite, desde_id=None):
+        """
+        Obtiene una página de pagos ordenada por id_pago (paginación por keyset)
+        """
+        return paginar(Pago.query, Pago.id_pago, limite, desde_id)
+
     @staticmethod
     def get_by_id(pago_id):
         """
@@ -77,6 +90,57 @@ class PagoRepository:
         db.session.flush()  # Para obtener el ID
         return pago
 
+    @staticmethod
+    def get_by_inscripciones(inscripciones_ids):
+        """
+        Pagos de varias inscripciones en una sola consulta (IN), agrupados por inscripción
+        y ordenados por número de cuota: {inscripcion_id: [Pago, ...]}
+        """
+        pagos_por_inscripcion = {inscripcion_id: [] for inscripcion_id in inscripciones_ids}
+        if not inscripciones_ids:
+            return pagos_por_inscripcion
+        pagos = Pago.query.filter(
+            Pago.Inscripcion_id_inscripcion.in_(inscripciones_ids)
+        ).order_by(Pago.Inscripcion_id_inscripcion, Pago.numero_cuota).all()
+        for pago in pagos:
+            pagos_por_inscripcion[pago.Inscripcion_id_inscripcion].append(pago)
+        return pagos_por_inscripcion
+
+    @staticmethod
+    def iter_para_exportar(ciclo_id=None, chunk=1000):
+        """
+        Pagos junto con la persona de su inscripción, ordenados por id_pago y leídos
+        de a `chunk` con yield_per, para exportaciones en streaming
+
+        Returns:
+            iterable de tuplas (pago, persona)
+        """
+        query = db.session.query(Pago, Persona).join(
+            Inscripcion, Pago.Inscripcion_id_inscripcion == Inscripcion.id_inscripcion
+        ).join(
+            Persona, Inscripcion.Persona_id_persona == Persona.id_persona
+        )
+        if ciclo_id is not None:
+            query = query.join(
+                Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+            ).join(
+                Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+            ).filter(
+                Oferta.ciclo_id_ciclo == ciclo_id
+            )
+        return query.order_by(Pago.id_pago).yield_per(chunk)
+
+    @staticmethod
+    def create_bulk(pagos_data):
+        """
+        Crea varios pagos con un solo INSERT ... VALUES (...), (...) RETURNING
+        Devuelve los pagos ordenados por inscripción y número de cuota
+        """
+        if not pagos_data:
+            return []
+        pagos = db.session.scalars(insert(Pago).returning(Pago), pagos_data).all()
+        return sorted(pagos, key=lambda p: (p.Inscripcion_id_inscripcion, p.numero_cuota))
+
     @staticmethod
     def update(pago_id, pago_data):
         """
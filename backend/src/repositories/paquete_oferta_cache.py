@@ -0,0 +1,62 @@
+"""
+Caché en memoria (por proceso) de los paquetes activos de cada oferta, ya serializados
+
+La usa la agenda de sesiones: muchas sesiones comparten unas pocas ofertas, así que
+las listas de paquetes se cargan una vez por oferta (una sola consulta IN para todas
+las que falten) y se reutilizan entre requests durante `ttl` segundos.
+PaqueteRepository invalida la oferta afectada en cada create/update/delete.
+"""
+
+import threading
+import time
+
+
+class PaqueteOfertaCache:
+    def __init__(self, ttl=60.0):
+        """
+        Args:
+            ttl: segundos que una lista cacheada se considera vigente (0 desactiva la caché)
+        """
+        self.ttl = ttl
+        self._entradas = {}  # oferta_id -> (expira_en, [paquete_dict, ...])
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('AGENDA_PAQUETES_CACHE_TTL', self.ttl)
+
+    def get_many(self, ofertas_ids, cargar):
+        """
+        Devuelve {oferta_id: [paquete_dict, ...]} para todas las ofertas pedidas.
+        Las que no estén en caché (o hayan vencido) se obtienen con una sola llamada
+        a `cargar(ids_faltantes)`, que debe devolver {oferta_id: [paquete_dict, ...]}.
+        """
+        ahora = time.monotonic()
+        resultado = {}
+        faltantes = []
+        for oferta_id in set(ofertas_ids):
+            entrada = self._entradas.get(oferta_id)
+            if entrada is not None and entrada[0] > ahora:
+                resultado[oferta_id] = entrada[1]
+            else:
+                faltantes.append(oferta_id)
+
+        if faltantes:
+            cargados = cargar(faltantes)
+            expira_en = ahora + self.ttl
+            with self._lock:
+                for oferta_id in faltantes:
+                    paquetes = cargados.get(oferta_id, [])
+                    resultado[oferta_id] = paquetes
+                    if self.ttl > 0:
+                        self._entradas[oferta_id] = (expira_en, paquetes)
+        return resultado
+
+    def invalidar(self, *ofertas_ids):
+        """
+        Descarta las ofertas indicadas (o toda la caché si no se indica ninguna)
+        """
+        with self._lock:
+            if not ofertas_ids:
+                self._entradas.clear()
+            for oferta_id in ofertas_ids:
+                self._entradas.pop(oferta_id, None)
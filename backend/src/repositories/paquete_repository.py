@@ -1,5 +1,11 @@
 from src.models.paquete import Paquete
 from src.app import db
+from src.cache import marcar_cambios
+from src.repositories.paquete_oferta_cache import PaqueteOfertaCache
+
+# Paquetes activos por oferta, compartidos entre sesiones de la agenda
+# (AGENDA_PAQUETES_CACHE_TTL se aplica en create_app)
+paquetes_por_oferta_cache = PaqueteOfertaCache()
 
 class PaqueteRepository:
     """
@@ -34,6 +40,47 @@ class PaqueteRepository:
         """
         return Paquete.query.filter_by(Oferta_id_oferta=oferta_id, estado=True).all()
 
+    @staticmethod
+    def get_active_by_ofertas(ofertas_ids):
+        """
+        Paquetes activos de varias ofertas en una sola consulta (IN): {oferta_id: [Paquete, ...]}
+        """
+        paquetes_por_oferta = {oferta_id: [] for oferta_id in ofertas_ids}
+        if not ofertas_ids:
+            return paquetes_por_oferta
+        paquetes = Paquete.query.filter(
+            Paquete.Oferta_id_oferta.in_(ofertas_ids),
+            Paquete.estado == True
+        ).order_by(Paquete.id_paquete).all()
+        for paquete in paquetes:
+            paquetes_por_oferta[paquete.Oferta_id_oferta].append(paquete)
+        return paquetes_por_oferta
+
+    @staticmethod
+    def get_resumen_by_ofertas(ofertas_ids):
+        """
+        Paquetes activos de varias ofertas ya serializados para la agenda, usando la caché
+        en memoria: {oferta_id: [paquete_dict, ...]}
+        """
+        return paquetes_por_oferta_cache.get_many(ofertas_ids, PaqueteRepository._cargar_resumen)
+
+    @staticmethod
+    def _cargar_resumen(ofertas_ids):
+        return {
+            oferta_id: [
+                {
+                    "id_paquete": paquete.id_paquete,
+                    "nombre": paquete.nombre,
+                    "cantidad_clases": paquete.cantidad_clases,
+                    "dias_validez": paquete.dias_validez,
+                    "ilimitado": paquete.ilimitado,
+                    "precio": float(paquete.precio)
+                }
+                for paquete in paquetes
+            ]
+            for oferta_id, paquetes in PaqueteRepository.get_active_by_ofertas(ofertas_ids).items()
+        }
+
     @staticmethod
     def get_by_name_active(nombre):
         """
@@ -63,7 +110,9 @@ class PaqueteRepository:
             estado=paquete_data.get('estado', True)
         )
         db.session.add(nuevo_paquete)
+        marcar_cambios('paquete')
         db.session.commit()
+        paquetes_por_oferta_cache.invalidar(nuevo_paquete.Oferta_id_oferta)
         return nuevo_paquete
 
     @staticmethod
@@ -73,6 +122,7 @@ class PaqueteRepository:
         """
         paquete = Paquete.query.get(paquete_id)
         if paquete:
+            oferta_anterior = paquete.Oferta_id_oferta
             paquete.nombre = paquete_data.get('nombre', paquete.nombre)
             paquete.cantidad_clases = paquete_data.get('cantidad_clases', paquete.cantidad_clases)
             paquete.dias_validez = paquete_data.get('dias_validez', paquete.dias_validez)
@@ -80,7 +130,9 @@ class PaqueteRepository:
             paquete.Oferta_id_oferta = paquete_data.get('oferta_id', paquete.Oferta_id_oferta)
             paquete.precio = paquete_data.get('precio', paquete.precio)
             paquete.estado = paquete_data.get('estado', paquete.estado)
+            marcar_cambios('paquete')
             db.session.commit()
+            paquetes_por_oferta_cache.invalidar(oferta_anterior, paquete.Oferta_id_oferta)
         return paquete
 
     @staticmethod
@@ -91,7 +143,9 @@ class PaqueteRepository:
         paquete = Paquete.query.get(paquete_id)
         if paquete:
             paquete.estado = False
+            marcar_cambios('paquete')
             db.session.commit()
+            paquetes_por_oferta_cache.invalidar(paquete.Oferta_id_oferta)
         return paquete
 
     @staticmethod
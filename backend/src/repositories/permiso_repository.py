@@ -2,6 +2,7 @@ from src.models.permiso import Permiso
 from src.app import db
 from sqlalchemy import and_, or_, desc, asc
 from datetime import datetime
+from src.repositories.paginacion import paginar
 
 class PermisoRepository:
     
@@ -19,6 +20,13 @@ class PermisoRepository:
             traceback.print_exc()
             return []
     
+    @staticmethod
+    def get_pagina(limite, desde_id=None):
+        """
+        Obtiene una página de permisos ordenada por permiso_id (paginación por keyset)
+        """
+        return paginar(Permiso.query, Permiso.permiso_id, limite, desde_id)
+
     @staticmethod
     def get_by_id(permiso_id):
         """Obtiene un permiso por ID"""
@@ -302,10 +310,44 @@ class PermisoRepository:
             return None
     
     @staticmethod
-    def get_all_detailed():
+    def get_all_detailed(estado_permiso=None, ciclo_id=None):
         """
-        Obtiene información detallada de todos los permisos activos
+        Obtiene información detallada de todos los permisos activos, opcionalmente
+        filtrados por estado_permiso y ciclo. La última columna de cada fila es la
+        persona que respondió el permiso (None si aún no fue respondido).
+        """
+        try:
+            return PermisoRepository._query_detailed(estado_permiso, ciclo_id).order_by(
+                desc(Permiso.fecha_solicitud)
+            ).all()
+        except Exception as e:
+            print(f"Error al obtener información detallada de todos los permisos: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return []
+
+    @staticmethod
+    def get_pagina_detailed(limite, desde_id=None, estado_permiso=None, ciclo_id=None):
         """
+        Una página de get_all_detailed, de más nuevo a más antiguo por permiso_id
+        (paginación por keyset). Devuelve (filas, siguiente_id).
+        """
+        return paginar(PermisoRepository._query_detailed(estado_permiso, ciclo_id), Permiso.permiso_id,
+                       limite, desde_id, descendente=True)
+
+    @staticmethod
+    def iter_detailed(ciclo_id=None, estado_permiso=None, chunk=1000):
+        """
+        Mismas filas que get_all_detailed, ordenadas por permiso_id y leídas de a
+        `chunk` con yield_per, para exportaciones en streaming
+        """
+        return PermisoRepository._query_detailed(estado_permiso, ciclo_id).order_by(
+            Permiso.permiso_id
+        ).yield_per(chunk)
+
+    @staticmethod
+    def _query_detailed(estado_permiso=None, ciclo_id=None):
+        from sqlalchemy.orm import aliased
         from src.models.persona import Persona
         from src.models.asistencia import Asistencia
         from src.models.inscripcion import Inscripcion
@@ -315,44 +357,47 @@ class PermisoRepository:
         from src.models.oferta import Oferta
         from src.models.ciclo import Ciclo
         from src.models.estilo import Estilo
-        
-        try:
-            results = db.session.query(
-                Permiso,
-                Persona,
-                Asistencia,
-                HorarioSesion,
-                Horario,
-                Estilo,
-                Inscripcion,
-                Paquete,
-                Oferta,
-                Ciclo
-            ).join(
-                Persona, Permiso.persona_id_persona == Persona.id_persona
-            ).join(
-                Asistencia, Permiso.asistencia_original_id == Asistencia.id_asistencia
-            ).join(
-                HorarioSesion, Permiso.horario_sesion_id_horario_sesion == HorarioSesion.id_horario_sesion
-            ).join(
-                Horario, HorarioSesion.Horario_id_horario == Horario.id_horario
-            ).join(
-                Estilo, Horario.Estilo_id_estilo == Estilo.id_estilo
-            ).join(
-                Inscripcion, Permiso.inscripcion_id_inscripcion == Inscripcion.id_inscripcion
-            ).join(
-                Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
-            ).join(
-                Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
-            ).join(
-                Ciclo, Oferta.ciclo_id_ciclo == Ciclo.id_ciclo
-            ).filter(
-                Permiso.activo == True
-            ).order_by(desc(Permiso.fecha_solicitud)).all()
-            
-            return results
-        except Exception as e:
-            print(f"Error al obtener información detallada de todos los permisos: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return []
\ No newline at end of file
+
+        # Quien respondió se resuelve en la misma consulta (LEFT JOIN a un alias de Persona)
+        PersonaRespondio = aliased(Persona, name='persona_respondio')
+
+        query = db.session.query(
+            Permiso,
+            Persona,
+            Asistencia,
+            HorarioSesion,
+            Horario,
+            Estilo,
+            Inscripcion,
+            Paquete,
+            Oferta,
+            Ciclo,
+            PersonaRespondio
+        ).join(
+            Persona, Permiso.persona_id_persona == Persona.id_persona
+        ).join(
+            Asistencia, Permiso.asistencia_original_id == Asistencia.id_asistencia
+        ).join(
+            HorarioSesion, Permiso.horario_sesion_id_horario_sesion == HorarioSesion.id_horario_sesion
+        ).join(
+            Horario, HorarioSesion.Horario_id_horario == Horario.id_horario
+        ).join(
+            Estilo, Horario.Estilo_id_estilo == Estilo.id_estilo
+        ).join(
+            Inscripcion, Permiso.inscripcion_id_inscripcion == Inscripcion.id_inscripcion
+        ).join(
+            Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+        ).join(
+            Oferta, Paquete.Oferta_id_oferta == Oferta.id_oferta
+        ).join(
+            Ciclo, Oferta.ciclo_id_ciclo == Ciclo.id_ciclo
+        ).outerjoin(
+            PersonaRespondio, Permiso.respondida_por == PersonaRespondio.id_persona
+        ).filter(
+            Permiso.activo == True
+        )
+        if estado_permiso is not None:
+            query = query.filter(Permiso.estado_permiso == estado_permiso)
+        if ciclo_id is not None:
+            query = query.filter(Oferta.ciclo_id_ciclo == ciclo_id)
+        return query
\ No newline at end of file
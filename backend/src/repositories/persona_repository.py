@@ -1,5 +1,6 @@
 from src.models.persona import Persona
 from src.app import db
+from src.repositories.paginacion import paginar
 
 class PersonaRepository:
     """
@@ -13,6 +14,13 @@ class PersonaRepository:
         """
         return Persona.query.all()
 
+    @staticmethod
+    def get_pagina(limite, desde_id=None):
+        """
+        Obtiene una página de personas ordenada por id_persona (paginación por keyset)
+        """
+        return paginar(Persona.query, Persona.id_persona, limite, desde_id)
+
     @staticmethod
     def get_by_id(persona_id):
         """
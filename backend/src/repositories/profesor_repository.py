@@ -1,6 +1,7 @@
 from src.models.profesor import Profesor
 from src.models.persona import Persona
 from ..app import db
+from src.repositories.rol_repository import RolRepository
 
 class ProfesorRepository:
     
@@ -58,6 +59,7 @@ class ProfesorRepository:
         profesor = Profesor(**profesor_data)
         db.session.add(profesor)
         db.session.commit()
+        RolRepository.invalidar(profesor.Persona_id_persona)
         return profesor
     
     @staticmethod
@@ -76,6 +78,7 @@ class ProfesorRepository:
             if hasattr(profesor, key):
                 setattr(profesor, key, value)
         db.session.commit()
+        RolRepository.invalidar(profesor.Persona_id_persona)
         return profesor
     
     @staticmethod
@@ -85,6 +88,7 @@ class ProfesorRepository:
         if profesor:
             profesor.estado = False
             db.session.commit()
+            RolRepository.invalidar(profesor.Persona_id_persona)
         return profesor
     
     @staticmethod
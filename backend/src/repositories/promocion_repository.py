@@ -1,5 +1,6 @@
 from src.models.promocion import Promocion
 from src.app import db
+from src.cache import marcar_cambios
 
 class PromocionRepository:
     """
@@ -64,6 +65,7 @@ class PromocionRepository:
         """
         promocion = Promocion(**promocion_data)
         db.session.add(promocion)
+        marcar_cambios('promocion')
         db.session.flush()  # Para obtener el ID
         return promocion
 
@@ -80,6 +82,7 @@ class PromocionRepository:
             if hasattr(promocion, key):
                 setattr(promocion, key, value)
 
+        marcar_cambios('promocion')
         db.session.flush()
         return promocion
 
@@ -93,5 +96,6 @@ class PromocionRepository:
             return None
 
         promocion.estado = False
+        marcar_cambios('promocion')
         db.session.flush()
         return promocion
\ No newline at end of file
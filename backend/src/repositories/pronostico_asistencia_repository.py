@@ -0,0 +1,132 @@
+from datetime import datetime
+from sqlalchemy import and_
+from src.app import db
+from src.cache import marcar_cambios
+from src.models.pronostico_asistencia import PronosticoAsistencia
+from src.models.asistencia import Asistencia
+from src.models.horario_sesion import HorarioSesion
+from src.models.horario import Horario
+from src.models.oferta import Oferta
+from src.models.sala import Sala
+from src.models.inscripcion import Inscripcion
+from src.models.paquete import Paquete
+from src.models.subcategoria import Subcategoria
+from src.models.categoria import Categoria
+from src.models.programa import Programa
+from src.models.pago import Pago
+from src.models.metodo_pago import MetodoPago
+
+
+class PronosticoAsistenciaRepository:
+    """
+    Repositorio de pronósticos de asistencia por sesión (PronosticoAsistencia)
+    """
+
+    @staticmethod
+    def get_sesiones_ids_en_rango(fecha_desde, fecha_hasta):
+        """
+        IDs de las sesiones activas y no canceladas en el rango de fechas
+        """
+        filas = db.session.query(HorarioSesion.id_horario_sesion).filter(
+            HorarioSesion.fecha >= fecha_desde,
+            HorarioSesion.fecha <= fecha_hasta,
+            HorarioSesion.estado == True,
+            HorarioSesion.cancelado == False
+        ).all()
+        return [fila.id_horario_sesion for fila in filas]
+
+    @staticmethod
+    def iter_filas_features(fecha_desde, fecha_hasta, chunk=1000):
+        """
+        Recorre, en streaming, una fila por cada asistencia activa de las sesiones del rango
+        con todo lo necesario para construir las features del modelo de asistencia.
+        El método de pago sale de la primera cuota (si existe).
+        """
+        query = db.session.query(
+            Asistencia.Horario_sesion_id_horario_sesion.label('sesion_id'),
+            HorarioSesion.dia,
+            HorarioSesion.hora_inicio,
+            HorarioSesion.duracion,
+            Horario.nivel,
+            Oferta.ciclo_id_ciclo,
+            Sala.departamento,
+            Programa.nombre_programa,
+            Paquete.cantidad_clases,
+            Paquete.ilimitado,
+            Inscripcion.precio_original,
+            Inscripcion.descuento_aplicado,
+            MetodoPago.nombre_metodo
+        ).join(
+            HorarioSesion, Asistencia.Horario_sesion_id_horario_sesion == HorarioSesion.id_horario_sesion
+        ).join(
+            Horario, HorarioSesion.Horario_id_horario == Horario.id_horario
+        ).join(
+            Oferta, Horario.Oferta_id_oferta == Oferta.id_oferta
+        ).join(
+            Sala, Horario.Sala_id_sala == Sala.id_sala
+        ).join(
+            Subcategoria, Oferta.Subcategoria_id_subcategoria == Subcategoria.id_subcategoria
+        ).join(
+            Categoria, Subcategoria.Categoria_id_categoria == Categoria.id_categoria
+        ).join(
+            Programa, Categoria.Programa_id_programa == Programa.id_programa
+        ).join(
+            Inscripcion, Asistencia.Inscripcion_id_inscripcion == Inscripcion.id_inscripcion
+        ).join(
+            Paquete, Inscripcion.Paquete_id_paquete == Paquete.id_paquete
+        ).outerjoin(
+            Pago, and_(Pago.Inscripcion_id_inscripcion == Inscripcion.id_inscripcion, Pago.numero_cuota == 1)
+        ).outerjoin(
+            MetodoPago, Pago.Metodo_pago_id_metodo_pago == MetodoPago.id_metodo_pago
+        ).filter(
+            HorarioSesion.fecha >= fecha_desde,
+            HorarioSesion.fecha <= fecha_hasta,
+            HorarioSesion.estado == True,
+            HorarioSesion.cancelado == False,
+            Asistencia.estado == True
+        ).order_by(Asistencia.Horario_sesion_id_horario_sesion)
+
+        return query.yield_per(chunk)
+
+    @staticmethod
+    def reemplazar(sesiones_ids, resultados, modelo, version_modelo):
+        """
+        Borra los pronósticos previos de las sesiones y guarda los nuevos en un solo INSERT.
+
+        Args:
+            sesiones_ids: sesiones recalculadas (se borran aunque no tengan resultado)
+            resultados: {sesion_id: (inscritos, asistencia_esperada)}
+        """
+        if sesiones_ids:
+            PronosticoAsistencia.query.filter(
+                PronosticoAsistencia.Horario_sesion_id_horario_sesion.in_(sesiones_ids)
+            ).delete(synchronize_session=False)
+
+        ahora = datetime.now()
+        filas = [
+            {
+                'Horario_sesion_id_horario_sesion': sesion_id,
+                'inscritos': inscritos,
+                'asistencia_esperada': round(esperada, 2),
+                'modelo': modelo,
+                'version_modelo': version_modelo,
+                'fecha_calculo': ahora
+            }
+            for sesion_id, (inscritos, esperada) in resultados.items()
+        ]
+        if filas:
+            db.session.execute(PronosticoAsistencia.__table__.insert(), filas)
+        marcar_cambios('sesion')
+        return len(filas)
+
+    @staticmethod
+    def get_by_sesiones(sesiones_ids):
+        """
+        Pronósticos de varias sesiones en una sola consulta: {sesion_id: PronosticoAsistencia}
+        """
+        if not sesiones_ids:
+            return {}
+        pronosticos = PronosticoAsistencia.query.filter(
+            PronosticoAsistencia.Horario_sesion_id_horario_sesion.in_(sesiones_ids)
+        ).all()
+        return {p.Horario_sesion_id_horario_sesion: p for p in pronosticos}
@@ -0,0 +1,51 @@
+"""
+Caché en memoria (por proceso) del rol resuelto de cada persona, ya serializado
+
+La usa AuthService.login: el rol de una persona (y los datos de su tabla de rol) casi
+nunca cambia, así que se resuelve una vez con una sola consulta y se reutiliza entre
+logins durante `ttl` segundos. Los caminos que modifican tablas de rol (PersonaService,
+ProfesorRepository) invalidan la persona afectada; en otros workers la entrada vence
+sola por TTL.
+"""
+
+import threading
+import time
+
+
+class RolPersonaCache:
+    def __init__(self, ttl=300.0):
+        """
+        Args:
+            ttl: segundos que un rol cacheado se considera vigente (0 desactiva la caché)
+        """
+        self.ttl = ttl
+        self._entradas = {}  # persona_id -> (expira_en, {"role": ..., "data": {...}})
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('ROL_PERSONA_CACHE_TTL', self.ttl)
+
+    def get(self, persona_id, cargar):
+        """
+        Devuelve el rol cacheado de la persona o lo obtiene con `cargar(persona_id)`.
+        Las personas sin rol (None) no se cachean: puede asignárseles uno en cualquier momento.
+        """
+        entrada = self._entradas.get(persona_id)
+        if entrada is not None and entrada[0] > time.monotonic():
+            return entrada[1]
+
+        rol = cargar(persona_id)
+        if rol is not None and self.ttl > 0:
+            with self._lock:
+                self._entradas[persona_id] = (time.monotonic() + self.ttl, rol)
+        return rol
+
+    def invalidar(self, *personas_ids):
+        """
+        Descarta las personas indicadas (o toda la caché si no se indica ninguna)
+        """
+        with self._lock:
+            if not personas_ids:
+                self._entradas.clear()
+            for persona_id in personas_ids:
+                self._entradas.pop(persona_id, None)
@@ -0,0 +1,53 @@
+from sqlalchemy import select
+from src.models import Persona, Alumno, AlumnoFemme, Profesor, Director, Elenco
+from src.app import db
+from src.repositories.rol_persona_cache import RolPersonaCache
+
+# Rol resuelto por persona, compartido entre logins
+# (ROL_PERSONA_CACHE_TTL se aplica en create_app)
+roles_por_persona_cache = RolPersonaCache()
+
+# Orden de prioridad cuando una persona figura en más de una tabla de rol
+ROLES = (
+    ('alumno', Alumno),
+    ('alumno_femme', AlumnoFemme),
+    ('profesor', Profesor),
+    ('director', Director),
+    ('elenco', Elenco),
+)
+
+class RolRepository:
+    """
+    Repositorio para resolver el rol de una persona sobre las tablas de rol
+    """
+
+    @staticmethod
+    def get_rol_by_persona(persona_id):
+        """
+        Obtiene (nombre_rol, registro) de la persona con una sola consulta:
+
+            SELECT Alumno.*, AlumnoFemme.*, Profesor.*, Director.*, Elenco.*
+            FROM Persona LEFT JOIN Alumno ... LEFT JOIN Elenco ...
+            WHERE Persona.id_persona = :persona_id LIMIT 1
+
+        Devuelve None si la persona no existe o no está en ninguna tabla de rol.
+        """
+        consulta = select(*(modelo for _, modelo in ROLES)).select_from(Persona)
+        for _, modelo in ROLES:
+            consulta = consulta.outerjoin(modelo, modelo.Persona_id_persona == Persona.id_persona)
+        fila = db.session.execute(
+            consulta.where(Persona.id_persona == persona_id).limit(1)
+        ).first()
+        if fila is None:
+            return None
+        for (nombre, _), registro in zip(ROLES, fila):
+            if registro is not None:
+                return nombre, registro
+        return None
+
+    @staticmethod
+    def invalidar(*personas_ids):
+        """
+        Descarta el rol cacheado de las personas indicadas
+        """
+        roles_por_persona_cache.invalidar(*personas_ids)
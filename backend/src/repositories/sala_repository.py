@@ -1,5 +1,6 @@
 from src.models import Sala
 from src.app import db
+from src.cache import marcar_cambios
 
 class SalaRepository:
     """
@@ -69,6 +70,7 @@ class SalaRepository:
             estado=sala_data.get('estado', True)
         )
         db.session.add(nueva_sala)
+        marcar_cambios('sala')
         db.session.commit()
         return nueva_sala
 
@@ -85,6 +87,7 @@ class SalaRepository:
             sala.departamento = sala_data.get('departamento', sala.departamento)
             sala.zona = sala_data.get('zona', sala.zona)
             sala.estado = sala_data.get('estado', sala.estado)
+            marcar_cambios('sala')
             db.session.commit()
         return sala
 
@@ -96,6 +99,7 @@ class SalaRepository:
         sala = Sala.query.get(sala_id)
         if sala:
             sala.estado = False
+            marcar_cambios('sala')
             db.session.commit()
         return sala
 
@@ -107,6 +111,7 @@ class SalaRepository:
         sala = Sala.query.get(sala_id)
         if sala:
             db.session.delete(sala)
+            marcar_cambios('sala')
             db.session.commit()
         return sala
 
@@ -0,0 +1,34 @@
+"""
+Tabla de valores en línea para actualizaciones masivas (UPDATE ... FROM)
+
+En PostgreSQL se usa el constructor VALUES:
+
+    UPDATE "Asistencia" SET asistio = marcas.asistio
+    FROM (VALUES (1, true), (2, false)) AS marcas (id_asistencia, asistio)
+    WHERE "Asistencia".id_asistencia = marcas.id_asistencia
+
+SQLite acepta UPDATE ... FROM pero no la lista de nombres de columnas después del
+alias, así que allí se arma la misma tabla con SELECT ... UNION ALL. En ambos casos
+es una sola sentencia y el resultado expone las columnas en `.c`.
+"""
+
+from sqlalchemy import values, column, select, literal, union_all
+
+from src.app import db
+
+
+def tabla_valores(nombre, columnas, filas):
+    """
+    Args:
+        nombre: alias de la tabla en la sentencia
+        columnas: [(nombre_columna, tipo), ...]
+        filas: lista de tuplas en el orden de `columnas` (al menos una)
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return values(*(column(nombre_columna, tipo) for nombre_columna, tipo in columnas),
+                      name=nombre).data(filas)
+    return union_all(*(
+        select(*(literal(valor, tipo).label(nombre_columna)
+                 for valor, (nombre_columna, tipo) in zip(fila, columnas)))
+        for fila in filas
+    )).subquery(nombre)
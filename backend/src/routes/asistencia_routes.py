@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.services.asistencia_service import AsistenciaService
+from src.routes.exportacion import respuesta_exportacion, leer_ciclo_id, FORMATOS
+from src.auth import requiere_token
 
 # Crear blueprint para las rutas de asistencias
 asistencia_bp = Blueprint('asistencias', __name__, url_prefix='/asistencias')
@@ -8,10 +10,35 @@ asistencia_bp = Blueprint('asistencias', __name__, url_prefix='/asistencias')
 def get_all_asistencias():
     """
     Obtiene todas las asistencias
-    """
-    result, status_code = AsistenciaService.get_all_asistencias()
+
+    Query params opcionales (paginación por keyset):
+    - limite: cantidad de registros por página
+    - cursor: valor de siguiente_cursor de la página anterior
+    Sin ellos se devuelve la lista completa.
+    """
+    limite = request.args.get('limite')
+    cursor = request.args.get('cursor')
+    result, status_code = AsistenciaService.get_all_asistencias(limite=limite, cursor=cursor)
     return jsonify(result), status_code
 
+@asistencia_bp.route('/export', methods=['GET'])
+def exportar_asistencias():
+    """
+    Exporta las asistencias con persona, sesión y clase, en streaming (NDJSON o CSV) para archivos grandes
+
+    Query params:
+    - formato: ndjson (por defecto) o csv
+    - ciclo_id: solo los registros de ese ciclo (opcional)
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({"error": "formato debe ser ndjson o csv"}), 400
+    try:
+        ciclo_id = leer_ciclo_id()
+    except ValueError:
+        return jsonify({"error": "ciclo_id debe ser un entero"}), 400
+    return respuesta_exportacion(AsistenciaService.exportar_asistencias(ciclo_id=ciclo_id), formato, 'asistencias')
+
 @asistencia_bp.route('/activas', methods=['GET'])
 def get_asistencias_activas():
     """
@@ -140,6 +167,7 @@ def delete_asistencia(asistencia_id):
     return jsonify(result), status_code
 
 @asistencia_bp.route('/<int:asistencia_id>/marcar', methods=['PUT'])
+@requiere_token('profesor', 'director')
 def marcar_asistencia(asistencia_id):
     """
     Marca una asistencia como presente o ausente
@@ -160,6 +188,31 @@ def marcar_asistencia(asistencia_id):
     except Exception as e:
         return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
 
+@asistencia_bp.route('/sesion/<int:horario_sesion_id>/marcar', methods=['PUT'])
+@requiere_token('profesor', 'director')
+def marcar_asistencias_sesion(horario_sesion_id):
+    """
+    Marca la asistencia de toda una sesión en una sola petición y transacción
+    
+    Body JSON esperado:
+    {
+        "asistencias": {
+            "101": true,   // id_asistencia: true = presente, false = ausente
+            "102": false
+        }
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data or 'asistencias' not in data:
+            return jsonify({"error": "Campo 'asistencias' requerido"}), 400
+
+        result, status_code = AsistenciaService.marcar_asistencias_sesion(horario_sesion_id, data['asistencias'])
+        return jsonify(result), status_code
+
+    except Exception as e:
+        return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
+
 @asistencia_bp.route('/inscripcion/<int:inscripcion_id>/estadisticas', methods=['GET'])
 def get_estadisticas_asistencia(inscripcion_id):
     """
@@ -176,6 +229,7 @@ def get_estadisticas_asistencia(inscripcion_id):
     return jsonify(result), status_code
 
 @asistencia_bp.route('/marcar-presente/<int:asistencia_id>', methods=['PUT'])
+@requiere_token('profesor', 'director')
 def marcar_presente(asistencia_id):
     """
     Shortcut para marcar una asistencia como presente
@@ -184,6 +238,7 @@ def marcar_presente(asistencia_id):
     return jsonify(result), status_code
 
 @asistencia_bp.route('/marcar-ausente/<int:asistencia_id>', methods=['PUT'])
+@requiere_token('profesor', 'director')
 def marcar_ausente(asistencia_id):
     """
     Shortcut para marcar una asistencia como ausente
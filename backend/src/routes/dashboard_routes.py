@@ -1,11 +1,17 @@
 from flask import Blueprint, jsonify, request
 from src.services.dashboard_service import DashboardService
+from src.cache import respuesta_condicional
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 dashboard_service = DashboardService()
 
+# Tablas de las que dependen los KPIs del dashboard (ETag / Last-Modified)
+TABLAS_DASHBOARD = ('DashboardCiclo', 'ciclo', 'Oferta', 'Paquete', 'Inscripcion', 'Pago', 'Asistencia',
+                    'Horario', 'HorarioSesion', 'Estilo', 'Profesor', 'Persona')
+
 
 @dashboard_bp.route('/estadisticas/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_estadisticas_generales(id_ciclo):
     """
     GET /dashboard/estadisticas/{id_ciclo}
@@ -15,6 +21,9 @@ def get_estadisticas_generales(id_ciclo):
     - Ocupación promedio
     - Ingresos del mes actual
     - Asistencia promedio
+    
+    Se sirve desde el snapshot DashboardCiclo (ver DASHBOARD_SNAPSHOT_MAX_AGE);
+    'actualizado_en' indica cuándo se calculó.
     """
     try:
         resultado = dashboard_service.get_estadisticas_generales_ciclo(id_ciclo)
@@ -28,7 +37,27 @@ def get_estadisticas_generales(id_ciclo):
         return jsonify({'error': str(e)}), 500
 
 
+@dashboard_bp.route('/estadisticas/<int:id_ciclo>/refrescar', methods=['POST'])
+def refrescar_estadisticas_generales(id_ciclo):
+    """
+    POST /dashboard/estadisticas/{id_ciclo}/refrescar
+    
+    Reconstruye desde cero el snapshot de KPIs del ciclo y lo devuelve.
+    """
+    try:
+        resultado = dashboard_service.refrescar_estadisticas_generales_ciclo(id_ciclo)
+        
+        if resultado is None:
+            return jsonify({'error': 'Ciclo no encontrado'}), 404
+        
+        return jsonify(resultado), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @dashboard_bp.route('/alumnas-por-estilo/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_alumnas_por_estilo(id_ciclo):
     """
     GET /dashboard/alumnas-por-estilo/{id_ciclo}
@@ -45,6 +74,7 @@ def get_alumnas_por_estilo(id_ciclo):
 
 
 @dashboard_bp.route('/ocupacion-por-estilo/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_ocupacion_por_estilo(id_ciclo):
     """
     GET /dashboard/ocupacion-por-estilo/{id_ciclo}
@@ -61,6 +91,7 @@ def get_ocupacion_por_estilo(id_ciclo):
 
 
 @dashboard_bp.route('/ingresos-mensuales', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_ingresos_mensuales():
     """
     GET /dashboard/ingresos-mensuales?anio=2025&meses=6
@@ -84,6 +115,7 @@ def get_ingresos_mensuales():
 
 
 @dashboard_bp.route('/top-profesores/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_top_profesores(id_ciclo):
     """
     GET /dashboard/top-profesores/{id_ciclo}?limit=10
@@ -102,6 +134,7 @@ def get_top_profesores(id_ciclo):
 
 
 @dashboard_bp.route('/horarios-demandados/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_horarios_mas_demandados(id_ciclo):
     """
     GET /dashboard/horarios-demandados/{id_ciclo}
@@ -118,6 +151,7 @@ def get_horarios_mas_demandados(id_ciclo):
 
 
 @dashboard_bp.route('/estado-pagos/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_estado_pagos(id_ciclo):
     """
     GET /dashboard/estado-pagos/{id_ciclo}
@@ -134,6 +168,7 @@ def get_estado_pagos(id_ciclo):
 
 
 @dashboard_bp.route('/asistencia-mensual/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_asistencia_por_mes(id_ciclo):
     """
     GET /dashboard/asistencia-mensual/{id_ciclo}
@@ -150,6 +185,7 @@ def get_asistencia_por_mes(id_ciclo):
 
 
 @dashboard_bp.route('/alumnos-nuevos-recurrentes/<int:id_ciclo>', methods=['GET'])
+@respuesta_condicional(*TABLAS_DASHBOARD)
 def get_alumnos_nuevos_vs_recurrentes(id_ciclo):
     """
     GET /dashboard/alumnos-nuevos-recurrentes/{id_ciclo}
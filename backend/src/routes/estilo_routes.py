@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 from src.services.estilo_service import EstiloService
+from src.cache import cache_respuesta
 
 estilo_bp = Blueprint('estilo', __name__)
 
 @estilo_bp.route('/', methods=['GET'])
+@cache_respuesta('estilo')
 def get_estilos():
     """
     Obtiene todos los estilos
@@ -15,6 +17,7 @@ def get_estilos():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @estilo_bp.route('/active', methods=['GET'])
+@cache_respuesta('estilo')
 def get_active_estilos():
     """
     Obtiene todos los estilos activos
@@ -0,0 +1,97 @@
+"""
+Respuestas de exportación en streaming (NDJSON o CSV)
+
+Las filas llegan como un generador de dicts (los servicios las leen con yield_per)
+y se escriben al cliente a medida que se producen, en bloques de ~64 KB: la memoria
+del worker no depende de cuántas filas tenga la exportación.
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+from flask import Response, request, stream_with_context
+
+FORMATOS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+}
+TAMANO_BLOQUE = 64 * 1024
+
+
+def leer_ciclo_id():
+    """
+    Query param `ciclo_id` como entero (None si no viene). Lanza ValueError si no es un
+    entero: las rutas responden 400 en lugar de exportar todos los ciclos.
+    """
+    ciclo_id = request.args.get('ciclo_id')
+    return int(ciclo_id) if ciclo_id is not None else None
+
+
+def _aplanar(fila, columnas=None, prefijo=''):
+    """
+    {'persona': {'nombre': 'Ana'}} -> {'persona.nombre': 'Ana'} (columnas de CSV)
+
+    Las columnas salen de la primera fila. Si allí un objeto opcional venía vacío
+    (p. ej. promocion = None) su columna es 'promocion' y en las filas siguientes
+    ese objeto se escribe como JSON en esa misma columna.
+    """
+    plana = {}
+    for clave, valor in fila.items():
+        columna = f'{prefijo}{clave}'
+        if isinstance(valor, dict) and (columnas is None or columna not in columnas):
+            plana.update(_aplanar(valor, columnas, f'{columna}.'))
+        elif isinstance(valor, (dict, list, tuple)):
+            plana[columna] = json.dumps(valor, default=str, ensure_ascii=False)
+        else:
+            plana[columna] = valor
+    return plana
+
+
+def _generar_ndjson(filas):
+    buffer = io.StringIO()
+    for fila in filas:
+        buffer.write(json.dumps(fila, default=str, ensure_ascii=False))
+        buffer.write('\n')
+        if buffer.tell() >= TAMANO_BLOQUE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _generar_csv(filas):
+    buffer = io.StringIO()
+    escritor = None
+    columnas = None
+    for fila in filas:
+        plana = _aplanar(fila, columnas)
+        if escritor is None:
+            columnas = set(plana)
+            escritor = csv.DictWriter(buffer, fieldnames=list(plana), extrasaction='ignore')
+            escritor.writeheader()
+        escritor.writerow(plana)
+        if buffer.tell() >= TAMANO_BLOQUE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def respuesta_exportacion(filas, formato, nombre_archivo):
+    """
+    Response en streaming con las filas en `formato` ('ndjson' | 'csv'), descargable
+    como <nombre_archivo>_<fecha>.<ext>. El formato debe validarse antes (ver FORMATOS).
+    """
+    mimetype, extension = FORMATOS[formato]
+    generador = _generar_csv(filas) if formato == 'csv' else _generar_ndjson(filas)
+    response = Response(stream_with_context(generador), mimetype=mimetype)
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename="{nombre_archivo}_{date.today().isoformat()}.{extension}"'
+    )
+    # Evita que un proxy (nginx) acumule la respuesta completa antes de enviarla
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,10 +1,16 @@
 from flask import Blueprint, request, jsonify
 from src.services.horario_service import HorarioService
 from src.services.horario_sesion_service import HorarioSesionService
+from src.cache import cache_respuesta, respuesta_condicional, tags_de_tablas
 
 horario_bp = Blueprint('horario', __name__)
 
+# Tablas de las que dependen las lecturas de horarios (ETag / Last-Modified)
+TABLAS_HORARIOS = ('Horario', 'HorarioSesion', 'Oferta', 'ciclo', 'Subcategoria', 'Categoria', 'Programa',
+                   'Estilo', 'Profesor', 'Persona', 'Sala', 'Paquete', 'Inscripcion', 'Asistencia')
+
 @horario_bp.route('/', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_horarios():
     """
     Obtiene todos los horarios
@@ -16,6 +22,7 @@ def get_horarios():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/active', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_active_horarios():
     """
     Obtiene todos los horarios activos
@@ -27,6 +34,9 @@ def get_active_horarios():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/cursos-regulares/vigente', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
+@cache_respuesta(*tags_de_tablas('Oferta', 'ciclo', 'Subcategoria', 'Categoria', 'Programa', 'Horario',
+                                  'Estilo', 'Profesor', 'Persona', 'Sala'))
 def get_horarios_cursos_regulares_vigentes():
     """
     Obtiene los horarios de cursos regulares del ciclo activo vigente.
@@ -48,6 +58,7 @@ def get_horarios_cursos_regulares_vigentes():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/oferta/<int:oferta_id>', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_horarios_by_oferta(oferta_id):
     """
     Obtiene todos los horarios de una oferta
@@ -59,6 +70,7 @@ def get_horarios_by_oferta(oferta_id):
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/profesor/<int:profesor_id>', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_horarios_by_profesor(profesor_id):
     """
     Obtiene todos los horarios de un profesor con información completa
@@ -76,6 +88,7 @@ def get_horarios_by_profesor(profesor_id):
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/<int:horario_id>', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_horario(horario_id):
     """
     Obtiene un horario por ID
@@ -87,6 +100,7 @@ def get_horario(horario_id):
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/<int:horario_id>/sesiones', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_sesiones_by_horario(horario_id):
     """
     Obtiene todas las sesiones de un horario
@@ -98,6 +112,7 @@ def get_sesiones_by_horario(horario_id):
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/<int:horario_id>/sesiones/active', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_active_sesiones_by_horario(horario_id):
     """
     Obtiene todas las sesiones activas de un horario
@@ -109,6 +124,7 @@ def get_active_sesiones_by_horario(horario_id):
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/<int:horario_id>/sesiones/<int:sesion_id>', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_sesion(horario_id, sesion_id):
     """
     Obtiene una sesión específica de un horario
@@ -189,6 +205,33 @@ def create_horario():
     except Exception as e:
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
+@horario_bp.route('/sesiones/previsualizar', methods=['POST'])
+def previsualizar_sesiones():
+    """
+    Devuelve las fechas de las sesiones que se generarían, sin crear nada
+
+    Body esperado:
+    {
+        "oferta_id": 1,
+        "dias": [1, 3, 5],
+        "hora_inicio": "18:00",
+        "hora_fin": "19:30",
+        "fecha_inicio": "2025-03-01",   // opcional, por defecto la de la oferta
+        "fecha_fin": "2025-06-30",      // opcional, por defecto la de la oferta
+        "repite_semanalmente": true     // opcional, por defecto el de la oferta
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Datos requeridos"}), 400
+
+        result, status_code = HorarioService.previsualizar_sesiones(data)
+        return jsonify(result), status_code
+
+    except Exception as e:
+        return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
+
 @horario_bp.route('/<int:horario_id>', methods=['PUT'])
 def update_horario(horario_id):
     """
@@ -218,6 +261,7 @@ def delete_horario(horario_id):
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/profesores', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_todos_horarios_detallados():
     """
     Obtiene todos los horarios con información detallada completa
@@ -241,6 +285,7 @@ def get_todos_horarios_detallados():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @horario_bp.route('/marcado-automatico', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def marcado_automatico():
     """
     Selecciona automáticamente IDs de horario_sesion según parámetros
@@ -295,6 +340,7 @@ def marcado_automatico():
         return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
 
 @horario_bp.route('/sesiones/<int:horario_id>', methods=['GET'])
+@respuesta_condicional(*TABLAS_HORARIOS)
 def get_sesiones_by_horario_fecha(horario_id):
     """
     Obtiene horarios sesión filtrados por horario y rango de fechas
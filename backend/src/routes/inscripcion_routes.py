@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from src.services.inscripcion_service import InscripcionService
+from src.cache import respuesta_condicional
+from src.auth import requiere_token, identidad_actual
+from src.routes.exportacion import respuesta_exportacion, leer_ciclo_id, FORMATOS
 
 # Crear blueprint para las rutas de inscripciones
 inscripcion_bp = Blueprint('inscripciones', __name__, url_prefix='/inscripciones')
@@ -8,8 +11,15 @@ inscripcion_bp = Blueprint('inscripciones', __name__, url_prefix='/inscripciones
 def get_all_inscripciones():
     """
     Obtiene todas las inscripciones
+
+    Query params opcionales (paginación por keyset):
+    - limite: cantidad de registros por página
+    - cursor: valor de siguiente_cursor de la página anterior
+    Sin ellos se devuelve la lista completa.
     """
-    result, status_code = InscripcionService.get_all_inscripciones()
+    limite = request.args.get('limite')
+    cursor = request.args.get('cursor')
+    result, status_code = InscripcionService.get_all_inscripciones(limite=limite, cursor=cursor)
     return jsonify(result), status_code
 
 @inscripcion_bp.route('/active', methods=['GET'])
@@ -53,6 +63,7 @@ def get_inscripcion_by_id(inscripcion_id):
     return jsonify(result), status_code
 
 @inscripcion_bp.route('/', methods=['POST'])
+@requiere_token()
 def create_inscripcion():
     """
     Crea una nueva inscripción con asistencias automáticas
@@ -72,12 +83,21 @@ def create_inscripcion():
     para crear automáticamente los registros de asistencia.
     El campo 'metodo_pago_id' es requerido para crear los pagos automáticamente.
     El campo 'pago_a_cuotas' determina si se divide en 3 cuotas (true) o pago único (false).
+
+    Con token (Authorization: Bearer ...) 'Persona_id_persona' se toma del token si no
+    se envía, y solo un director puede inscribir a otra persona.
     """
     try:
         data = request.get_json()
         if not data:
             return jsonify({"error": "No se proporcionaron datos"}), 400
 
+        identidad = identidad_actual()
+        if identidad is not None:
+            data.setdefault('Persona_id_persona', identidad['id_persona'])
+            if identidad['role'] != 'director' and data['Persona_id_persona'] != identidad['id_persona']:
+                return jsonify({"error": "Solo un director puede inscribir a otra persona"}), 403
+
         result, status_code = InscripcionService.create_inscripcion(data)
         return jsonify(result), status_code
 
@@ -131,6 +151,8 @@ def verificar_vencimientos():
         return jsonify({"error": f"Error al verificar vencimientos: {str(e)}"}), 500
 
 @inscripcion_bp.route('/completas', methods=['GET'])
+@respuesta_condicional('Inscripcion', 'Persona', 'Paquete', 'Promocion', 'Oferta', 'ciclo',
+                       'Subcategoria', 'Categoria', 'Programa')
 def get_inscripciones_completas():
     """
     Obtiene todas las inscripciones con información completa detallada
@@ -147,6 +169,24 @@ def get_inscripciones_completas():
     except Exception as e:
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
+@inscripcion_bp.route('/completas/export', methods=['GET'])
+def exportar_inscripciones_completas():
+    """
+    Exporta las inscripciones completas (mismo formato que /completas), en streaming (NDJSON o CSV) para archivos grandes
+
+    Query params:
+    - formato: ndjson (por defecto) o csv
+    - ciclo_id: solo los registros de ese ciclo (opcional)
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({"error": "formato debe ser ndjson o csv"}), 400
+    try:
+        ciclo_id = leer_ciclo_id()
+    except ValueError:
+        return jsonify({"error": "ciclo_id debe ser un entero"}), 400
+    return respuesta_exportacion(InscripcionService.exportar_inscripciones_completas(ciclo_id=ciclo_id), formato, 'inscripciones')
+
 @inscripcion_bp.route('/horario/<int:horario_id>/inscritos', methods=['GET'])
 def get_inscritos_por_horario(horario_id):
     try:
@@ -57,6 +57,66 @@ def comparar_modelos_paquete():
         return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
 
 
+@ml_bp.route('/predict/paquete/batch', methods=['POST'])
+def predict_compra_paquete_batch():
+    """
+    Predice compra de paquete para muchos alumnos en una sola llamada
+    
+    Body ejemplo:
+    {
+        "modelo": "random_forest",
+        "registros": [
+            {"Departamento": "LP", "Ciclo": 3, "Genero": "Femenino", "Proyecto": "Camino Femme",
+             "Metodo de pago": "QR", "Descuento": "15%", "mes_inscripcion": 11},
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        model_type = data.get('modelo', 'random_forest')
+        
+        result, status_code = MLService.predict_compra_paquete_batch(data.get('registros'), model_type)
+        return jsonify(result), status_code
+    
+    except Exception as e:
+        return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
+
+
+@ml_bp.route('/predict/asistencia/batch', methods=['POST'])
+def predict_asistencia_batch():
+    """
+    Predice asistencia para muchos registros en una sola llamada
+    
+    Body ejemplo:
+    {
+        "modelo": "random_forest",
+        "registros": [
+            {"Departamento": "SCZ", "Ciclo": 3, "Dia": "Domingo", "Turno": "Tarde",
+             "Hora Inicio": "15:00", "Hora_Sesion": 1.5, "Modalidad": "Presencial",
+             "Nivel": "Multinivel", "Genero": "Femenino", "Proyecto": "Camino Femme",
+             "Paquete": "No", "Cantidad clases": 0, "Descuento": "0%", "Metodo de pago": "Efectivo"},
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        model_type = data.get('modelo', 'random_forest')
+        
+        result, status_code = MLService.predict_asistencia_batch(data.get('registros'), model_type)
+        return jsonify(result), status_code
+    
+    except Exception as e:
+        return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
+
+
 @ml_bp.route('/health', methods=['GET'])
 def health_check():
     """
@@ -64,8 +124,9 @@ def health_check():
     """
     try:
         import os
+        from src.ml.predictors.inscripcion_predictor import MODELS_DIR
         
-        models_dir = 'src/ml/models'
+        models_dir = MODELS_DIR
         rf_exists = os.path.exists(f'{models_dir}/rf_paquete_classifier.pkl')
         lr_exists = os.path.exists(f'{models_dir}/lr_paquete_classifier.pkl')
         
@@ -75,6 +136,7 @@ def health_check():
                 "random_forest_paquete": "disponible" if rf_exists else "no_entrenado",
                 "logistic_regression_paquete": "disponible" if lr_exists else "no_entrenado"
             },
+            "modelos_cargados": MLService.get_estado_modelos(),
             "funcionalidad": "Predicción de compra de paquetes",
             "message": "Modelos listos" if (rf_exists and lr_exists) else "Entrena los modelos primero"
         }), 200
@@ -7,9 +7,16 @@ notificacion_persona_bp = Blueprint('notificacion_persona', __name__)
 def get_all_notificaciones_personas():
     """
     Endpoint para obtener todas las asignaciones de notificaciones a personas
+
+    Query params opcionales (paginación por keyset):
+    - limite: cantidad de registros por página
+    - cursor: valor de siguiente_cursor de la página anterior
+    Sin ellos se devuelve la lista completa.
     """
     try:
-        result, status_code = NotificacionPersonaService.get_all_notificaciones_personas()
+        limite = request.args.get('limite')
+        cursor = request.args.get('cursor')
+        result, status_code = NotificacionPersonaService.get_all_notificaciones_personas(limite=limite, cursor=cursor)
         return jsonify(result), status_code
     except Exception as e:
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
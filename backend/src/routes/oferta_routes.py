@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 from src.services.oferta_service import OfertaService
+from src.cache import cache_respuesta
 
 oferta_bp = Blueprint('oferta', __name__)
 
 @oferta_bp.route('/', methods=['GET'])
+@cache_respuesta('oferta')
 def get_ofertas():
     """
     Obtiene todas las ofertas
@@ -15,6 +17,7 @@ def get_ofertas():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @oferta_bp.route('/active', methods=['GET'])
+@cache_respuesta('oferta')
 def get_active_ofertas():
     """
     Obtiene todas las ofertas activas
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from src.services.pago_service import PagoService
+from src.routes.exportacion import respuesta_exportacion, leer_ciclo_id, FORMATOS
 
 # Crear blueprint para las rutas de pagos
 pago_bp = Blueprint('pagos', __name__, url_prefix='/pagos')
@@ -8,10 +9,35 @@ pago_bp = Blueprint('pagos', __name__, url_prefix='/pagos')
 def get_all_pagos():
     """
     Obtiene todos los pagos
+
+    Query params opcionales (paginación por keyset):
+    - limite: cantidad de registros por página
+    - cursor: valor de siguiente_cursor de la página anterior
+    Sin ellos se devuelve la lista completa.
     """
-    result, status_code = PagoService.get_all_pagos()
+    limite = request.args.get('limite')
+    cursor = request.args.get('cursor')
+    result, status_code = PagoService.get_all_pagos(limite=limite, cursor=cursor)
     return jsonify(result), status_code
 
+@pago_bp.route('/export', methods=['GET'])
+def exportar_pagos():
+    """
+    Exporta los pagos con la persona de cada inscripción, en streaming (NDJSON o CSV) para archivos grandes
+
+    Query params:
+    - formato: ndjson (por defecto) o csv
+    - ciclo_id: solo los registros de ese ciclo (opcional)
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({"error": "formato debe ser ndjson o csv"}), 400
+    try:
+        ciclo_id = leer_ciclo_id()
+    except ValueError:
+        return jsonify({"error": "ciclo_id debe ser un entero"}), 400
+    return respuesta_exportacion(PagoService.exportar_pagos(ciclo_id=ciclo_id), formato, 'pagos')
+
 @pago_bp.route('/pendientes', methods=['GET'])
 def get_pagos_pendientes():
     """
@@ -142,6 +168,15 @@ def get_inscripciones_activas_detallado():
     - Información del ciclo
     - Información de la subcategoría, categoría y programa
     - Lista completa de pagos asociados a cada inscripción
+
+    Query params opcionales (paginación):
+    - limite: cantidad de inscripciones por página
+    - cursor: valor de siguiente_cursor de la página anterior
     """
-    result, status_code = PagoService.get_inscripciones_activas_con_pagos()
-    return jsonify(result), status_code
\ No newline at end of file
+    try:
+        limite = request.args.get('limite')
+        cursor = request.args.get('cursor')
+        result, status_code = PagoService.get_inscripciones_activas_con_pagos(limite=limite, cursor=cursor)
+        return jsonify(result), status_code
+    except Exception as e:
+        return jsonify({"error": f"Error en la solicitud: {str(e)}"}), 400
\ No newline at end of file
@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 from src.services.paquete_service import PaqueteService
+from src.cache import cache_respuesta
 
 paquete_bp = Blueprint('paquete', __name__)
 
 @paquete_bp.route('/', methods=['GET'])
+@cache_respuesta('paquete')
 def get_paquetes():
     """
     Obtiene todos los paquetes
@@ -15,6 +17,7 @@ def get_paquetes():
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 @paquete_bp.route('/active', methods=['GET'])
+@cache_respuesta('paquete')
 def get_active_paquetes():
     """
     Obtiene todos los paquetes activos
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
-from src.services.permiso_service import PermisoService
+from src.services.permiso_service import PermisoService, ESTADOS_PERMISO
+from src.cache import respuesta_condicional
+from src.routes.exportacion import respuesta_exportacion, leer_ciclo_id, FORMATOS
 
 # Crear blueprint para las rutas de permisos
 permiso_bp = Blueprint('permisos', __name__, url_prefix='/permisos')
@@ -8,21 +10,73 @@ permiso_bp = Blueprint('permisos', __name__, url_prefix='/permisos')
 def get_all_permisos():
     """
     Obtiene todos los permisos
-    """
-    result, status_code = PermisoService.get_all_permisos()
+
+    Query params opcionales (paginación por keyset):
+    - limite: cantidad de registros por página
+    - cursor: valor de siguiente_cursor de la página anterior
+    Sin ellos se devuelve la lista completa.
+    """
+    limite = request.args.get('limite')
+    cursor = request.args.get('cursor')
+    result, status_code = PermisoService.get_all_permisos(limite=limite, cursor=cursor)
     return jsonify(result), status_code
 
 @permiso_bp.route('/detallados', methods=['GET'])
+@respuesta_condicional('Permiso', 'Persona', 'Asistencia', 'HorarioSesion', 'Horario', 'Estilo',
+                       'Inscripcion', 'Paquete', 'Oferta', 'ciclo')
 def get_all_permisos_detallados():
     """
     Obtiene todos los permisos con información detallada incluyendo:
     - Datos completos de la persona
     - Información del horario y la clase
     - Datos del paquete, oferta y ciclo
+    - Quién respondió el permiso (si fue respondido)
+
+    Query params opcionales:
+    - estado_permiso: PENDIENTE, APROBADO o RECHAZADO
+    - ciclo_id: solo permisos de inscripciones de ese ciclo
+    - limite / cursor: paginación por keyset, de más nuevo a más antiguo
+      (cursor = siguiente_cursor de la página anterior)
     """
-    result, status_code = PermisoService.get_all_permisos_detallados()
+    try:
+        ciclo_id = leer_ciclo_id()
+    except ValueError:
+        return jsonify({"error": "ciclo_id debe ser un entero"}), 400
+    result, status_code = PermisoService.get_all_permisos_detallados(
+        estado_permiso=request.args.get('estado_permiso'),
+        ciclo_id=ciclo_id,
+        limite=request.args.get('limite'),
+        cursor=request.args.get('cursor')
+    )
     return jsonify(result), status_code
 
+@permiso_bp.route('/detallados/export', methods=['GET'])
+def exportar_permisos_detallados():
+    """
+    Exporta los permisos detallados (mismo formato que /detallados), en streaming (NDJSON o CSV) para archivos grandes
+
+    Query params:
+    - formato: ndjson (por defecto) o csv
+    - ciclo_id: solo los registros de ese ciclo (opcional)
+    - estado_permiso: PENDIENTE, APROBADO o RECHAZADO (opcional)
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({"error": "formato debe ser ndjson o csv"}), 400
+    try:
+        ciclo_id = leer_ciclo_id()
+    except ValueError:
+        return jsonify({"error": "ciclo_id debe ser un entero"}), 400
+    estado_permiso = request.args.get('estado_permiso')
+    if estado_permiso is not None:
+        estado_permiso = estado_permiso.upper()
+        if estado_permiso not in ESTADOS_PERMISO:
+            return jsonify({"error": f"Estado inválido. Debe ser uno de: {', '.join(ESTADOS_PERMISO)}"}), 400
+    return respuesta_exportacion(
+        PermisoService.exportar_permisos_detallados(ciclo_id=ciclo_id, estado_permiso=estado_permiso),
+        formato, 'permisos'
+    )
+
 @permiso_bp.route('/active', methods=['GET'])
 def get_active_permisos():
     """
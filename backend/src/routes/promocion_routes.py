@@ -3,6 +3,7 @@ from werkzeug.utils import secure_filename
 from uuid import uuid4
 import os
 from src.services.promocion_service import PromocionService
+from src.cache import cache_respuesta
 
 promocion_bp = Blueprint('promocion', __name__, url_prefix='/promociones')
 
@@ -18,6 +19,7 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 @promocion_bp.route('/', methods=['GET'])
+@cache_respuesta('promocion')
 def get_all_promociones():
     """
     Obtiene todas las promociones
@@ -34,6 +36,7 @@ def get_promocion_by_id(promocion_id):
     return jsonify(result), status_code
 
 @promocion_bp.route('/activas', methods=['GET'])
+@cache_respuesta('promocion')
 def get_active_promociones():
     """
     Obtiene todas las promociones activas
@@ -42,6 +45,7 @@ def get_active_promociones():
     return jsonify(result), status_code
 
 @promocion_bp.route('/vigentes', methods=['GET'])
+@cache_respuesta('promocion')
 def get_vigentes_promociones():
     """
     Obtiene todas las promociones vigentes (dentro del rango de fechas)
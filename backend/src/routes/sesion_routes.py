@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify
 from src.services.horario_sesion_service import HorarioSesionService
+from src.cache import cache_respuesta, tags_de_tablas
 from datetime import datetime, timedelta
 
 sesion_bp = Blueprint('sesion', __name__)
 
 @sesion_bp.route('/agenda', methods=['GET'])
+@cache_respuesta(*tags_de_tablas('HorarioSesion', 'Horario', 'Oferta', 'ciclo', 'Estilo', 'Profesor',
+                                  'Persona', 'Sala', 'Paquete', 'PronosticoAsistencia'))
 def get_agenda_semanal():
     """
     Obtiene todas las sesiones activas en un rango de fechas
@@ -37,8 +37,15 @@ def get_all_personas():
     - estado
     - tipo_cuenta
     - temporal
+
+    Query params opcionales (paginación por keyset):
+    - limite: cantidad de registros por página
+    - cursor: valor de siguiente_cursor de la página anterior
+    Sin ellos se devuelve la lista completa.
     """
-    result, status_code = PersonaService.get_all_personas()
+    limite = request.args.get('limite')
+    cursor = request.args.get('cursor')
+    result, status_code = PersonaService.get_all_personas(limite=limite, cursor=cursor)
     return jsonify(result), status_code
 
 @user_bp.route('/personas/<int:persona_id>', methods=['PUT'])
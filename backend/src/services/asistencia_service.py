@@ -2,30 +2,61 @@ from datetime import datetime
 from src.repositories.asistencia_repository import AsistenciaRepository
 from src.repositories.inscripcion_repository import InscripcionRepository
 from src.repositories.horario_sesion_repository import HorarioSesionRepository
+from src.repositories.horario_repository import HorarioRepository
+from src.repositories.paginacion import leer_parametros, respuesta_pagina, ParametrosPaginacionInvalidos
 from src.app import db
 
 
 class AsistenciaService:
     
     @staticmethod
-    def get_all_asistencias():
+    def get_all_asistencias(limite=None, cursor=None):
         """
-        Obtiene todas las asistencias
+        Obtiene todas las asistencias, o una página si se indica `limite` / `cursor`
         """
         try:
-            asistencias = AsistenciaRepository.get_all()
-            return [asistencia.to_dict() for asistencia in asistencias], 200
+            pagina = leer_parametros(limite, cursor)
+            if pagina is None:
+                asistencias = AsistenciaRepository.get_all()
+                return [asistencia.to_dict() for asistencia in asistencias], 200
+
+            limite, desde_id = pagina
+            asistencias, siguiente_id = AsistenciaRepository.get_pagina(limite, desde_id)
+            return respuesta_pagina([asistencia.to_dict() for asistencia in asistencias], siguiente_id, limite), 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error al obtener asistencias: {str(e)}"}, 500
 
+    @staticmethod
+    def exportar_asistencias(ciclo_id=None):
+        """
+        Generador de asistencias (con persona, sesión y clase) leídas en streaming
+        desde la base, para exportar sin cargar todo en memoria
+        """
+        for asistencia, persona, horario_sesion, horario, estilo in AsistenciaRepository.iter_para_exportar(ciclo_id=ciclo_id):
+            asistencia_dict = asistencia.to_dict()
+            asistencia_dict['persona'] = {
+                'id_persona': persona.id_persona,
+                'nombre': persona.nombre,
+                'apellido': persona.apellido
+            }
+            asistencia_dict['sesion'] = {
+                'fecha': horario_sesion.fecha.isoformat() if horario_sesion.fecha else None,
+                'hora_inicio': horario_sesion.hora_inicio.strftime('%H:%M') if horario_sesion.hora_inicio else None,
+                'nombre_estilo': estilo.nombre_estilo,
+                'nivel': horario.nivel
+            }
+            yield asistencia_dict
+
     @staticmethod
     def get_asistencias_activas():
         """
         Obtiene solo las asistencias activas (estado = True)
         """
         try:
-            asistencias = AsistenciaRepository.get_all()
-            asistencias_activas = [asistencia.to_dict() for asistencia in asistencias if asistencia.estado]
+            asistencias = AsistenciaRepository.get_active()
+            asistencias_activas = [asistencia.to_dict() for asistencia in asistencias]
             return asistencias_activas, 200
         except Exception as e:
             return {"error": f"Error al obtener asistencias activas: {str(e)}"}, 500
@@ -54,10 +85,9 @@ class AsistenciaService:
             if not inscripcion:
                 return {"error": "Inscripción no encontrada"}, 404
 
-            asistencias = AsistenciaRepository.get_all()
             asistencias_inscripcion = [
-                asistencia.to_dict() for asistencia in asistencias 
-                if asistencia.Inscripcion_id_inscripcion == inscripcion_id
+                asistencia.to_dict()
+                for asistencia in AsistenciaRepository.get_by_inscripcion(inscripcion_id, solo_activas=False)
             ]
             
             return {
@@ -79,10 +109,9 @@ class AsistenciaService:
             if not sesion:
                 return {"error": "Sesión no encontrada"}, 404
 
-            asistencias = AsistenciaRepository.get_all()
             asistencias_sesion = [
-                asistencia.to_dict() for asistencia in asistencias 
-                if asistencia.Horario_sesion_id_horario_sesion == sesion_id
+                asistencia.to_dict()
+                for asistencia in AsistenciaRepository.get_by_horario_sesion(sesion_id, solo_activas=False)
             ]
             
             return {
@@ -123,11 +152,10 @@ class AsistenciaService:
                 return {"error": "Sesión no encontrada"}, 404
 
             # Verificar que no existe ya una asistencia para esta inscripción y sesión
-            asistencias_existentes = AsistenciaRepository.get_all()
-            for asistencia in asistencias_existentes:
-                if (asistencia.Inscripcion_id_inscripcion == asistencia_data['Inscripcion_id_inscripcion'] and
-                    asistencia.Horario_sesion_id_horario_sesion == asistencia_data['Horario_sesion_id_horario_sesion']):
-                    return {"error": "Ya existe una asistencia para esta inscripción y sesión"}, 409
+            if AsistenciaRepository.existe_para_inscripcion_y_sesion(
+                    asistencia_data['Inscripcion_id_inscripcion'],
+                    asistencia_data['Horario_sesion_id_horario_sesion']):
+                return {"error": "Ya existe una asistencia para esta inscripción y sesión"}, 409
 
             # Valores por defecto
             asistencia_data.setdefault('estado', True)
@@ -136,6 +164,8 @@ class AsistenciaService:
 
             # Crear la asistencia
             asistencia = AsistenciaRepository.create(asistencia_data)
+            if asistencia.estado:
+                HorarioRepository.ajustar_inscritos({asistencia.Horario_sesion_id_horario_sesion: 1})
             db.session.commit()
             
             return {
@@ -167,8 +197,19 @@ class AsistenciaService:
                 if not sesion:
                     return {"error": "Sesión no encontrada"}, 404
 
+            sesion_anterior, estado_anterior = asistencia.Horario_sesion_id_horario_sesion, asistencia.estado
+
             # Actualizar la asistencia
             asistencia_actualizada = AsistenciaRepository.update(asistencia_id, asistencia_data)
+
+            # Mover o cancelar/reactivar la asistencia cambia los inscritos de los horarios
+            deltas = {}
+            if estado_anterior:
+                deltas[sesion_anterior] = deltas.get(sesion_anterior, 0) - 1
+            if asistencia_actualizada.estado:
+                sesion_nueva = asistencia_actualizada.Horario_sesion_id_horario_sesion
+                deltas[sesion_nueva] = deltas.get(sesion_nueva, 0) + 1
+            HorarioRepository.ajustar_inscritos(deltas)
             db.session.commit()
             
             return {
@@ -189,8 +230,12 @@ class AsistenciaService:
             if not asistencia:
                 return {"error": "Asistencia no encontrada"}, 404
 
+            estado_anterior = asistencia.estado
+
             # Borrado lógico
             asistencia_actualizada = AsistenciaRepository.update(asistencia_id, {'estado': False})
+            if estado_anterior:
+                HorarioRepository.ajustar_inscritos({asistencia_actualizada.Horario_sesion_id_horario_sesion: -1})
             db.session.commit()
             
             return {
@@ -204,13 +249,27 @@ class AsistenciaService:
     @staticmethod
     def marcar_asistencia(asistencia_id, asistio=True):
         """
-        Marca una asistencia como presente o ausente y registra la fecha
+        Marca una asistencia como presente o ausente y registra la fecha. Como el marcado
+        de la sesión completa, marcar presente consume una clase de la inscripción y
+        desmarcarla la devuelve (400 si no quedan clases).
         """
         try:
+            if not isinstance(asistio, bool):
+                return {"error": "La asistencia debe marcarse con true (presente) o false (ausente)"}, 400
+
             asistencia = AsistenciaRepository.get_by_id(asistencia_id)
             if not asistencia:
                 return {"error": "Asistencia no encontrada"}, 404
 
+            asistio_anterior = asistencia.asistio
+
+            # Consumir (o devolver) la clase igual que el marcado de la sesión completa
+            if asistencia.estado:
+                delta = int(asistio is True) - int(asistio_anterior is True)
+                if AsistenciaService._ajustar_clases({asistencia.Inscripcion_id_inscripcion: delta} if delta else {}):
+                    db.session.rollback()
+                    return {"error": "No hay clases disponibles"}, 400
+
             # Actualizar asistencia y fecha
             fecha_actual = datetime.now().date()
             update_data = {
@@ -219,6 +278,10 @@ class AsistenciaService:
             }
             
             asistencia_actualizada = AsistenciaRepository.update(asistencia_id, update_data)
+
+            from src.services.dashboard_service import DashboardService
+            DashboardService.snapshot_asistencia_marcada(asistencia_actualizada, asistio_anterior)
+
             db.session.commit()
             
             mensaje = "Asistencia marcada como presente" if asistio else "Asistencia marcada como ausente"
@@ -229,8 +292,95 @@ class AsistenciaService:
             }, 200
 
         except Exception as e:
+            db.session.rollback()
             return {"error": f"Error al marcar la asistencia: {str(e)}"}, 500
 
+    @staticmethod
+    def _ajustar_clases(deltas):
+        """
+        Aplica los deltas de clases de cada inscripción (ver InscripcionRepository.ajustar_clases_bulk)
+
+        Returns:
+            list: ids de las inscripciones que se quedarían sin clases (no se ajustó nada de ellas)
+        """
+        actualizadas = InscripcionRepository.ajustar_clases_bulk(deltas)
+        return sorted(set(deltas) - actualizadas)
+
+    @staticmethod
+    def marcar_asistencias_sesion(horario_sesion_id, marcas):
+        """
+        Marca presente/ausente todas las asistencias indicadas de una sesión en una
+        sola transacción (todo o nada)
+
+        Las asistencias se actualizan con un único UPDATE ... FROM (VALUES ...) y las
+        inscripciones afectadas con otro: clases_usadas suma (y clases_restantes resta)
+        la diferencia de presentes de cada inscripción, así que volver a marcar igual no
+        cambia nada y pasar de presente a ausente devuelve la clase. Si alguna inscripción
+        se quedaría con clases_restantes negativo no se marca nada (400).
+
+        Args:
+            horario_sesion_id: ID de la sesión
+            marcas: dict {id_asistencia: asistio} (las claves pueden venir como string)
+        """
+        try:
+            if not isinstance(marcas, dict) or not marcas:
+                return {"error": "Se requiere un objeto 'asistencias' con {id_asistencia: true/false}"}, 400
+            try:
+                marcas = {int(asistencia_id): asistio for asistencia_id, asistio in marcas.items()}
+            except (TypeError, ValueError):
+                return {"error": "Los IDs de asistencia deben ser enteros"}, 400
+            if not all(isinstance(asistio, bool) for asistio in marcas.values()):
+                return {"error": "Cada asistencia debe marcarse con true (presente) o false (ausente)"}, 400
+
+            if not HorarioSesionRepository.get_by_id(horario_sesion_id):
+                return {"error": "Sesión no encontrada"}, 404
+
+            actuales = AsistenciaRepository.get_para_marcar(horario_sesion_id, list(marcas))
+            if len(actuales) != len(marcas):
+                encontradas = {fila.id_asistencia for fila in actuales}
+                db.session.rollback()
+                return {
+                    "error": "Algunas asistencias no existen o no pertenecen a la sesión",
+                    "no_encontradas": sorted(set(marcas) - encontradas)
+                }, 404
+
+            # Diferencia de presentes por inscripción
+            deltas = {}
+            for fila in actuales:
+                delta = int(marcas[fila.id_asistencia]) - int(fila.asistio is True)
+                if delta:
+                    deltas[fila.Inscripcion_id_inscripcion] = deltas.get(fila.Inscripcion_id_inscripcion, 0) + delta
+            deltas = {inscripcion_id: delta for inscripcion_id, delta in deltas.items() if delta}
+
+            sin_clases = AsistenciaService._ajustar_clases(deltas)
+            if sin_clases:
+                db.session.rollback()
+                return {
+                    "error": "Algunas inscripciones no tienen clases disponibles",
+                    "inscripciones_sin_clases": sin_clases
+                }, 400
+
+            marcadas = AsistenciaRepository.marcar_bulk(marcas, datetime.now().date())
+
+            from src.services.dashboard_service import DashboardService
+            DashboardService.snapshot_asistencias_marcadas(horario_sesion_id, sum(deltas.values()))
+
+            db.session.commit()
+
+            presentes = sum(1 for asistio in marcas.values() if asistio)
+            return {
+                "message": "Asistencias marcadas exitosamente",
+                "horario_sesion_id": horario_sesion_id,
+                "marcadas": marcadas,
+                "presentes": presentes,
+                "ausentes": len(marcas) - presentes,
+                "clases_ajustadas": deltas
+            }, 200
+
+        except Exception as e:
+            db.session.rollback()
+            return {"error": f"Error al marcar las asistencias: {str(e)}"}, 500
+
     @staticmethod
     def get_estadisticas_asistencia(inscripcion_id):
         """
@@ -241,16 +391,12 @@ class AsistenciaService:
             if not inscripcion:
                 return {"error": "Inscripción no encontrada"}, 404
 
-            asistencias = AsistenciaRepository.get_all()
-            asistencias_inscripcion = [
-                asistencia for asistencia in asistencias 
-                if asistencia.Inscripcion_id_inscripcion == inscripcion_id and asistencia.estado
-            ]
+            conteos = AsistenciaRepository.get_estadisticas_by_inscripcion(inscripcion_id)
 
-            total_clases = len(asistencias_inscripcion)
-            clases_asistidas = len([a for a in asistencias_inscripcion if a.asistio == True])
-            clases_no_asistidas = len([a for a in asistencias_inscripcion if a.asistio == False])
-            clases_pendientes = len([a for a in asistencias_inscripcion if a.asistio is None])
+            total_clases = conteos['total']
+            clases_asistidas = conteos['asistidas']
+            clases_no_asistidas = conteos['no_asistidas']
+            clases_pendientes = conteos['pendientes']
 
             porcentaje_asistencia = (clases_asistidas / total_clases * 100) if total_clases > 0 else 0
 
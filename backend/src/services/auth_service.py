@@ -1,6 +1,7 @@
-from werkzeug.security import check_password_hash, generate_password_hash
-from src.models import Persona, Alumno, Profesor, Director, Elenco, AlumnoFemme
+from src.models import Persona
+from src.repositories.rol_repository import RolRepository, roles_por_persona_cache
 from src.app import db
+from src.auth import token_para_login, hashear_contrasena, verificar_contrasena
 
 class AuthService:
     @staticmethod
@@ -15,8 +16,18 @@ class AuthService:
             return {"error": "Credenciales inválidas"}, 401
         
         # Verificar la contraseña
-        if not check_password_hash(persona.password, password):
+        es_correcta, nuevo_hash = verificar_contrasena(persona.password, password)
+        if not es_correcta:
             return {"error": "Credenciales inválidas"}, 401
+
+        if nuevo_hash is not None:
+            # El hash es de otra política (PASSWORD_HASH_METHOD cambió): se reemplaza
+            # sin afectar el login si no se puede guardar
+            try:
+                persona.password = nuevo_hash
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
         
         # Determinar el rol del usuario
         user_role = AuthService._get_user_role(persona.id_persona)
@@ -24,7 +35,7 @@ class AuthService:
         if not user_role:
             return {"error": "Usuario sin rol asignado"}, 401
         
-        return {
+        respuesta = {
             "message": "Login exitoso",
             "user": {
                 "id": persona.id_persona,
@@ -36,87 +47,75 @@ class AuthService:
                 "role": user_role["role"],
                 "role_data": user_role["data"]
             }
-        }, 200
+        }
+
+        # Token firmado para que las rutas protegidas no vuelvan a resolver la identidad
+        token = token_para_login(persona.id_persona, user_role)
+        if token is not None:
+            respuesta["token"], respuesta["token_expira_en"] = token
+
+        return respuesta, 200
     
     @staticmethod
     def _get_user_role(persona_id):
         """
-        Determina el rol del usuario verificando en qué tabla de roles existe
+        Determina el rol del usuario con una sola consulta sobre las tablas de rol
+        (cacheado por persona, ver RolPersonaCache)
         """
-        # Verificar si es Alumno
-        alumno = Alumno.query.filter_by(Persona_id_persona=persona_id).first()
-        if alumno:
-            return {
-                "role": "alumno",
-                "data": {
-                    "id_alumno": alumno.id_alumno,
-                    "departamento": alumno.departamento,                      
-                    "estado": alumno.estado
-                }
+        return roles_por_persona_cache.get(persona_id, AuthService._resolver_rol)
+
+    @staticmethod
+    def _resolver_rol(persona_id):
+        resultado = RolRepository.get_rol_by_persona(persona_id)
+        if resultado is None:
+            # Si no se encuentra en ninguna tabla de roles
+            return None
+        role, registro = resultado
+
+        if role == "alumno":
+            data = {
+                "id_alumno": registro.id_alumno,
+                "departamento": registro.departamento,
+                "estado": registro.estado
             }
-        
-        # Verificar si es AlumnoFemme
-        alumno_femme = AlumnoFemme.query.filter_by(Persona_id_persona=persona_id).first()
-        if alumno_femme:
-            return {
-                "role": "alumno_femme",
-                "data": {
-                    "id_alumno_femme": alumno_femme.id_alumno_femme,
-                    "departamento": alumno_femme.departamento,
-                    "cumpleanos": alumno_femme.cumpleanos.isoformat() if alumno_femme.cumpleanos else None,
-                    "signo": alumno_femme.signo,
-                    "estado": alumno_femme.estado
-                }
+        elif role == "alumno_femme":
+            data = {
+                "id_alumno_femme": registro.id_alumno_femme,
+                "departamento": registro.departamento,
+                "cumpleanos": registro.cumpleanos.isoformat() if registro.cumpleanos else None,
+                "signo": registro.signo,
+                "estado": registro.estado
             }
-        
-        # Verificar si es Profesor
-        profesor = Profesor.query.filter_by(Persona_id_persona=persona_id).first()
-        if profesor:
-            return {
-                "role": "profesor",
-                "data": {
-                    "id_profesor": profesor.id_profesor,
-                    "frase": profesor.frase,
-                    "descripcion": profesor.descripcion,
-                    "redes_sociales": profesor.redes_sociales,
-                    "cuidad": profesor.cuidad,  
-                    "experiencia": profesor.experiencia,
-                    "signo": profesor.signo,
-                    "musica": profesor.musica,
-                    "estilos": profesor.estilos,
-                    "estado": profesor.estado
-                }
+        elif role == "profesor":
+            data = {
+                "id_profesor": registro.id_profesor,
+                "frase": registro.frase,
+                "descripcion": registro.descripcion,
+                "redes_sociales": registro.redes_sociales,
+                "cuidad": registro.cuidad,
+                "experiencia": registro.experiencia,
+                "signo": registro.signo,
+                "musica": registro.musica,
+                "estilos": registro.estilos,
+                "estado": registro.estado
             }
-        
-        # Verificar si es Director
-        director = Director.query.filter_by(Persona_id_persona=persona_id).first()
-        if director:
-            return {
-                "role": "director",
-                "data": {
-                    "id_director": director.id_director,
-                     "departamento": director.departamento,
-                    "estado": director.estado
-                }
+        elif role == "director":
+            data = {
+                "id_director": registro.id_director,
+                "departamento": registro.departamento,
+                "estado": registro.estado
             }
-        
-        # Verificar si es Elenco
-        elenco = Elenco.query.filter_by(Persona_id_persona=persona_id).first()
-        if elenco:
-            return {
-                "role": "elenco",
-                "data": {
-                    "id_elenco": elenco.id_elenco,
-                    "departamento": elenco.departamento,
-                    "cumpleanos": elenco.cumpleanos.isoformat() if elenco.cumpleanos else None,
-                    "signo": elenco.signo,
-                    "instagram": elenco.instagram,
-                    "estado": elenco.estado
-                }
+        else:
+            data = {
+                "id_elenco": registro.id_elenco,
+                "departamento": registro.departamento,
+                "cumpleanos": registro.cumpleanos.isoformat() if registro.cumpleanos else None,
+                "signo": registro.signo,
+                "instagram": registro.instagram,
+                "estado": registro.estado
             }
-        
-        # Si no se encuentra en ninguna tabla de roles
-        return None
+
+        return {"role": role, "data": data}
     
     @staticmethod
     def change_password(persona_id, old_password, new_password):
@@ -138,7 +137,7 @@ class AuthService:
             return {"error": "Usuario no encontrado"}, 404
         
         # Verificar que la contraseña actual sea correcta
-        if not check_password_hash(persona.password, old_password):
+        if not verificar_contrasena(persona.password, old_password)[0]:
             return {"error": "La contraseña actual es incorrecta"}, 401
         
         # Validar que la nueva contraseña no esté vacía
@@ -146,7 +145,7 @@ class AuthService:
             return {"error": "La nueva contraseña no puede estar vacía"}, 400
         
         # Cifrar la nueva contraseña
-        hashed_new_password = generate_password_hash(new_password)
+        hashed_new_password = hashear_contrasena(new_password)
         
         # Actualizar la contraseña
         persona.password = hashed_new_password
@@ -1,4 +1,9 @@
+from datetime import datetime
+from flask import current_app
+from src.app import db
+from src.models.ciclo import Ciclo
 from src.repositories.dashboard_repository import DashboardRepository
+from src.repositories.dashboard_snapshot_repository import DashboardSnapshotRepository
 
 
 class DashboardService:
@@ -7,9 +12,66 @@ class DashboardService:
     
     def get_estadisticas_generales_ciclo(self, id_ciclo):
         """
-        Servicio para obtener estadísticas generales de un ciclo
-        """
-        return self.repository.get_estadisticas_generales_ciclo(id_ciclo)
+        Servicio para obtener estadísticas generales de un ciclo.
+        Lee del snapshot DashboardCiclo y solo lo reconstruye si no existe,
+        si superó DASHBOARD_SNAPSHOT_MAX_AGE o si cambió el mes de ingresos.
+        """
+        ciclo = Ciclo.query.get(id_ciclo)
+        if not ciclo:
+            return None
+        
+        snapshot = DashboardSnapshotRepository.get_by_ciclo(id_ciclo)
+        if self._snapshot_vencido(snapshot):
+            try:
+                snapshot = DashboardSnapshotRepository.reconstruir(id_ciclo)
+                db.session.commit()
+            except Exception:
+                # Otro worker pudo haberlo insertado a la vez: responder en vivo
+                db.session.rollback()
+                return self.repository.get_estadisticas_generales_ciclo(id_ciclo)
+        
+        resultado = {
+            'ciclo': DashboardRepository.ciclo_to_dict(ciclo),
+            'kpis': snapshot.to_dict(),
+            'actualizado_en': snapshot.fecha_actualizacion.isoformat()
+        }
+        return resultado
+    
+    def refrescar_estadisticas_generales_ciclo(self, id_ciclo):
+        """
+        Fuerza la reconstrucción del snapshot de un ciclo
+        """
+        ciclo = Ciclo.query.get(id_ciclo)
+        if not ciclo:
+            return None
+        
+        try:
+            snapshot = DashboardSnapshotRepository.reconstruir(id_ciclo)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        return {
+            'ciclo': DashboardRepository.ciclo_to_dict(ciclo),
+            'kpis': snapshot.to_dict(),
+            'actualizado_en': snapshot.fecha_actualizacion.isoformat()
+        }
+    
+    @staticmethod
+    def _snapshot_vencido(snapshot):
+        """
+        Indica si el snapshot debe reconstruirse antes de servirlo
+        """
+        if snapshot is None:
+            return True
+        
+        ahora = datetime.now()
+        if snapshot.mes_ingresos != ahora.month or snapshot.anio_ingresos != ahora.year:
+            return True
+        
+        max_age = current_app.config.get('DASHBOARD_SNAPSHOT_MAX_AGE', 300)
+        return (ahora - snapshot.fecha_actualizacion).total_seconds() > max_age
     
     def get_alumnas_por_estilo(self, id_ciclo):
         """
@@ -58,3 +120,109 @@ class DashboardService:
         Servicio para obtener alumnos nuevos vs recurrentes
         """
         return self.repository.get_alumnos_nuevos_vs_recurrentes(id_ciclo)
+    
+    # ------------------------------------------------------------------
+    # Actualización incremental del snapshot DashboardCiclo.
+    # Se llaman dentro de la transacción de la escritura (antes del commit)
+    # y usan un savepoint: si fallan se registra el error, la escritura principal
+    # no se pierde y el snapshot se reconstruye en la siguiente lectura por antigüedad.
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def snapshot_inscripcion_creada(inscripcion, total_asistencias, pagos):
+        """
+        Suma la nueva inscripción al snapshot de su ciclo
+        """
+        try:
+            with db.session.begin_nested():
+                id_ciclo = DashboardSnapshotRepository.get_ciclo_id_by_inscripcion(inscripcion.id_inscripcion)
+                if id_ciclo is None or DashboardSnapshotRepository.get_by_ciclo(id_ciclo) is None:
+                    return
+                
+                nueva_alumna = (
+                    inscripcion.estado == 'ACTIVO' and
+                    DashboardSnapshotRepository.es_alumna_nueva_en_ciclo(
+                        id_ciclo, inscripcion.Persona_id_persona, inscripcion.id_inscripcion
+                    )
+                )
+                DashboardSnapshotRepository.incrementar(id_ciclo, {
+                    'total_alumnas': 1 if nueva_alumna else 0,
+                    'asistencias_registradas': total_asistencias,
+                    'ingresos_mes_actual': DashboardService._ingresos_del_mes(pagos)
+                })
+                if total_asistencias:
+                    DashboardSnapshotRepository.actualizar_ocupacion(id_ciclo)
+        except Exception:
+            current_app.logger.exception(
+                'No se pudo actualizar el snapshot del dashboard (inscripción %s)', inscripcion.id_inscripcion
+            )
+    
+    @staticmethod
+    def snapshot_pago_confirmado(pago):
+        """
+        Suma el monto de un pago recién confirmado a los ingresos del mes del snapshot
+        """
+        try:
+            with db.session.begin_nested():
+                ingresos = DashboardService._ingresos_del_mes([pago])
+                if not ingresos:
+                    return
+                id_ciclo = DashboardSnapshotRepository.get_ciclo_id_by_inscripcion(pago.Inscripcion_id_inscripcion)
+                if id_ciclo is not None:
+                    DashboardSnapshotRepository.incrementar(id_ciclo, {'ingresos_mes_actual': ingresos})
+        except Exception:
+            current_app.logger.exception(
+                'No se pudo actualizar el snapshot del dashboard (pago %s)', pago.id_pago
+            )
+    
+    @staticmethod
+    def snapshot_asistencia_marcada(asistencia, asistio_anterior):
+        """
+        Ajusta el contador de presentes según el cambio de asistio de un registro
+        """
+        try:
+            with db.session.begin_nested():
+                if not asistencia.estado:
+                    return
+                delta = int(asistencia.asistio is True) - int(asistio_anterior is True)
+                if not delta:
+                    return
+                id_ciclo = DashboardSnapshotRepository.get_ciclo_id_by_horario_sesion(
+                    asistencia.Horario_sesion_id_horario_sesion
+                )
+                if id_ciclo is not None:
+                    DashboardSnapshotRepository.incrementar(id_ciclo, {'asistencias_presentes': delta})
+        except Exception:
+            current_app.logger.exception(
+                'No se pudo actualizar el snapshot del dashboard (asistencia %s)', asistencia.id_asistencia
+            )
+    
+    @staticmethod
+    def snapshot_asistencias_marcadas(horario_sesion_id, delta):
+        """
+        Ajusta el contador de presentes por el marcado masivo de una sesión
+        (delta = presentes nuevos - presentes anteriores)
+        """
+        try:
+            with db.session.begin_nested():
+                if not delta:
+                    return
+                id_ciclo = DashboardSnapshotRepository.get_ciclo_id_by_horario_sesion(horario_sesion_id)
+                if id_ciclo is not None:
+                    DashboardSnapshotRepository.incrementar(id_ciclo, {'asistencias_presentes': delta})
+        except Exception:
+            current_app.logger.exception(
+                'No se pudo actualizar el snapshot del dashboard (sesión %s)', horario_sesion_id
+            )
+
+    @staticmethod
+    def _ingresos_del_mes(pagos):
+        """
+        Suma de montos CONFIRMADOS cuya fecha_pago cae en el mes actual
+        """
+        ahora = datetime.now()
+        return sum(
+            float(p.monto) for p in pagos
+            if p.estado == 'CONFIRMADO' and p.fecha_pago is not None
+            and p.fecha_pago.month == ahora.month and p.fecha_pago.year == ahora.year
+        )
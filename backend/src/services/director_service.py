@@ -1,4 +1,5 @@
-from werkzeug.security import generate_password_hash
+from src.auth import hashear_contrasena
+from src.repositories.rol_repository import RolRepository
 from src.models import Persona, Director
 from src.app import db
 from datetime import datetime
@@ -21,7 +22,7 @@ class DirectorService:
                 apellido=director_data['apellido'],
                 email=director_data['email'],
                 celular=director_data.get('celular'),
-                password=generate_password_hash(director_data['password']),
+                password=hashear_contrasena(director_data['password']),
                 fecha_creacion=datetime.now(),
                 solicitud_user_especial=True  # Los directores son usuarios especiales
             )
@@ -38,6 +39,8 @@ class DirectorService:
             
             db.session.add(nuevo_director)
             db.session.commit()
+            # El rol cacheado para login ya no es válido
+            RolRepository.invalidar(nueva_persona.id_persona)
             
             return {
                 "message": "Director creado exitosamente",
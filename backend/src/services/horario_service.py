@@ -1,8 +1,14 @@
 from src.repositories.horario_repository import HorarioRepository
 from src.repositories.oferta_repository import OfertaRepository
+from src.repositories.horario_sesion_repository import HorarioSesionRepository
 from src.models.horario_sesion import HorarioSesion
+from src.repositories.ejecucion_tarea_repository import EjecucionTareaRepository
 from src.app import db
 from datetime import datetime, timedelta
+import time
+
+# Nombre con el que se registran las reconciliaciones del contador en EjecucionTarea
+TAREA_RECONCILIAR_INSCRITOS = 'reconciliar-inscritos'
 
 class HorarioService:
     """paquetes
@@ -96,13 +102,51 @@ class HorarioService:
                 "message": "Horario creado exitosamente",
                 "horario": horario.to_dict(),
                 "sesiones_creadas": len(sesiones_creadas),
-                "sesiones": [s.to_dict() for s in sesiones_creadas[:5]]  # Primeras 5 como muestra
+                "sesiones": [HorarioSesion(**s).to_dict() for s in sesiones_creadas[:5]]  # Primeras 5 como muestra
             }, 201
 
         except Exception as e:
             db.session.rollback()
             return {"error": f"Error al crear horario: {str(e)}"}, 500
 
+    @staticmethod
+    def calcular_fechas_sesiones(dias, fecha_inicio, fecha_fin, repite_semanalmente=True):
+        """
+        Calcula las fechas de las sesiones sin recorrer el rango día por día
+
+        Para cada día seleccionado se salta directamente a su primera ocurrencia
+        en el rango y desde allí se avanza de a una semana.
+
+        Args:
+            dias: Días seleccionados (1=Lunes ... 7=Domingo), lista o string "1,3,5"
+            fecha_inicio: Fecha de inicio del rango
+            fecha_fin: Fecha de fin del rango
+            repite_semanalmente: Si es False, solo la primera ocurrencia de cada día
+
+        Returns:
+            list: [(fecha, dia), ...] ordenada por fecha
+        """
+        # Como en el recorrido anterior, un número fuera de 1..7 no genera sesiones
+        if isinstance(dias, str):
+            dias_seleccionados = HorarioService._dias_de(dias)
+        else:
+            dias_seleccionados = {int(d) for d in dias} & set(range(1, 8))
+
+        fechas = []
+        for dia in dias_seleccionados:
+            # weekday() retorna 0=Lunes, 6=Domingo; nuestro formato es 1=Lunes, 7=Domingo
+            fecha = fecha_inicio + timedelta(days=(dia - 1 - fecha_inicio.weekday()) % 7)
+            if not repite_semanalmente:
+                if fecha <= fecha_fin:
+                    fechas.append((fecha, dia))
+                continue
+            while fecha <= fecha_fin:
+                fechas.append((fecha, dia))
+                fecha += timedelta(weeks=1)
+
+        fechas.sort()
+        return fechas
+
     @staticmethod
     def _generar_sesiones(horario, fecha_inicio, fecha_fin, hora_inicio_str, hora_fin_str, repite_semanalmente=True):
         """
@@ -125,79 +169,118 @@ class HorarioService:
             - Taller/Intensivo (repite_semanalmente=False):
               Fechas: 1-2 nov, Días: [6,7] (Sábado, Domingo)
               Genera: 1 nov (Sábado), 2 nov (Domingo) (solo una vez cada día)
+
+        Las sesiones se escriben con un único INSERT multi-fila (ver
+        HorarioSesionRepository.create_bulk), sin objetos ORM por sesión.
+
+        Returns:
+            list: dicts con las columnas de cada sesión creada (incluido su id)
+        """
+        fechas = HorarioService.calcular_fechas_sesiones(
+            horario.dias, fecha_inicio, fecha_fin, repite_semanalmente
+        )
+        hora_inicio, hora_fin, duracion = HorarioService._parsear_horas(hora_inicio_str, hora_fin_str)
+        return HorarioService._insertar_sesiones(horario, fechas, hora_inicio, hora_fin, duracion)
+
+    @staticmethod
+    def _parsear_horas(hora_inicio_str, hora_fin_str):
+        """
+        "HH:MM", "HH:MM" -> (time inicio, time fin, duración en horas)
         """
-        # Convertir string de días a lista: "1,3,5" -> [1, 3, 5]
-        dias_seleccionados = [int(d) for d in horario.dias.split(',')]
-        
-        # Calcular duración en horas
         hora_inicio = datetime.strptime(hora_inicio_str, "%H:%M")
         hora_fin = datetime.strptime(hora_fin_str, "%H:%M")
         duracion = (hora_fin - hora_inicio).total_seconds() / 3600
+        return hora_inicio.time(), hora_fin.time(), duracion
 
-        sesiones = []
-        fecha_actual = fecha_inicio
-
-        if repite_semanalmente:
-            # MODO RECURRENTE: Genera sesiones que se repiten semanalmente
-            # Ejemplo: Curso regular - Todos los martes de octubre
-            while fecha_actual <= fecha_fin:
-                # weekday() retorna 0=Lunes, 6=Domingo
-                # Convertimos a nuestro formato: 1=Lunes, 7=Domingo
-                dia_semana = fecha_actual.weekday() + 1
-
-                if dia_semana in dias_seleccionados:
-                    sesion = HorarioSesion(
-                        Horario_id_horario=horario.id_horario,
-                        dia=dia_semana,
-                        hora_inicio=hora_inicio_str,
-                        hora_fin=hora_fin_str,
-                        duracion=duracion,
-                        fecha=fecha_actual,
-                        cancelado=False,
-                        motivo=None,
-                        estado=True,
-                        capacidad_maxima=horario.capacidad,  # ✅ Heredar capacidad del horario
-                        cupos_ocupados=0  # ✅ Inicializar en 0
-                    )
-                    db.session.add(sesion)
-                    sesiones.append(sesion)
+    @staticmethod
+    def _insertar_sesiones(horario, fechas, hora_inicio, hora_fin, duracion):
+        """
+        Inserta las sesiones de `fechas` ([(fecha, dia), ...]) con un único INSERT
 
-                fecha_actual += timedelta(days=1)
-        else:
-            # MODO ÚNICO: Genera sesiones solo una vez por cada día seleccionado
-            # Ejemplo: Taller intensivo - Solo sábado 1 nov y domingo 2 nov
-            dias_ya_creados = set()  # Para evitar duplicados
-            
-            while fecha_actual <= fecha_fin:
-                dia_semana = fecha_actual.weekday() + 1
-
-                # Solo crea la sesión si el día está seleccionado Y no se ha creado antes
-                if dia_semana in dias_seleccionados and dia_semana not in dias_ya_creados:
-                    sesion = HorarioSesion(
-                        Horario_id_horario=horario.id_horario,
-                        dia=dia_semana,
-                        hora_inicio=hora_inicio_str,
-                        hora_fin=hora_fin_str,
-                        duracion=duracion,
-                        fecha=fecha_actual,
-                        cancelado=False,
-                        motivo=None,
-                        estado=True,
-                        capacidad_maxima=horario.capacidad,  # ✅ Heredar capacidad del horario
-                        cupos_ocupados=0  # ✅ Inicializar en 0
-                    )
-                    db.session.add(sesion)
-                    sesiones.append(sesion)
-                    dias_ya_creados.add(dia_semana)  # Marcar como creado
+        Returns:
+            list: dicts con las columnas de cada sesión creada (incluido su id)
+        """
+        sesiones = [
+            {
+                'Horario_id_horario': horario.id_horario,
+                'dia': dia,
+                'hora_inicio': hora_inicio,
+                'hora_fin': hora_fin,
+                'duracion': duracion,
+                'fecha': fecha,
+                'cancelado': False,
+                'motivo': None,
+                'estado': True,
+                'capacidad_maxima': horario.capacidad,  # Hereda la capacidad del horario
+                'cupos_ocupados': 0
+            }
+            for fecha, dia in fechas
+        ]
+        ids_por_fecha = HorarioSesionRepository.create_bulk(sesiones)
+        for sesion in sesiones:
+            sesion['id_horario_sesion'] = ids_por_fecha[sesion['fecha']]
+        return sesiones
 
-                fecha_actual += timedelta(days=1)
+    @staticmethod
+    def previsualizar_sesiones(datos):
+        """
+        Calcula las sesiones que generaría un horario sin escribir en la base de datos
 
-        return sesiones
+        Body esperado: oferta_id, dias, hora_inicio, hora_fin. Opcionalmente
+        fecha_inicio, fecha_fin (YYYY-MM-DD) y repite_semanalmente para probar
+        un rango distinto al de la oferta.
+        """
+        try:
+            required_fields = ['oferta_id', 'dias', 'hora_inicio', 'hora_fin']
+            if not all(field in datos for field in required_fields):
+                return {"error": "Faltan campos requeridos"}, 400
+
+            oferta = OfertaRepository.get_by_id(datos['oferta_id'])
+            if not oferta:
+                return {"error": "Oferta no encontrada"}, 404
+
+            try:
+                dias = datos['dias']
+                if isinstance(dias, str):
+                    dias = [d for d in dias.split(',') if d.strip()]
+                dias = [int(d) for d in dias]
+                hora_inicio = datetime.strptime(datos['hora_inicio'], "%H:%M")
+                hora_fin = datetime.strptime(datos['hora_fin'], "%H:%M")
+                fecha_inicio = (datetime.strptime(datos['fecha_inicio'], "%Y-%m-%d").date()
+                                if datos.get('fecha_inicio') else oferta.fecha_inicio)
+                fecha_fin = (datetime.strptime(datos['fecha_fin'], "%Y-%m-%d").date()
+                             if datos.get('fecha_fin') else oferta.fecha_fin)
+            except (TypeError, ValueError):
+                return {"error": "Formato inválido: dias enteros, horas HH:MM y fechas YYYY-MM-DD"}, 400
+
+            if not dias or any(dia < 1 or dia > 7 for dia in dias):
+                return {"error": "Los días deben estar entre 1 (Lunes) y 7 (Domingo)"}, 400
+            if hora_fin <= hora_inicio:
+                return {"error": "hora_fin debe ser posterior a hora_inicio"}, 400
+
+            repite_semanalmente = datos.get('repite_semanalmente', oferta.repite_semanalmente)
+            fechas = HorarioService.calcular_fechas_sesiones(dias, fecha_inicio, fecha_fin, repite_semanalmente)
+
+            return {
+                "fecha_inicio": fecha_inicio.isoformat(),
+                "fecha_fin": fecha_fin.isoformat(),
+                "repite_semanalmente": repite_semanalmente,
+                "duracion": (hora_fin - hora_inicio).total_seconds() / 3600,
+                "total_sesiones": len(fechas),
+                "sesiones": [{"fecha": fecha.isoformat(), "dia": dia} for fecha, dia in fechas]
+            }, 200
+
+        except Exception as e:
+            return {"error": f"Error al previsualizar sesiones: {str(e)}"}, 500
 
     @staticmethod
     def update_horario(horario_id, horario_data):
         """
-        Actualiza un horario existente y regenera sus sesiones si es necesario
+        Actualiza un horario existente y sincroniza sus sesiones si cambiaron días u horas
+
+        Las sesiones no se regeneran: solo se insertan las fechas de los días agregados,
+        se desactivan las de los días quitados y las horas se cambian en el lugar, así
+        que las sesiones que se mantienen conservan su id, asistencias y cupos.
         """
         try:
             # Verificar que el horario existe
@@ -210,53 +293,144 @@ class HorarioService:
                 horario_data['dias'] = ','.join(map(str, horario_data['dias']))
 
             # Verificar si se actualizaron campos que afectan las sesiones
-            regenerar_sesiones = any(key in horario_data for key in ['dias', 'hora_inicio', 'hora_fin'])
+            sincronizar_sesiones = any(key in horario_data for key in ['dias', 'hora_inicio', 'hora_fin'])
+
+            # Estado anterior, para calcular la diferencia después de actualizar
+            dias_anteriores = HorarioService._dias_de(existing_horario.dias)
+            horas_anteriores = (existing_horario.hora_inicio, existing_horario.hora_fin)
 
             # Actualizar el horario
             horario = HorarioRepository.update(horario_id, horario_data)
 
-            # Si cambió días u horarios, regenerar sesiones
-            sesiones_regeneradas = 0
-            if regenerar_sesiones:
+            cambios = None
+            if sincronizar_sesiones:
                 # Obtener la oferta para las fechas
                 oferta = OfertaRepository.get_by_id(horario.Oferta_id_oferta)
-                
+
                 if oferta:
-                    # Eliminar sesiones existentes (lógicamente)
-                    HorarioService._eliminar_sesiones_horario(horario_id)
-                    
-                    # Regenerar sesiones con los nuevos datos
-                    sesiones = HorarioService._generar_sesiones(
-                        horario, 
-                        oferta.fecha_inicio, 
-                        oferta.fecha_fin,
-                        horario.hora_inicio.strftime('%H:%M'),
-                        horario.hora_fin.strftime('%H:%M'),
-                        oferta.repite_semanalmente
+                    cambios = HorarioService._sincronizar_sesiones(
+                        horario, oferta, dias_anteriores, horas_anteriores
                     )
-                    sesiones_regeneradas = len(sesiones)
 
             db.session.commit()
 
             return {
                 "message": "Horario actualizado exitosamente",
                 "horario": horario.to_dict(),
-                "sesiones_regeneradas": sesiones_regeneradas if regenerar_sesiones else 0
+                "sesiones_regeneradas": len(cambios['agregadas']) + len(cambios['reactivadas']) if cambios else 0,
+                "cambios_sesiones": cambios
             }, 200
 
         except Exception as e:
             db.session.rollback()
             return {"error": f"Error al actualizar horario: {str(e)}"}, 500
 
+    @staticmethod
+    def _dias_de(dias):
+        """
+        "1,3,5" -> {1, 3, 5} (ignora valores fuera de 1..7)
+        """
+        if not dias:
+            return set()
+        return {int(d) for d in dias.split(',') if d.strip()} & set(range(1, 8))
+
+    @staticmethod
+    def _sincronizar_sesiones(horario, oferta, dias_anteriores, horas_anteriores):
+        """
+        Aplica sobre las sesiones solo la diferencia entre el horario anterior y el actual
+
+        Los días de la semana son independientes entre sí (también en el modo no
+        recurrente, que toma la primera ocurrencia de cada día), así que la diferencia
+        se calcula por día y cada paso es una sola sentencia:
+
+        - días quitados: UPDATE ... SET estado = false de sus sesiones
+        - horas distintas: UPDATE ... SET hora_inicio, hora_fin, duracion de las activas
+        - días agregados: se reactiva la sesión anterior de cada fecha si existe
+          (conserva asistencias y permisos) y el resto se inserta con un único INSERT
+
+        Returns:
+            dict: fechas agregadas, reactivadas y eliminadas, y cantidad de sesiones
+                  con horas actualizadas
+        """
+        dias_nuevos = HorarioService._dias_de(horario.dias)
+        dias_quitados = dias_anteriores - dias_nuevos
+        dias_agregados = dias_nuevos - dias_anteriores
+
+        hora_inicio, hora_fin = horario.hora_inicio, horario.hora_fin
+        duracion = (datetime.combine(oferta.fecha_inicio, hora_fin)
+                    - datetime.combine(oferta.fecha_inicio, hora_inicio)).total_seconds() / 3600
+
+        eliminadas = HorarioSesionRepository.desactivar_dias(horario.id_horario, dias_quitados)
+
+        horas_actualizadas = 0
+        if (hora_inicio, hora_fin) != horas_anteriores:
+            horas_actualizadas = HorarioSesionRepository.actualizar_horas(
+                horario.id_horario, hora_inicio, hora_fin, duracion
+            )
+
+        fechas = HorarioService.calcular_fechas_sesiones(
+            dias_agregados, oferta.fecha_inicio, oferta.fecha_fin, oferta.repite_semanalmente
+        )
+        reactivadas = HorarioSesionRepository.reactivar_fechas(
+            horario.id_horario, [fecha for fecha, _ in fechas], hora_inicio, hora_fin, duracion
+        )
+        pendientes = set(fechas) - {(fecha, fecha.weekday() + 1) for fecha in reactivadas}
+        agregadas = HorarioService._insertar_sesiones(
+            horario, sorted(pendientes), hora_inicio, hora_fin, duracion
+        )
+        if eliminadas or reactivadas:
+            # Las asistencias de las sesiones desactivadas/reactivadas dejan de contar / vuelven a contar
+            HorarioRepository.recalcular_inscritos([horario.id_horario])
+
+        return {
+            "agregadas": [s['fecha'].isoformat() for s in agregadas],
+            "reactivadas": [fecha.isoformat() for fecha in reactivadas],
+            "eliminadas": [fecha.isoformat() for fecha in eliminadas],
+            "horas_actualizadas": horas_actualizadas
+        }
+
     @staticmethod
     def _eliminar_sesiones_horario(horario_id):
         """
         Elimina (lógicamente) todas las sesiones de un horario
         """
-        sesiones = HorarioSesion.query.filter_by(Horario_id_horario=horario_id).all()
-        for sesion in sesiones:
-            sesion.estado = False
-        # No hacemos commit aquí, se hace en el método que llama
+        # Un único UPDATE; no hacemos commit aquí, se hace en el método que llama
+        return HorarioSesionRepository.desactivar_by_horario(horario_id)
+
+    @staticmethod
+    def reconciliar_inscritos(horario_id=None):
+        """
+        Reconstruye desde Asistencia el contador total_inscritos de un horario (o de
+        todos) y registra la corrida en EjecucionTarea. Lo usa `flask reconciliar-inscritos`.
+        """
+        inicio = datetime.now()
+        t0 = time.perf_counter()
+        try:
+            corregidos = HorarioRepository.recalcular_inscritos(
+                [horario_id] if horario_id is not None else None
+            )
+            db.session.commit()
+            error = None
+        except Exception as e:
+            db.session.rollback()
+            corregidos = 0
+            error = str(e)
+        duracion_ms = (time.perf_counter() - t0) * 1000
+
+        try:
+            EjecucionTareaRepository.registrar(TAREA_RECONCILIAR_INSCRITOS, inicio, duracion_ms, corregidos,
+                                               exito=error is None, detalle=error)
+        except Exception:
+            pass
+
+        if error is not None:
+            return {"error": f"Error al reconciliar inscritos: {error}"}, 500
+        return {
+            "tarea": TAREA_RECONCILIAR_INSCRITOS,
+            "inicio": inicio.isoformat(),
+            "duracion_ms": round(duracion_ms, 2),
+            "horarios_corregidos": corregidos
+        }, 200
 
     @staticmethod
     def delete_horario(horario_id):
@@ -7,6 +7,8 @@ from src.repositories.oferta_repository import OfertaRepository
 from src.repositories.ciclo_repository import CicloRepository
 from src.repositories.subcategoria_repository import SubcategoriaRepository
 from src.repositories.persona_repository import PersonaRepository
+from src.repositories.pronostico_asistencia_repository import PronosticoAsistenciaRepository
+from src.app import db
 from datetime import datetime
 
 class HorarioSesionService:
@@ -164,7 +166,14 @@ class HorarioSesionService:
                 duracion = (fin - inicio).total_seconds() / 3600
                 sesion_data['duracion'] = duracion
 
+            estado_anterior = existing_sesion.estado
+            horario_anterior = existing_sesion.Horario_id_horario
             sesion = HorarioSesionRepository.update(sesion_id, sesion_data)
+            if sesion.estado != estado_anterior or sesion.Horario_id_horario != horario_anterior:
+                # Desactivar/reactivar la sesión o moverla a otro horario cambia cuántas asistencias
+                # cuentan como inscritos en el horario anterior y en el nuevo
+                HorarioRepository.recalcular_inscritos({horario_anterior, sesion.Horario_id_horario})
+                db.session.commit()
             return {
                 "message": "Sesión actualizada exitosamente",
                 "sesion": sesion.to_dict()
@@ -183,6 +192,9 @@ class HorarioSesionService:
             if not sesion:
                 return {"error": "Sesión no encontrada"}, 404
 
+            HorarioRepository.recalcular_inscritos([sesion.Horario_id_horario])
+            db.session.commit()
+
             return {"message": "Sesión eliminada exitosamente"}, 200
 
         except Exception as e:
@@ -199,6 +211,11 @@ class HorarioSesionService:
             
             sesiones_data = HorarioSesionRepository.get_sesiones_agenda(fecha_desde, fecha_hasta)
             
+            # Pronósticos precalculados por el job pronosticar-asistencias (una sola consulta)
+            pronosticos = PronosticoAsistenciaRepository.get_by_sesiones(
+                [item['sesion_data'][0].id_horario_sesion for item in sesiones_data]
+            )
+            
             result = []
             for item in sesiones_data:
                 sesion_tuple = item['sesion_data']
@@ -282,18 +299,12 @@ class HorarioSesionService:
                         "departamento": sala.departamento
                     },
                     
-                    # Paquetes disponibles de la oferta
-                    "paquetes": [
-                        {
-                            "id_paquete": paquete.id_paquete,
-                            "nombre": paquete.nombre,
-                            "cantidad_clases": paquete.cantidad_clases,
-                            "dias_validez": paquete.dias_validez,
-                            "ilimitado": paquete.ilimitado,
-                            "precio": float(paquete.precio)
-                        }
-                        for paquete in paquetes
-                    ]
+                    # Paquetes disponibles de la oferta (ya serializados y compartidos entre sesiones)
+                    "paquetes": [dict(paquete) for paquete in paquetes],
+                    
+                    # Asistencia pronosticada (None si la sesión aún no fue procesada)
+                    "pronostico": pronosticos[sesion.id_horario_sesion].to_dict()
+                    if sesion.id_horario_sesion in pronosticos else None
                 }
                 
                 result.append(sesion_data)
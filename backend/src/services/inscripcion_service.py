@@ -4,11 +4,18 @@ from src.repositories.paquete_repository import PaqueteRepository
 from src.repositories.promocion_repository import PromocionRepository
 from src.repositories.asistencia_repository import AsistenciaRepository
 from src.repositories.horario_sesion_repository import HorarioSesionRepository
+from src.repositories.horario_repository import HorarioRepository
 from src.repositories.pago_repository import PagoRepository
+from src.repositories.paginacion import leer_parametros, respuesta_pagina, ParametrosPaginacionInvalidos
+from src.repositories.ejecucion_tarea_repository import EjecucionTareaRepository
 from src.app import db
 from datetime import datetime, date, timedelta
 from sqlalchemy import text
 import math
+import time
+
+# Nombre con el que se registran las corridas del barrido en EjecucionTarea
+TAREA_VENCIMIENTOS = 'barrer-vencimientos'
 
 class InscripcionService:
     """
@@ -16,13 +23,21 @@ class InscripcionService:
     """
 
     @staticmethod
-    def get_all_inscripciones():
+    def get_all_inscripciones(limite=None, cursor=None):
         """
-        Obtiene todas las inscripciones
+        Obtiene todas las inscripciones, o una página si se indica `limite` / `cursor`
         """
         try:
-            inscripciones = InscripcionRepository.get_all()
-            return [inscripcion.to_dict() for inscripcion in inscripciones], 200
+            pagina = leer_parametros(limite, cursor)
+            if pagina is None:
+                inscripciones = InscripcionRepository.get_all()
+                return [inscripcion.to_dict() for inscripcion in inscripciones], 200
+
+            limite, desde_id = pagina
+            inscripciones, siguiente_id = InscripcionRepository.get_pagina(limite, desde_id)
+            return respuesta_pagina([inscripcion.to_dict() for inscripcion in inscripciones], siguiente_id, limite), 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error al obtener inscripciones: {str(e)}"}, 500
 
@@ -235,6 +250,8 @@ class InscripcionService:
             # Calcular fechas y monto/estado
             fecha_inscripcion = datetime.strptime(inscripcion_data['fecha_inscripcion'], '%Y-%m-%d').date()
             fecha_inicio = datetime.strptime(inscripcion_data['fecha_inicio'], '%Y-%m-%d').date()
+            inscripcion_data['fecha_inscripcion'] = fecha_inscripcion
+            inscripcion_data['fecha_inicio'] = fecha_inicio
             pago_a_cuotas = inscripcion_data.get('pago_a_cuotas', False)
 
             if len(clases_seleccionadas) == 1 or not pago_a_cuotas:
@@ -284,25 +301,36 @@ class InscripcionService:
             sesiones_info = []  # Para almacenar info de fecha y hora de las sesiones
             
             if clases_seleccionadas:
-                sesiones_sin_cupo = []
-                for horario_sesion_id in clases_seleccionadas:
-                    capacidad_info = HorarioSesionRepository.get_capacidad_info(horario_sesion_id)
-                    if not capacidad_info:
-                        return {"error": f"Sesión {horario_sesion_id} no encontrada"}, 404
-                    if capacidad_info['cupos_disponibles'] <= 0:
-                        sesiones_sin_cupo.append(horario_sesion_id)
-                    
-                    # Obtener información de la sesión (fecha y hora)
-                    sesion = HorarioSesionRepository.get_by_id(horario_sesion_id)
-                    if sesion:
-                        sesiones_info.append({
-                            'id': horario_sesion_id,
-                            'fecha': sesion.fecha,
-                            'hora_inicio': sesion.hora_inicio
-                        })
-                
+                if len(set(clases_seleccionadas)) != len(clases_seleccionadas):
+                    db.session.rollback()
+                    return {"error": "clases_seleccionadas contiene sesiones repetidas"}, 400
+
+                # Todas las sesiones seleccionadas en una sola consulta
+                info_sesiones = HorarioSesionRepository.get_info_sesiones(clases_seleccionadas)
+                no_encontradas = [s for s in clases_seleccionadas if s not in info_sesiones]
+                if no_encontradas:
+                    db.session.rollback()
+                    return {"error": f"Sesión {no_encontradas[0]} no encontrada"}, 404
+                sesiones_sin_cupo = [s for s in clases_seleccionadas if info_sesiones[s]['cupos_disponibles'] <= 0]
                 if sesiones_sin_cupo:
+                    db.session.rollback()
                     return {"error": "No hay cupos disponibles en las siguientes sesiones", "sesiones_sin_cupo": sesiones_sin_cupo}, 400
+
+                # Reserva atómica de un cupo por sesión (todo o nada); revalida el cupo en la BD
+                reserva = HorarioSesionRepository.reservar_cupos(clases_seleccionadas)
+                if reserva['sin_cupo'] or reserva['no_encontradas']:
+                    db.session.rollback()
+                    return {"error": "No hay cupos disponibles en las siguientes sesiones", "sesiones_sin_cupo": reserva['sin_cupo'] + reserva['no_encontradas']}, 400
+                cupos_actualizados = {'actualizadas': reserva['reservadas'], 'sin_cupo': []}
+
+                sesiones_info = [
+                    {
+                        'id': horario_sesion_id,
+                        'fecha': info_sesiones[horario_sesion_id]['fecha'],
+                        'hora_inicio': info_sesiones[horario_sesion_id]['hora_inicio']
+                    }
+                    for horario_sesion_id in clases_seleccionadas
+                ]
                 
                 asistencias_data = []
                 for horario_sesion_id in clases_seleccionadas:
@@ -315,7 +343,7 @@ class InscripcionService:
                     }
                     asistencias_data.append(asistencia_data)
                 asistencias_creadas = AsistenciaRepository.create_bulk(asistencias_data)
-                cupos_actualizados = HorarioSesionRepository.bulk_increment_cupos(clases_seleccionadas)
+                HorarioRepository.ajustar_inscritos({horario_sesion_id: 1 for horario_sesion_id in clases_seleccionadas})
 
             # Ordenar sesiones por fecha y hora
             sesiones_ordenadas = sorted(sesiones_info, key=lambda x: (x['fecha'], x['hora_inicio']))
@@ -388,6 +416,7 @@ class InscripcionService:
 
                 # Calcular fechas de vencimiento basadas en clases cubiertas por cada cuota
                 clase_index = 0  # Índice de la clase actual
+                pagos_data = []
                 
                 for idx_cuota in range(1, numero_cuotas + 1):
                     monto_cuota = montos_list[idx_cuota - 1]
@@ -426,11 +455,13 @@ class InscripcionService:
                         'observaciones': None,
                         'estado': estado_pago
                     }
-                    pago = PagoRepository.create(pago_data)
-                    pagos_creados.append(pago)
+                    pagos_data.append(pago_data)
                     
                     # Avanzar el índice de clases según las clases cubiertas
                     clase_index += clases_cubiertas
+
+                # Todas las cuotas en un solo INSERT
+                pagos_creados = PagoRepository.create_bulk(pagos_data)
             else:
                 # Pago único - usar la fecha de la primera clase o fecha_inscripcion
                 if sesiones_ordenadas:
@@ -472,16 +503,23 @@ class InscripcionService:
                 pago = PagoRepository.create(pago_data)
                 pagos_creados.append(pago)
 
+            from src.services.dashboard_service import DashboardService
+            DashboardService.snapshot_inscripcion_creada(inscripcion, len(asistencias_creadas), pagos_creados)
+
+            # Serializar antes del commit: después cada objeto expirado se recargaría con un SELECT propio
+            clases_programadas = [a.to_dict() for a in asistencias_creadas]
+            pagos_programados = [p.to_dict() for p in pagos_creados]
+
             db.session.commit()
 
             return {
                 'message': 'Inscripción creada exitosamente',
                 'inscripcion': inscripcion.to_dict(),
                 'asistencias_creadas': len(asistencias_creadas),
-                'clases_programadas': [a.to_dict() for a in asistencias_creadas],
+                'clases_programadas': clases_programadas,
                 'cupos_actualizados': cupos_actualizados,
                 'pagos_creados': len(pagos_creados),
-                'pagos_programados': [p.to_dict() for p in pagos_creados]
+                'pagos_programados': pagos_programados
             }, 201
 
         except Exception as e:
@@ -618,33 +656,49 @@ class InscripcionService:
     def verificar_y_actualizar_vencimientos():
         """
         Verifica inscripciones con pagos vencidos y actualiza estados
+
+        Returns:
+            int: cantidad de inscripciones suspendidas (0 si la corrida falló)
         """
+        resultado, status = InscripcionService.barrer_vencimientos()
+        return resultado['cantidad'] if status == 200 else 0
+
+    @staticmethod
+    def barrer_vencimientos():
+        """
+        Suspende (estado SUSPENDIDO, estado_pago VENCIDO) las inscripciones activas con
+        pagos pendientes vencidos en una sola sentencia y registra la corrida (cantidad
+        y duración) en EjecucionTarea. Lo usan el endpoint /verificar-vencimientos y el
+        comando `flask barrer-vencimientos`.
+        """
+        inicio = datetime.now()
+        t0 = time.perf_counter()
         try:
-            from datetime import date
-            from src.repositories.pago_repository import PagoRepository
-            
-            # Obtener pagos vencidos
-            pagos_vencidos = PagoRepository.get_pagos_vencidos()
-            inscripciones_a_suspender = set()
-            
-            for pago in pagos_vencidos:
-                inscripciones_a_suspender.add(pago.Inscripcion_id_inscripcion)
-            
-            # Actualizar inscripciones a SUSPENDIDO
-            for inscripcion_id in inscripciones_a_suspender:
-                inscripcion = InscripcionRepository.get_by_id(inscripcion_id)
-                if inscripcion and inscripcion.estado == 'ACTIVO':
-                    InscripcionRepository.update(inscripcion_id, {
-                        'estado': 'SUSPENDIDO',
-                        'estado_pago': 'VENCIDO'
-                    })
-            
+            suspendidas = InscripcionRepository.suspender_por_pagos_vencidos(date.today())
             db.session.commit()
-            return len(inscripciones_a_suspender)
-            
+            error = None
         except Exception as e:
             db.session.rollback()
-            return 0
+            suspendidas = []
+            error = str(e)
+        duracion_ms = (time.perf_counter() - t0) * 1000
+
+        try:
+            EjecucionTareaRepository.registrar(TAREA_VENCIMIENTOS, inicio, duracion_ms, len(suspendidas),
+                                               exito=error is None, detalle=error)
+        except Exception:
+            # El registro es informativo: no debe ocultar el resultado del barrido
+            pass
+
+        if error is not None:
+            return {"error": f"Error al verificar vencimientos: {error}"}, 500
+        return {
+            "tarea": TAREA_VENCIMIENTOS,
+            "inicio": inicio.isoformat(),
+            "duracion_ms": round(duracion_ms, 2),
+            "cantidad": len(suspendidas),
+            "inscripciones_suspendidas": suspendidas
+        }, 200
 
     @staticmethod
     def get_inscripciones_vigentes():
@@ -682,90 +736,9 @@ class InscripcionService:
                 return {"inscripciones": [], "mensaje": "No hay inscripciones disponibles"}, 200
 
             # Formatear la respuesta con información completa
-            inscripciones_formateadas = []
-            for inscripcion, persona, paquete, promocion, oferta, ciclo, subcategoria, categoria, programa in inscripciones_completas:
-                inscripcion_dict = {
-                    "id_inscripcion": inscripcion.id_inscripcion,
-                    "fecha_inscripcion": inscripcion.fecha_inscripcion.isoformat() if inscripcion.fecha_inscripcion else None,
-                    "fecha_inicio": inscripcion.fecha_inicio.isoformat() if inscripcion.fecha_inicio else None,
-                    "fecha_fin": inscripcion.fecha_fin.isoformat() if inscripcion.fecha_fin else None,
-                    "precio_original": float(inscripcion.precio_original) if inscripcion.precio_original is not None else None,
-                    "descuento_aplicado": float(inscripcion.descuento_aplicado) if inscripcion.descuento_aplicado is not None else 0.0,
-                    "precio_final": float(inscripcion.precio_final) if inscripcion.precio_final is not None else None,
-                    "estado_pago": inscripcion.estado_pago,
-                    "clases_usadas": inscripcion.clases_usadas,
-                    "clases_restantes": inscripcion.clases_restantes,
-                    "pago_a_cuotas": inscripcion.pago_a_cuotas,
-                    "estado": inscripcion.estado,
-
-                    # Información completa de la persona
-                    "persona": {
-                        "id_persona": persona.id_persona,
-                        "nombre": persona.nombre,
-                        "apellido": persona.apellido,
-                        "email": persona.email,
-                        "celular": persona.celular,
-                        "estado": persona.estado
-                    } if persona else None,
-
-                    # Información completa del paquete
-                    "paquete": {
-                        "id_paquete": paquete.id_paquete,
-                        "nombre": paquete.nombre,
-                        "cantidad_clases": paquete.cantidad_clases,
-                        "dias_validez": paquete.dias_validez,
-                        "ilimitado": paquete.ilimitado,
-                        "precio": float(paquete.precio) if paquete.precio else None,
-                        "estado": paquete.estado
-                    } if paquete else None,
-
-                    # Información completa de la promoción (si existe)
-                    "promocion": {
-                        "id_promocion": promocion.id_promocion,
-                        "nombre_promocion": promocion.nombre_promocion,
-                        "descricpcion": promocion.descricpcion,
-                        "fecha_inicio": promocion.fecha_inicio.isoformat() if promocion.fecha_inicio else None,
-                        "fecha_fin": promocion.fecha_fin.isoformat() if promocion.fecha_fin else None,
-                        "porcentaje_descuento": float(promocion.porcentaje_descuento) if promocion.porcentaje_descuento is not None else None,
-                        "paquetes_especificos": promocion.paquetes_especificos,
-                        "aplica_nuevos_usuarios": promocion.aplica_nuevos_usuarios,
-                        "tiene_sorteo": promocion.tiene_sorteo,
-                        "cantidad_premios": promocion.cantidad_premios,
-                        "activo": promocion.activo,
-                        "estado": promocion.estado
-                    } if promocion else None,
-
-                    # Información completa de la oferta
-                    "oferta": {
-                        "id_oferta": oferta.id_oferta,
-                        "nombre_oferta": oferta.nombre_oferta,
-                        "descripcion": oferta.descripcion,
-                        "fecha_inicio": oferta.fecha_inicio.isoformat() if oferta.fecha_inicio else None,
-                        "fecha_fin": oferta.fecha_fin.isoformat() if oferta.fecha_fin else None,
-                        "estado": oferta.estado,
-                        "cantidad_cursos": oferta.cantidad_cursos,
-                        "publico_objetivo": oferta.publico_objetivo,
-                        "repite_semanalmente": oferta.repite_semanalmente,
-                        "ciclo": {
-                            "id_ciclo": ciclo.id_ciclo,
-                            "nombre_ciclo": ciclo.nombre
-                        } if ciclo else None,
-                        # Subcategoria, Categoria y Programa asociados a la oferta
-                        "subcategoria": {
-                            "id_subcategoria": subcategoria.id_subcategoria,
-                            "nombre_subcategoria": subcategoria.nombre_subcategoria
-                        } if subcategoria else None,
-                        "categoria": {
-                            "id_categoria": categoria.id_categoria,
-                            "nombre_categoria": categoria.nombre_categoria
-                        } if categoria else None,
-                        "programa": {
-                            "id_programa": programa.id_programa,
-                            "nombre_programa": programa.nombre_programa
-                        } if programa else None
-                    } if oferta else None
-                }
-                inscripciones_formateadas.append(inscripcion_dict)
+            inscripciones_formateadas = [
+                InscripcionService._inscripcion_completa_a_dict(fila) for fila in inscripciones_completas
+            ]
 
             return {
                 "inscripciones": inscripciones_formateadas,
@@ -773,4 +746,98 @@ class InscripcionService:
             }, 200
 
         except Exception as e:
-            return {"error": f"Error al obtener inscripciones completas: {str(e)}"}, 500
\ No newline at end of file
+            return {"error": f"Error al obtener inscripciones completas: {str(e)}"}, 500
+
+    @staticmethod
+    def exportar_inscripciones_completas(ciclo_id=None):
+        """
+        Generador de inscripciones completas (mismo formato que get_inscripciones_completas)
+        leídas en streaming desde la base, para exportar sin cargar todo en memoria
+        """
+        for fila in InscripcionRepository.iter_inscripciones_completas(ciclo_id=ciclo_id):
+            yield InscripcionService._inscripcion_completa_a_dict(fila)
+
+    @staticmethod
+    def _inscripcion_completa_a_dict(fila):
+        inscripcion, persona, paquete, promocion, oferta, ciclo, subcategoria, categoria, programa = fila
+        return {
+            "id_inscripcion": inscripcion.id_inscripcion,
+            "fecha_inscripcion": inscripcion.fecha_inscripcion.isoformat() if inscripcion.fecha_inscripcion else None,
+            "fecha_inicio": inscripcion.fecha_inicio.isoformat() if inscripcion.fecha_inicio else None,
+            "fecha_fin": inscripcion.fecha_fin.isoformat() if inscripcion.fecha_fin else None,
+            "precio_original": float(inscripcion.precio_original) if inscripcion.precio_original is not None else None,
+            "descuento_aplicado": float(inscripcion.descuento_aplicado) if inscripcion.descuento_aplicado is not None else 0.0,
+            "precio_final": float(inscripcion.precio_final) if inscripcion.precio_final is not None else None,
+            "estado_pago": inscripcion.estado_pago,
+            "clases_usadas": inscripcion.clases_usadas,
+            "clases_restantes": inscripcion.clases_restantes,
+            "pago_a_cuotas": inscripcion.pago_a_cuotas,
+            "estado": inscripcion.estado,
+
+            # Información completa de la persona
+            "persona": {
+                "id_persona": persona.id_persona,
+                "nombre": persona.nombre,
+                "apellido": persona.apellido,
+                "email": persona.email,
+                "celular": persona.celular,
+                "estado": persona.estado
+            } if persona else None,
+
+            # Información completa del paquete
+            "paquete": {
+                "id_paquete": paquete.id_paquete,
+                "nombre": paquete.nombre,
+                "cantidad_clases": paquete.cantidad_clases,
+                "dias_validez": paquete.dias_validez,
+                "ilimitado": paquete.ilimitado,
+                "precio": float(paquete.precio) if paquete.precio else None,
+                "estado": paquete.estado
+            } if paquete else None,
+
+            # Información completa de la promoción (si existe)
+            "promocion": {
+                "id_promocion": promocion.id_promocion,
+                "nombre_promocion": promocion.nombre_promocion,
+                "descricpcion": promocion.descricpcion,
+                "fecha_inicio": promocion.fecha_inicio.isoformat() if promocion.fecha_inicio else None,
+                "fecha_fin": promocion.fecha_fin.isoformat() if promocion.fecha_fin else None,
+                "porcentaje_descuento": float(promocion.porcentaje_descuento) if promocion.porcentaje_descuento is not None else None,
+                "paquetes_especificos": promocion.paquetes_especificos,
+                "aplica_nuevos_usuarios": promocion.aplica_nuevos_usuarios,
+                "tiene_sorteo": promocion.tiene_sorteo,
+                "cantidad_premios": promocion.cantidad_premios,
+                "activo": promocion.activo,
+                "estado": promocion.estado
+            } if promocion else None,
+
+            # Información completa de la oferta
+            "oferta": {
+                "id_oferta": oferta.id_oferta,
+                "nombre_oferta": oferta.nombre_oferta,
+                "descripcion": oferta.descripcion,
+                "fecha_inicio": oferta.fecha_inicio.isoformat() if oferta.fecha_inicio else None,
+                "fecha_fin": oferta.fecha_fin.isoformat() if oferta.fecha_fin else None,
+                "estado": oferta.estado,
+                "cantidad_cursos": oferta.cantidad_cursos,
+                "publico_objetivo": oferta.publico_objetivo,
+                "repite_semanalmente": oferta.repite_semanalmente,
+                "ciclo": {
+                    "id_ciclo": ciclo.id_ciclo,
+                    "nombre_ciclo": ciclo.nombre
+                } if ciclo else None,
+                # Subcategoria, Categoria y Programa asociados a la oferta
+                "subcategoria": {
+                    "id_subcategoria": subcategoria.id_subcategoria,
+                    "nombre_subcategoria": subcategoria.nombre_subcategoria
+                } if subcategoria else None,
+                "categoria": {
+                    "id_categoria": categoria.id_categoria,
+                    "nombre_categoria": categoria.nombre_categoria
+                } if categoria else None,
+                "programa": {
+                    "id_programa": programa.id_programa,
+                    "nombre_programa": programa.nombre_programa
+                } if programa else None
+            } if oferta else None
+        }
\ No newline at end of file
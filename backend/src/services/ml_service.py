@@ -2,7 +2,8 @@
 Servicio ML para exponer predicciones al frontend
 """
 
-from src.ml.predictors.inscripcion_predictor import InscripcionPredictor
+from flask import current_app
+from src.ml.model_registry import model_registry
 
 class MLService:
     """
@@ -30,7 +31,7 @@ class MLService:
             (dict, int): Resultado y código HTTP
         """
         try:
-            predictor = InscripcionPredictor(model_type=model_type)
+            predictor = model_registry.get('paquete', model_type)
             resultado = predictor.predict_compra_paquete(data)
             
             if 'error' in resultado:
@@ -62,11 +63,11 @@ class MLService:
         """
         try:
             # Random Forest
-            rf_predictor = InscripcionPredictor(model_type='random_forest')
+            rf_predictor = model_registry.get('paquete', 'random_forest')
             rf_result = rf_predictor.predict_compra_paquete(data)
             
             # Logistic Regression
-            lr_predictor = InscripcionPredictor(model_type='logistic_regression')
+            lr_predictor = model_registry.get('paquete', 'logistic_regression')
             lr_result = lr_predictor.predict_compra_paquete(data)
             
             return {
@@ -78,3 +79,92 @@ class MLService:
             
         except Exception as e:
             return {"error": f"Error comparando modelos: {str(e)}"}, 500
+    
+    @staticmethod
+    def predict_compra_paquete_batch(registros, model_type='random_forest'):
+        """
+        Predice compra de paquete para una lista de alumnos en un solo lote
+        
+        Args:
+            registros: lista de diccionarios con el formato de predict_compra_paquete
+            model_type: 'random_forest' o 'logistic_regression'
+        
+        Returns:
+            (dict, int): Predicciones (mismo orden que la entrada) y código HTTP
+        """
+        try:
+            error = MLService._validar_lote(registros)
+            if error:
+                return {"error": error}, 400
+            
+            predictor = model_registry.get('paquete', model_type)
+            if predictor.model is None:
+                return {"error": "Modelo no cargado"}, 400
+            
+            predicciones = predictor.predict_compra_paquete_batch(registros)
+            return MLService._resumen_lote(predicciones, model_type, 'comprara_paquete'), 200
+            
+        except Exception as e:
+            return {"error": f"Error en predicción: {str(e)}"}, 500
+    
+    @staticmethod
+    def predict_asistencia_batch(registros, model_type='random_forest'):
+        """
+        Predice asistencia para una lista de registros (p. ej. todo el roster de un ciclo)
+        
+        Args:
+            registros: lista de diccionarios con el formato de AsistenciaPredictor.predict
+            model_type: 'random_forest' o 'logistic_regression'
+        
+        Returns:
+            (dict, int): Predicciones (mismo orden que la entrada) y código HTTP
+        """
+        try:
+            error = MLService._validar_lote(registros)
+            if error:
+                return {"error": error}, 400
+            
+            predictor = model_registry.get('asistencia', model_type)
+            if predictor.model is None:
+                return {"error": "Modelo no cargado"}, 400
+            
+            predicciones = predictor.predict_batch(registros)
+            return MLService._resumen_lote(predicciones, model_type, 'asistira'), 200
+            
+        except Exception as e:
+            return {"error": f"Error en predicción: {str(e)}"}, 500
+    
+    @staticmethod
+    def _validar_lote(registros):
+        """
+        Devuelve un mensaje de error si el lote no es válido, None si es válido
+        """
+        if not isinstance(registros, list) or not registros:
+            return "'registros' debe ser una lista no vacía"
+        if not all(isinstance(r, dict) for r in registros):
+            return "Cada registro debe ser un objeto"
+        
+        maximo = current_app.config.get('ML_BATCH_MAX_REGISTROS', 10000)
+        if len(registros) > maximo:
+            return f"El lote supera el máximo de {maximo} registros"
+        return None
+    
+    @staticmethod
+    def _resumen_lote(predicciones, model_type, campo_positivo):
+        """
+        Respuesta común de los endpoints batch
+        """
+        return {
+            "predicciones": predicciones,
+            "modelo_usado": model_type,
+            "total": len(predicciones),
+            "total_positivos": sum(1 for p in predicciones if p.get(campo_positivo)),
+            "total_errores": sum(1 for p in predicciones if 'error' in p)
+        }
+    
+    @staticmethod
+    def get_estado_modelos():
+        """
+        Estado de los modelos cargados en este worker (versión y tiempo de carga)
+        """
+        return model_registry.estado()
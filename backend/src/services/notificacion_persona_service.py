@@ -1,6 +1,7 @@
 from src.repositories.notificacion_persona_repository import NotificacionPersonaRepository
 from src.repositories.notificacion_repository import NotificacionRepository
 from src.repositories.persona_repository import PersonaRepository
+from src.repositories.paginacion import leer_parametros, respuesta_pagina, ParametrosPaginacionInvalidos
 from datetime import datetime
 
 class NotificacionPersonaService:
@@ -9,13 +10,21 @@ class NotificacionPersonaService:
     """
 
     @staticmethod
-    def get_all_notificaciones_personas():
+    def get_all_notificaciones_personas(limite=None, cursor=None):
         """
-        Obtiene todas las asignaciones de notificaciones a personas
+        Obtiene todas las asignaciones de notificaciones a personas, o una página si se indica `limite` / `cursor`
         """
         try:
-            notificaciones_personas = NotificacionPersonaRepository.get_all()
-            return [np.to_dict() for np in notificaciones_personas], 200
+            pagina = leer_parametros(limite, cursor)
+            if pagina is None:
+                notificaciones_personas = NotificacionPersonaRepository.get_all()
+                return [np.to_dict() for np in notificaciones_personas], 200
+
+            limite, desde_id = pagina
+            notificaciones_personas, siguiente_id = NotificacionPersonaRepository.get_pagina(limite, desde_id)
+            return respuesta_pagina([np.to_dict() for np in notificaciones_personas], siguiente_id, limite), 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error al obtener notificaciones de personas: {str(e)}"}, 500
 
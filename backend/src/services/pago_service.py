@@ -1,6 +1,7 @@
 from src.repositories.pago_repository import PagoRepository
 from src.repositories.inscripcion_repository import InscripcionRepository
 from src.repositories.metodo_pago_repository import MetodoPagoRepository
+from src.repositories.paginacion import leer_parametros, respuesta_pagina, ParametrosPaginacionInvalidos
 from src.app import db
 from datetime import datetime, date, timedelta
 
@@ -10,16 +11,40 @@ class PagoService:
     """
 
     @staticmethod
-    def get_all_pagos():
+    def get_all_pagos(limite=None, cursor=None):
         """
-        Obtiene todos los pagos
+        Obtiene todos los pagos, o una página si se indica `limite` / `cursor`
         """
         try:
-            pagos = PagoRepository.get_all()
-            return [pago.to_dict() for pago in pagos], 200
+            pagina = leer_parametros(limite, cursor)
+            if pagina is None:
+                pagos = PagoRepository.get_all()
+                return [pago.to_dict() for pago in pagos], 200
+
+            limite, desde_id = pagina
+            pagos, siguiente_id = PagoRepository.get_pagina(limite, desde_id)
+            return respuesta_pagina([pago.to_dict() for pago in pagos], siguiente_id, limite), 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error al obtener pagos: {str(e)}"}, 500
 
+    @staticmethod
+    def exportar_pagos(ciclo_id=None):
+        """
+        Generador de pagos (con la persona de la inscripción) leídos en streaming
+        desde la base, para exportar sin cargar todo en memoria
+        """
+        for pago, persona in PagoRepository.iter_para_exportar(ciclo_id=ciclo_id):
+            pago_dict = pago.to_dict()
+            pago_dict['persona'] = {
+                'id_persona': persona.id_persona,
+                'nombre': persona.nombre,
+                'apellido': persona.apellido,
+                'email': persona.email
+            }
+            yield pago_dict
+
     @staticmethod
     def get_pago_by_id(pago_id):
         """
@@ -237,6 +262,9 @@ class PagoService:
             from src.services.inscripcion_service import InscripcionService
             InscripcionService.actualizar_estado_pago_inscripcion(pago.Inscripcion_id_inscripcion)
             
+            from src.services.dashboard_service import DashboardService
+            DashboardService.snapshot_pago_confirmado(pago)
+            
             db.session.commit()
 
             return {
@@ -306,7 +334,7 @@ class PagoService:
             fecha_inscripcion = inscripcion.fecha_inscripcion
             fecha_base_vencimiento = fecha_inscripcion + timedelta(days=30)
 
-            cuotas_creadas = []
+            pagos_data = []
             for i in range(1, numero_cuotas + 1):
                 # Fecha de vencimiento: cada cuota vence 30 días después de la anterior
                 fecha_vencimiento = fecha_base_vencimiento + timedelta(days=(i-1) * 30)
@@ -321,8 +349,9 @@ class PagoService:
                     'estado': 'PENDIENTE'
                 }
 
-                pago = PagoRepository.create(pago_data)
-                cuotas_creadas.append(pago.to_dict())
+                pagos_data.append(pago_data)
+
+            cuotas_creadas = [pago.to_dict() for pago in PagoRepository.create_bulk(pagos_data)]
 
             # Actualizar inscripción para indicar que tiene pago a cuotas
             InscripcionRepository.update(inscripcion_id, {'pago_a_cuotas': True})
@@ -341,7 +370,7 @@ class PagoService:
             return {"error": f"Error al generar cuotas: {str(e)}"}, 500
 
     @staticmethod
-    def get_inscripciones_activas_con_pagos():
+    def get_inscripciones_activas_con_pagos(limite=None, cursor=None):
         """
         Obtiene todas las inscripciones activas con información detallada:
         - Datos de la inscripción
@@ -352,55 +381,27 @@ class PagoService:
         - Información de la categoría
         - Información del programa
         - Lista de todos los pagos asociados
+
+        Usa dos consultas (inscripciones con JOINs + pagos con IN) sin importar el volumen.
+        Con `limite` / `cursor` devuelve una página ordenada por id_inscripcion con el
+        formato común de paginación (items, limite, siguiente_cursor).
         """
         try:
-            from src.models.inscripcion import Inscripcion
-            from src.models.paquete import Paquete
-            from src.models.oferta import Oferta
-            from src.models.ciclo import Ciclo
-            from src.models.subcategoria import Subcategoria
-            from src.models.categoria import Categoria
-            from src.models.programa import Programa
-            from src.models.pago import Pago
-            from src.models.persona import Persona
-            
-            # Obtener todas las inscripciones activas
-            inscripciones = Inscripcion.query.filter_by(estado='ACTIVO').all()
+            pagina = leer_parametros(limite, cursor)
+            siguiente_id = None
+            if pagina is None:
+                filas = InscripcionRepository.get_activas_con_detalle()
+            else:
+                limite, desde_id = pagina
+                filas, siguiente_id = InscripcionRepository.get_pagina_activas_con_detalle(limite, desde_id)
+            pagos_por_inscripcion = PagoRepository.get_by_inscripciones(
+                [fila[0].id_inscripcion for fila in filas]
+            )
             
             resultado = []
             
-            for inscripcion in inscripciones:
-                # Obtener paquete
-                paquete = Paquete.query.get(inscripcion.Paquete_id_paquete)
-                if not paquete:
-                    continue
-                
-                # Obtener oferta
-                oferta = Oferta.query.get(paquete.Oferta_id_oferta)
-                if not oferta:
-                    continue
-                
-                # Obtener ciclo
-                ciclo = Ciclo.query.get(oferta.ciclo_id_ciclo)
-                
-                # Obtener subcategoría
-                subcategoria = Subcategoria.query.get(oferta.Subcategoria_id_subcategoria)
-                
-                # Obtener categoría
-                categoria = None
-                if subcategoria:
-                    categoria = Categoria.query.get(subcategoria.Categoria_id_categoria)
-                
-                # Obtener programa
-                programa = None
-                if categoria:
-                    programa = Programa.query.get(categoria.Programa_id_programa)
-                
-                # Obtener persona
-                persona = Persona.query.get(inscripcion.Persona_id_persona)
-                
-                # Obtener todos los pagos de esta inscripción
-                pagos = Pago.query.filter_by(Inscripcion_id_inscripcion=inscripcion.id_inscripcion).order_by(Pago.numero_cuota).all()
+            for inscripcion, persona, paquete, oferta, ciclo, subcategoria, categoria, programa in filas:
+                pagos = pagos_por_inscripcion[inscripcion.id_inscripcion]
                 
                 # Construir objeto de respuesta
                 inscripcion_detalle = {
@@ -475,10 +476,17 @@ class PagoService:
                 
                 resultado.append(inscripcion_detalle)
             
-            return {
-                "total_inscripciones_activas": len(resultado),
-                "inscripciones": resultado
-            }, 200
+            if pagina is None:
+                return {
+                    "total_inscripciones_activas": len(resultado),
+                    "inscripciones": resultado
+                }, 200
+            
+            respuesta = respuesta_pagina(resultado, siguiente_id, limite)
+            respuesta["total_inscripciones_activas"] = InscripcionRepository.count_activas_con_detalle()
+            return respuesta, 200
             
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error al obtener inscripciones activas con pagos: {str(e)}"}, 500
\ No newline at end of file
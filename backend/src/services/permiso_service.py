@@ -1,82 +1,113 @@
 from src.repositories.permiso_repository import PermisoRepository
+from src.repositories.paginacion import leer_parametros, respuesta_pagina, ParametrosPaginacionInvalidos
 from datetime import datetime
 
+ESTADOS_PERMISO = ['PENDIENTE', 'APROBADO', 'RECHAZADO']
+
 class PermisoService:
     
     @staticmethod
-    def get_all_permisos():
-        """Obtiene todos los permisos"""
+    def get_all_permisos(limite=None, cursor=None):
+        """Obtiene todos los permisos, o una página si se indica `limite` / `cursor`"""
         try:
-            permisos = PermisoRepository.get_all()
-            return [permiso.to_dict() for permiso in permisos], 200
+            pagina = leer_parametros(limite, cursor)
+            if pagina is None:
+                permisos = PermisoRepository.get_all()
+                return [permiso.to_dict() for permiso in permisos], 200
+
+            limite, desde_id = pagina
+            permisos, siguiente_id = PermisoRepository.get_pagina(limite, desde_id)
+            return respuesta_pagina([permiso.to_dict() for permiso in permisos], siguiente_id, limite), 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error interno del servidor: {str(e)}"}, 500
     
     @staticmethod
-    def get_all_permisos_detallados():
-        """Obtiene todos los permisos con información detallada"""
+    def get_all_permisos_detallados(estado_permiso=None, ciclo_id=None, limite=None, cursor=None):
+        """
+        Obtiene los permisos con información detallada (una sola consulta), opcionalmente
+        filtrados por estado_permiso y ciclo, y paginados si se indica `limite` / `cursor`
+        """
         try:
-            results = PermisoRepository.get_all_detailed()
-            permisos_detallados = []
-            
-            for result in results:
-                permiso, persona, asistencia, horario_sesion, horario, estilo, inscripcion, paquete, oferta, ciclo = result
-                
-                permiso_detallado = {
-                    "permiso_id": permiso.permiso_id,
-                    "motivo": permiso.motivo,
-                    "fecha_solicitud": permiso.fecha_solicitud.isoformat() if permiso.fecha_solicitud else None,
-                    "estado_permiso": permiso.estado_permiso,
-                    "fecha_respuesta": permiso.fecha_respuesta.isoformat() if permiso.fecha_respuesta else None,
-                    "motivo_rechazo": permiso.motivo_rechazo,
-                    "persona": {
-                        "id_persona": persona.id_persona,
-                        "nombre": persona.nombre,
-                        "apellido": persona.apellido,
-                        "email": persona.email,
-                        "celular": persona.celular
-                    },
-                    "horario_sesion": {
-                        "id_horario_sesion": horario_sesion.id_horario_sesion,
-                        "fecha": horario_sesion.fecha.isoformat() if horario_sesion.fecha else None,
-                        "hora_inicio": horario_sesion.hora_inicio.strftime('%H:%M') if horario_sesion.hora_inicio else None,
-                        "hora_fin": horario_sesion.hora_fin.strftime('%H:%M') if horario_sesion.hora_fin else None
-                    },
-                    "clase": {
-                        "nombre_estilo": estilo.nombre_estilo,
-                        "nivel": horario.nivel,
-                        "dias": horario.dias
-                    },
-                    "paquete": {
-                        "nombre": paquete.nombre,
-                        "cantidad_clases": paquete.cantidad_clases
-                    },
-                    "oferta": {
-                        "nombre_oferta": oferta.nombre_oferta
-                    },
-                    "ciclo": {
-                        "nombre": ciclo.nombre
-                    }
-                }
-                
-                # Agregar quien respondió si existe
-                if permiso.respondida_por:
-                    from src.repositories.persona_repository import PersonaRepository
-                    persona_respondio = PersonaRepository.get_by_id(permiso.respondida_por)
-                    if persona_respondio:
-                        permiso_detallado["respondida_por"] = {
-                            "nombre": persona_respondio.nombre,
-                            "apellido": persona_respondio.apellido
-                        }
-                
-                permisos_detallados.append(permiso_detallado)
-            
-            return permisos_detallados, 200
+            if estado_permiso is not None:
+                estado_permiso = estado_permiso.upper()
+                if estado_permiso not in ESTADOS_PERMISO:
+                    return {"error": f"Estado inválido. Debe ser uno de: {', '.join(ESTADOS_PERMISO)}"}, 400
+
+            pagina = leer_parametros(limite, cursor)
+            if pagina is None:
+                results = PermisoRepository.get_all_detailed(estado_permiso=estado_permiso, ciclo_id=ciclo_id)
+                return [PermisoService._permiso_detallado_a_dict(fila) for fila in results], 200
+
+            limite, desde_id = pagina
+            results, siguiente_id = PermisoRepository.get_pagina_detailed(
+                limite, desde_id, estado_permiso=estado_permiso, ciclo_id=ciclo_id
+            )
+            permisos_detallados = [PermisoService._permiso_detallado_a_dict(fila) for fila in results]
+            return respuesta_pagina(permisos_detallados, siguiente_id, limite), 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             print(f"Error al obtener permisos detallados: {str(e)}")
             import traceback
             traceback.print_exc()
             return {"error": f"Error interno del servidor: {str(e)}"}, 500
+
+    @staticmethod
+    def exportar_permisos_detallados(ciclo_id=None, estado_permiso=None):
+        """Generador de permisos detallados leídos en streaming desde la base (para exportar)"""
+        for fila in PermisoRepository.iter_detailed(ciclo_id=ciclo_id, estado_permiso=estado_permiso):
+            yield PermisoService._permiso_detallado_a_dict(fila)
+
+    @staticmethod
+    def _permiso_detallado_a_dict(fila):
+        permiso, persona, asistencia, horario_sesion, horario, estilo, inscripcion, paquete, oferta, ciclo, respondio = fila
+
+        permiso_detallado = {
+            "permiso_id": permiso.permiso_id,
+            "motivo": permiso.motivo,
+            "fecha_solicitud": permiso.fecha_solicitud.isoformat() if permiso.fecha_solicitud else None,
+            "estado_permiso": permiso.estado_permiso,
+            "fecha_respuesta": permiso.fecha_respuesta.isoformat() if permiso.fecha_respuesta else None,
+            "motivo_rechazo": permiso.motivo_rechazo,
+            "persona": {
+                "id_persona": persona.id_persona,
+                "nombre": persona.nombre,
+                "apellido": persona.apellido,
+                "email": persona.email,
+                "celular": persona.celular
+            },
+            "horario_sesion": {
+                "id_horario_sesion": horario_sesion.id_horario_sesion,
+                "fecha": horario_sesion.fecha.isoformat() if horario_sesion.fecha else None,
+                "hora_inicio": horario_sesion.hora_inicio.strftime('%H:%M') if horario_sesion.hora_inicio else None,
+                "hora_fin": horario_sesion.hora_fin.strftime('%H:%M') if horario_sesion.hora_fin else None
+            },
+            "clase": {
+                "nombre_estilo": estilo.nombre_estilo,
+                "nivel": horario.nivel,
+                "dias": horario.dias
+            },
+            "paquete": {
+                "nombre": paquete.nombre,
+                "cantidad_clases": paquete.cantidad_clases
+            },
+            "oferta": {
+                "nombre_oferta": oferta.nombre_oferta
+            },
+            "ciclo": {
+                "nombre": ciclo.nombre
+            }
+        }
+
+        # Quien respondió ya viene en la fila (LEFT JOIN), sin consultas adicionales
+        if respondio:
+            permiso_detallado["respondida_por"] = {
+                "nombre": respondio.nombre,
+                "apellido": respondio.apellido
+            }
+        return permiso_detallado
     
     @staticmethod
     def get_active_permisos():
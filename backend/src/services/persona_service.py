@@ -1,4 +1,6 @@
 from src.repositories.persona_repository import PersonaRepository
+from src.repositories.rol_repository import RolRepository
+from src.repositories.paginacion import leer_parametros, respuesta_pagina, ParametrosPaginacionInvalidos
 from src.models.profesor import Profesor
 from src.models.alumno import Alumno
 from src.models.alumno_femme import AlumnoFemme
@@ -12,12 +14,18 @@ class PersonaService:
     """
 
     @staticmethod
-    def get_all_personas():
+    def get_all_personas(limite=None, cursor=None):
         """
-        Obtiene todas las personas con campos específicos
+        Obtiene todas las personas con campos específicos, o una página si se indica `limite` / `cursor`
         """
         try:
-            personas = PersonaRepository.get_all()
+            pagina = leer_parametros(limite, cursor)
+            siguiente_id = None
+            if pagina is None:
+                personas = PersonaRepository.get_all()
+            else:
+                limite, desde_id = pagina
+                personas, siguiente_id = PersonaRepository.get_pagina(limite, desde_id)
             # Filtrar solo los campos solicitados
             personas_filtradas = []
             for persona in personas:
@@ -35,7 +43,11 @@ class PersonaService:
                 }
                 personas_filtradas.append(persona_dict)
 
+            if pagina is not None:
+                return respuesta_pagina(personas_filtradas, siguiente_id, limite), 200
             return personas_filtradas, 200
+        except ParametrosPaginacionInvalidos as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": f"Error al obtener personas: {str(e)}"}, 500
 
@@ -150,6 +162,10 @@ class PersonaService:
             elif actualizar_profesor or desactivar_profesor:
                 db.session.commit()
 
+            if crear_profesor or actualizar_profesor or desactivar_profesor:
+                # El rol cacheado para login ya no es válido
+                RolRepository.invalidar(persona_id)
+
             mensaje = "Persona actualizada exitosamente"
             if crear_profesor:
                 mensaje += " y activada como profesor"
@@ -0,0 +1,121 @@
+import time
+from datetime import date, timedelta
+from src.app import db
+from src.ml.model_registry import model_registry
+from src.repositories.pronostico_asistencia_repository import PronosticoAsistenciaRepository
+
+DIAS_SEMANA = {1: 'Lunes', 2: 'Martes', 3: 'Miércoles', 4: 'Jueves', 5: 'Viernes', 6: 'Sábado', 7: 'Domingo'}
+NIVELES = {1: 'Principiante', 2: 'Intermedio', 3: 'Avanzado', 4: 'Multinivel'}
+
+
+class PronosticoAsistenciaService:
+    """
+    Job en lote que pronostica la asistencia de las próximas sesiones con AsistenciaPredictor
+    """
+
+    @staticmethod
+    def generar_pronosticos(dias=7, model_type='random_forest', chunk=1000, fecha_desde=None):
+        """
+        Calcula la asistencia esperada de cada sesión activa entre fecha_desde (hoy por defecto)
+        y fecha_desde + dias, y la guarda en PronosticoAsistencia.
+
+        Las features se construyen desde la BD (una consulta en streaming) y se puntúan
+        en bloques de `chunk` registros con una sola llamada a predict_batch por bloque.
+        """
+        try:
+            inicio = time.perf_counter()
+            fecha_desde = fecha_desde or date.today()
+            fecha_hasta = fecha_desde + timedelta(days=dias)
+
+            predictor = model_registry.get('asistencia', model_type)
+            if predictor.model is None:
+                return {"error": "Modelo de asistencia no cargado"}, 503
+            estado = model_registry.estado().get(f'asistencia/{predictor.model_type}', {})
+
+            sesiones_ids = PronosticoAsistenciaRepository.get_sesiones_ids_en_rango(fecha_desde, fecha_hasta)
+            # Las sesiones sin inscritas quedan con pronóstico 0
+            resultados = {sesion_id: [0, 0.0] for sesion_id in sesiones_ids}
+            registros = 0
+            errores = 0
+
+            bloque_sesiones = []
+            bloque_features = []
+            for fila in PronosticoAsistenciaRepository.iter_filas_features(fecha_desde, fecha_hasta, chunk):
+                bloque_sesiones.append(fila.sesion_id)
+                bloque_features.append(PronosticoAsistenciaService._features_de_fila(fila))
+                if len(bloque_features) >= chunk:
+                    errores += PronosticoAsistenciaService._puntuar_bloque(
+                        predictor, bloque_sesiones, bloque_features, resultados)
+                    registros += len(bloque_features)
+                    bloque_sesiones, bloque_features = [], []
+            if bloque_features:
+                errores += PronosticoAsistenciaService._puntuar_bloque(
+                    predictor, bloque_sesiones, bloque_features, resultados)
+                registros += len(bloque_features)
+
+            guardados = PronosticoAsistenciaRepository.reemplazar(
+                sesiones_ids, resultados, predictor.model_type, estado.get('version'))
+            db.session.commit()
+
+            return {
+                "fecha_desde": fecha_desde.isoformat(),
+                "fecha_hasta": fecha_hasta.isoformat(),
+                "modelo": predictor.model_type,
+                "sesiones": guardados,
+                "asistencias_puntuadas": registros,
+                "errores": errores,
+                "duracion_ms": round((time.perf_counter() - inicio) * 1000, 2)
+            }, 200
+
+        except Exception as e:
+            db.session.rollback()
+            return {"error": f"Error al generar pronósticos: {str(e)}"}, 500
+
+    @staticmethod
+    def _puntuar_bloque(predictor, sesiones, features, resultados):
+        """
+        Puntúa un bloque y acumula inscritos y probabilidad por sesión. Devuelve el número de errores.
+        """
+        errores = 0
+        for sesion_id, prediccion in zip(sesiones, predictor.predict_batch(features)):
+            acumulado = resultados.setdefault(sesion_id, [0, 0.0])
+            acumulado[0] += 1
+            if 'error' in prediccion:
+                errores += 1
+                continue
+            acumulado[1] += prediccion['probabilidad'] / 100.0
+        return errores
+
+    @staticmethod
+    def _features_de_fila(fila):
+        """
+        Traduce una fila de la BD al formato de features con el que se entrenó el modelo
+        """
+        hora = fila.hora_inicio.hour if fila.hora_inicio else 0
+        if hora < 12:
+            turno = 'Mañana'
+        elif hora < 18:
+            turno = 'Tarde'
+        else:
+            turno = 'Noche'
+
+        descuento = 0
+        if fila.precio_original and fila.descuento_aplicado:
+            descuento = round(float(fila.descuento_aplicado) * 100 / float(fila.precio_original))
+
+        return {
+            'Departamento': fila.departamento,
+            'Ciclo': fila.ciclo_id_ciclo,
+            'Dia': DIAS_SEMANA.get(fila.dia, ''),
+            'Turno': turno,
+            'Hora Inicio': fila.hora_inicio.strftime('%H:%M') if fila.hora_inicio else '00:00',
+            'Hora_Sesion': float(fila.duracion) if fila.duracion is not None else 1.5,
+            'Modalidad': 'Presencial',
+            'Nivel': NIVELES.get(fila.nivel, ''),
+            'Genero': 'Femenino',
+            'Proyecto': fila.nombre_programa,
+            'Paquete': 'Si' if fila.ilimitado or (fila.cantidad_clases or 0) > 1 else 'No',
+            'Cantidad clases': fila.cantidad_clases or 0,
+            'Descuento': f'{descuento}%',
+            'Metodo de pago': fila.nombre_metodo or ''
+        }
@@ -1,7 +1,7 @@
 from src.app import db
 from src.models.persona import Persona
 from src.repositories.user_repository import UserRepository
-from werkzeug.security import generate_password_hash
+from src.auth import hashear_contrasena
 import datetime
 
 
@@ -19,7 +19,7 @@ class UserService:
         UserService._validate_payload(data)
 
         # Hash password
-        hashed_password = generate_password_hash(data['password'])
+        hashed_password = hashear_contrasena(data['password'])
         
         # Determinar tipo_cuenta basado en solicitud_user_especial
         solicitud_especial = data.get('solicitud_user_especial', False)